@@ -0,0 +1,32 @@
+import argparse
+from pathlib import Path
+
+from src import config_cache
+from src.analysis.multi_fidelity import Dispersion, multi_fidelity_dispersion
+
+
+def run() -> None:
+    defaults = Dispersion()
+    parser = argparse.ArgumentParser(description="パラメータの誤差による着地点のばらつきを多精度モンテカルロ法で求める")
+    parser.add_argument("--samples", type=int, default=1000, help="質点モデルで計算するサンプル数")
+    parser.add_argument("--high-fidelity-samples", type=int, default=50, help="6自由度のモデルで計算するサンプル数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--wind-speed", type=float, default=defaults.wind_speed, help="風速の標準偏差[m/s]")
+    parser.add_argument("--wind-direction", type=float, default=defaults.wind_direction, help="風向の標準偏差[deg]")
+    parser.add_argument("--ca", type=float, default=defaults.CA, help="CAの相対的な標準偏差")
+    parser.add_argument("--thrust-scale", type=float, default=defaults.thrust_scale, help="推力の倍率の標準偏差")
+    parser.add_argument("--elevation", type=float, default=defaults.elevation, help="発射角度の標準偏差[deg]")
+    args = parser.parse_args()
+
+    config = config_cache.read(Path("config"))
+    dispersion = Dispersion(args.wind_speed, args.wind_direction, args.ca, args.thrust_scale, args.elevation)
+    result = multi_fidelity_dispersion(config, dispersion, args.samples, args.high_fidelity_samples, seed=args.seed)
+
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    result.statistics.to_csv(output_dir / "dispersion.csv")
+    print(result.statistics)  # noqa: T201
+
+
+if __name__ == "__main__":
+    run()
@@ -1,28 +1,35 @@
-from concurrent.futures import ProcessPoolExecutor
+import argparse
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+from src import config_cache
+from src.core.config import Config
+from src.make_report.simulation_worker import BACKENDS, Setting, simulate_many
 
-from src import config_read
-from src.core import simple_simulation
-from src.core.simulation_result import SimulationResult
 
-
-def simulate(wind_direction: float, wind_speed: float) -> tuple[SimulationResult, SimulationResult]:
-    config_path = Path("config")
-    config = config_read.read(config_path)
-    config.wind.wind_direction = wind_direction
-    config.wind.wind_speed = wind_speed
-    return simple_simulation.simulate(config)
+def wind_settings(config: Config, wind_speed: float, wind_directions: list[float]) -> list[Setting]:
+    # コンフィグはワーカーの起動時に1度だけ送り、各タスクでは風速と風向だけを送る
+    return [
+        Setting(config.first_elevation, wind_speed, wind_direction, landing_only=True)
+        for wind_direction in wind_directions
+    ]
 
 
 def figure() -> None:
-    with ProcessPoolExecutor() as e:
-        r = list(e.map(simulate, range(0, 360, 45), [6] * 8))
-    x1 = [r[0].last().position[1] for r in r]
-    y1 = [r[0].last().position[0] for r in r]
-    x2 = [r[1].last().position[1] for r in r]
-    y2 = [r[1].last().position[0] for r in r]
+    parser = argparse.ArgumentParser(description="風向ごとの着地点を描画する")
+    parser.add_argument("--backend", choices=BACKENDS, default="process", help="シミュレーションの実行方法")
+    parser.add_argument("--max-workers", type=int, default=None, help="並列に実行する数")
+    args = parser.parse_args()
+
+    # ワーカーが描画のライブラリを読み込まないように、描画する際に読み込む
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    config = config_cache.read(Path("config"))
+    settings = wind_settings(config, 6, list(range(0, 360, 45)))
+    results = simulate_many(settings, config=config, backend=args.backend, max_workers=args.max_workers)
+    x1 = [result.result_parachute_off["position_e"].iloc[-1] for result in results]
+    y1 = [result.result_parachute_off["position_n"].iloc[-1] for result in results]
+    x2 = [result.result_parachute_on["position_e"].iloc[-1] for result in results]
+    y2 = [result.result_parachute_on["position_n"].iloc[-1] for result in results]
     plt.plot([*x1, x1[0]], [*y1, y1[0]])
     plt.plot([*x2, x2[0]], [*y2, y2[0]])
     plt.show()
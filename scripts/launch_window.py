@@ -0,0 +1,30 @@
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from src import config_cache
+from src.analysis.launch_window import plan_launch_window
+from src.geography.kml import parse_launch_site
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="風の予報から打ち上げ可能な時刻を求める")
+    parser.add_argument("forecast", type=Path, help="風の予報値のCSV")
+    parser.add_argument("--margin", type=float, default=0.0, help="落下可能域の境界から必要な距離[m]")
+    args = parser.parse_args()
+
+    config_path = Path("config")
+    config = config_cache.read(config_path)
+    launch_site_kml = (config_path / "launch_site.kml").read_text()
+    launch_site = parse_launch_site(launch_site_kml, "発射地点", "落下可能域")
+
+    window = plan_launch_window(config, launch_site, pd.read_csv(args.forecast), args.margin)
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    window.to_csv(output_dir / "launch_window.csv")
+    print(window)  # noqa: T201
+
+
+if __name__ == "__main__":
+    run()
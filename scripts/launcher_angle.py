@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from src import config_cache, report_config_read
+from src.analysis.launcher_angle import optimize_launcher_angle
+from src.geography.kml import parse_launch_site
+
+
+def run() -> None:
+    config_path = Path("config")
+    config = config_cache.read(config_path)
+    report_config = report_config_read.read(config_path)
+    launch_site_kml = (config_path / "launch_site.kml").read_text()
+    launch_site = parse_launch_site(launch_site_kml, "発射地点", "落下可能域")
+
+    result = optimize_launcher_angle(
+        config,
+        launch_site,
+        report_config.wind_speed_list,
+        report_config.wind_direction_list,
+        (min(report_config.launcher_elevation_list), max(report_config.launcher_elevation_list)),
+    )
+    print(  # noqa: T201
+        f"発射角度 {result.elevation:.1f} deg, 方位角 {result.azimuth:.1f} deg\n"
+        f"落下可能域の境界までの最小の余裕 {result.margin:.1f} m (予測 {result.predicted_margin:.1f} m)\n"
+        f"シミュレーション回数 {result.simulations}",
+    )
+
+
+if __name__ == "__main__":
+    run()
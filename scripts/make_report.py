@@ -2,7 +2,10 @@ import json
 import shutil
 from pathlib import Path
 
-from src import config_read, graph_writer, report_config_read
+from src import config_cache, graph_writer, report_config_read
+from src.analysis import wind_limit
+from src.analysis.landing_surrogate import LandingSurrogate
+from src.core.flight_event import events_to_df
 from src.geography.kml import landing_range_to_kml, parse_launch_site
 from src.geography.landing_range import LandingRange
 from src.geography.launch_site import LaunchSite
@@ -25,6 +28,10 @@ def write_row_data(result: ResultForReport) -> None:
     result.result_nominal_parachute_on.to_csv(
         output_dir / "nominal_parachute_on.csv",
     )
+    events_to_df(result.events_ideal_parachute_off).to_csv(output_dir / "ideal_parachute_off_events.csv")
+    events_to_df(result.events_ideal_parachute_on).to_csv(output_dir / "ideal_parachute_on_events.csv")
+    events_to_df(result.events_nominal_parachute_off).to_csv(output_dir / "nominal_parachute_off_events.csv")
+    events_to_df(result.events_nominal_parachute_on).to_csv(output_dir / "nominal_parachute_on_events.csv")
     for elev_result in result.result_by_launcher_elevation:
         for wind_result in elev_result.result:
             for dir_result in wind_result.result:
@@ -64,6 +71,17 @@ def write_landing_range_kml(result: ResultForReport, launch_site: LaunchSite) ->
         output_path.write_text(kml_str)
 
 
+def write_landing_surrogate(result: ResultForReport) -> None:
+    """風の格子の結果から着地点のサロゲートモデルを作成して保存する
+
+    Args:
+        result: シミュレーション結果
+    """
+    output_dir = Path("output") / "report"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    LandingSurrogate.from_result_for_report(result).save(output_dir / "landing_surrogate.npz")
+
+
 def run() -> None:
     # 既存のoutputフォルダを削除
     output_dir = Path("output")
@@ -71,7 +89,7 @@ def run() -> None:
         shutil.rmtree(output_dir)
 
     config_path = Path("config")
-    config = config_read.read(config_path)
+    config = config_cache.read(config_path)
     report_config = report_config_read.read(config_path)
 
     # launch_site.kmlから発射地点情報を読み込む
@@ -79,11 +97,35 @@ def run() -> None:
     launch_site = parse_launch_site(launch_site_kml, "発射地点", "落下可能域")
 
     result = make_result_for_report.make_result_for_report(config, report_config)
+    if result.pool_timing is not None:
+        timing = result.pool_timing
+        print(  # noqa: T201
+            f"並列計算: {timing.tasks}件, {timing.workers}プロセス, "
+            f"起動 {timing.startup:.2f} s, 全体 {timing.total:.2f} s",
+        )
     write_row_data(result)
 
-    result_dict = make_dict.make_dict(result, launch_site, config)
     output_dir = Path("output") / "report"
     output_dir.mkdir(parents=True, exist_ok=True)
+    wind_limit_table = None
+    if report_config.wind_limit_search:
+        # 風向ごとの風速制限を探索する
+        criteria = wind_limit.WindLimitCriteria(
+            max_angle_of_attack=report_config.wind_limit_angle_of_attack,
+            max_dynamic_pressure=report_config.wind_limit_dynamic_pressure,
+            site=launch_site,
+            landing_margin=report_config.wind_limit_landing_margin,
+        )
+        with wind_limit.simulation_evaluator(config, report_config.launcher_elevation) as evaluate:
+            wind_limit_table = wind_limit.search_wind_limit(
+                evaluate,
+                criteria,
+                report_config.wind_direction_list,
+                max_speed=report_config.wind_limit_max_speed,
+            )
+        wind_limit_table.to_csv(output_dir / "wind_limit.csv")
+
+    result_dict = make_dict.make_dict(result, launch_site, config, wind_limit_table)
     path_dict = output_dir / "result_text.json"
     path_dict.write_text(json.dumps(result_dict, indent=4, ensure_ascii=False), encoding="utf-8")
 
@@ -98,6 +140,9 @@ def run() -> None:
     # 着陸範囲をKMLファイルとして出力
     write_landing_range_kml(result, launch_site)
 
+    # 着地点のサロゲートモデルを出力
+    write_landing_surrogate(result)
+
 
 if __name__ == "__main__":
     run()
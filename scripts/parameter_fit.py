@@ -0,0 +1,63 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import config_cache
+from src.analysis.parameter_fit import (
+    FIT_PARAMETERS,
+    TABLE_PARAMETERS,
+    EvaluationCache,
+    fit_parameters,
+    signature,
+    simulation_residual_evaluator,
+)
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="飛行ログに合うように空力係数と推力の倍率を同定する")
+    parser.add_argument("log", type=Path, help="飛行ログのCSV")
+    parser.add_argument(
+        "--parameters",
+        nargs="+",
+        default=None,
+        choices=FIT_PARAMETERS,
+        help="同定するパラメータ(省略した場合はコンフィグで同定できる全てのパラメータ)",
+    )
+    parser.add_argument("--altitude-weight", type=float, default=1.0, help="高度の残差の重み[1/m]")
+    parser.add_argument("--acceleration-weight", type=float, default=0.1, help="加速度の残差の重み[s^2/m]")
+    args = parser.parse_args()
+
+    config = config_cache.read(Path("config"))
+    if args.parameters is None:
+        args.parameters = [
+            name for name in FIT_PARAMETERS if config.aerodynamic_table is None or name not in TABLE_PARAMETERS
+        ]
+    log = pd.read_csv(args.log)
+    weights = {
+        column: weight
+        for column, weight in [("altitude", args.altitude_weight), ("acceleration", args.acceleration_weight)]
+        if column in log.columns
+    }
+    initial = np.array([1.0 if name == "thrust_scale" else getattr(config, name) for name in args.parameters])
+
+    output_dir = Path("output")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache = EvaluationCache(
+        output_dir / "parameter_fit_cache.npz",
+        key=signature(config, args.parameters, log, weights),
+    )
+    with simulation_residual_evaluator(config, args.parameters, log, weights) as evaluate:
+        result = fit_parameters(evaluate, initial, cache=cache)
+    table = pd.DataFrame({"initial": initial, "fitted": result.parameters}, index=args.parameters)
+    table.to_csv(output_dir / "parameter_fit.csv")
+    print(table)  # noqa: T201
+    print(  # noqa: T201
+        f"残差の二乗和の半分 {result.cost:.4g}, 反復回数 {result.iterations}, "
+        f"新たなシミュレーション回数 {result.evaluations}",
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,481 @@
+import bisect
+import dataclasses
+import typing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import Config
+from src.make_report.make_result_for_report import Setting, run_concurrent
+from src.make_report.result_for_report import ResultForReport
+
+OUTPUT_NAMES = (
+    "landing_north_parachute_off",
+    "landing_east_parachute_off",
+    "flight_time_parachute_off",
+    "landing_north_parachute_on",
+    "landing_east_parachute_on",
+    "flight_time_parachute_on",
+    "apogee",
+)
+"""サロゲートモデルが出力する量の名前(outputsの最後の軸の順番)"""
+
+FULL_CIRCLE = 360.0
+
+Evaluator = typing.Callable[[list[Setting]], np.ndarray]
+"""設定のリストから出力の配列(設定数, len(OUTPUT_NAMES))を計算する関数"""
+
+
+def outputs_from_result(
+    result_parachute_off: pd.DataFrame,
+    result_parachute_on: pd.DataFrame,
+) -> np.ndarray:
+    """シミュレーション結果からサロゲートモデルの出力を取り出す
+
+    Args:
+        result_parachute_off (pd.DataFrame): パラシュートが開かなかった場合の結果
+        result_parachute_on (pd.DataFrame): パラシュートが開いた場合の結果
+
+    Returns:
+        np.ndarray: OUTPUT_NAMESの順に並べた出力
+    """
+    last_off = result_parachute_off.iloc[-1]
+    last_on = result_parachute_on.iloc[-1]
+    return np.array(
+        [
+            last_off["position_n"],
+            last_off["position_e"],
+            last_off["time"],
+            last_on["position_n"],
+            last_on["position_e"],
+            last_on["time"],
+            -result_parachute_off["position_d"].min(),
+        ],
+    )
+
+
+def simulation_evaluator(config: Config) -> Evaluator:
+    """シミュレーションを並列に実行して出力を計算する関数を生成する
+
+    Args:
+        config (Config): コンフィグ
+
+    Returns:
+        Evaluator: 設定のリストから出力の配列を計算する関数
+    """
+
+    def evaluate(settings: list[Setting]) -> np.ndarray:
+        # 着地点と最高高度しか使わないため軌道は記録しない
+        settings = [dataclasses.replace(setting, landing_only=True) for setting in settings]
+        results = run_concurrent(config, settings)
+        return np.array(
+            [outputs_from_result(result.result_parachute_off, result.result_parachute_on) for result in results],
+        )
+
+    return evaluate
+
+
+def _locate(axis: list[float], x: float, name: str) -> tuple[int, int, float]:
+    """非周期軸上で点を挟む格子点と補間係数を求める"""
+    if len(axis) == 1:
+        if x != axis[0]:
+            err_msg = f"{name}が格子の値と一致しません"
+            raise ValueError(err_msg, x, axis[0])
+        return 0, 0, 0.0
+    if x < axis[0] or x > axis[-1]:
+        err_msg = f"{name}が補間範囲外です"
+        raise ValueError(err_msg, x, axis[0], axis[-1])
+    i = min(bisect.bisect_right(axis, x) - 1, len(axis) - 2)
+    return i, i + 1, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+def _locate_periodic(axis: list[float], x: float) -> tuple[int, int, float]:
+    """周期軸(風向)上で点を挟む格子点と補間係数を求める"""
+    n = len(axis)
+    if n == 1:
+        return 0, 0, 0.0
+    x %= FULL_CIRCLE
+    i = bisect.bisect_right(axis, x) - 1
+    if i in (-1, n - 1):
+        # 最後の格子点から最初の格子点(+360deg)までのセル
+        width = axis[0] + FULL_CIRCLE - axis[-1]
+        return n - 1, 0, ((x - axis[-1]) % FULL_CIRCLE) / width
+    return i, i + 1, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+def _cell_widths(coords: np.ndarray, *, periodic: bool) -> np.ndarray:
+    if periodic:
+        return np.diff(np.append(coords, coords[0] + FULL_CIRCLE))
+    if len(coords) == 1:
+        return np.zeros(1)
+    return np.diff(coords)
+
+
+def _node_curvature(values: np.ndarray, coords: np.ndarray, *, periodic: bool) -> np.ndarray:
+    """先頭の軸に沿った2階差分商の絶対値を格子点ごとに計算する
+
+    格子点が3点未満の軸では曲率を推定できないため0とする。
+    """
+    n = len(coords)
+    min_points = 3
+    if n < min_points:
+        return np.zeros_like(values)
+    trailing = (slice(None),) + (np.newaxis,) * (values.ndim - 1)
+    if periodic:
+        h_left = (coords - np.roll(coords, 1)) % FULL_CIRCLE
+        h_right = (np.roll(coords, -1) - coords) % FULL_CIRCLE
+        v_prev = np.roll(values, 1, axis=0)
+        v_next = np.roll(values, -1, axis=0)
+        h_left = h_left[trailing]
+        h_right = h_right[trailing]
+        return np.abs(2 * ((v_next - values) / h_right - (values - v_prev) / h_left) / (h_left + h_right))
+    h = np.diff(coords)
+    h_left = h[:-1][trailing]
+    h_right = h[1:][trailing]
+    interior = np.abs(
+        2 * ((values[2:] - values[1:-1]) / h_right - (values[1:-1] - values[:-2]) / h_left) / (h_left + h_right),
+    )
+    # 端点は隣の格子点の曲率で代用する
+    return np.concatenate([interior[:1], interior, interior[-1:]], axis=0)
+
+
+def _nodes_to_cells(values: np.ndarray, *, periodic: bool) -> np.ndarray:
+    """先頭の軸について、隣り合う格子点の最大値をセルの値とする"""
+    if periodic:
+        return np.maximum(values, np.roll(values, -1, axis=0))
+    if len(values) == 1:
+        return values
+    return np.maximum(values[:-1], values[1:])
+
+
+@dataclass
+class LandingPrediction:
+    """サロゲートモデルによる予測結果"""
+
+    outputs: dict[str, float]
+    """出力名から予測値への辞書"""
+    error: dict[str, float]
+    """出力名から線形補間の推定誤差への辞書"""
+
+
+@dataclass
+class LandingSurrogate:
+    """(発射角度, 風速, 風向)の格子上で着地点などを補間するサロゲートモデル
+
+    発射角度と風速は線形、風向は360degの周期境界で線形に補間する。
+    """
+
+    launcher_elevations: np.ndarray
+    """発射角度の格子[deg](昇順)"""
+    wind_speeds: np.ndarray
+    """風速の格子[m/s](昇順)"""
+    wind_directions: np.ndarray
+    """風向の格子[deg](0以上360未満の昇順)"""
+    outputs: np.ndarray
+    """格子点での出力(発射角度, 風速, 風向, len(OUTPUT_NAMES))"""
+    cell_error: np.ndarray = field(init=False, repr=False)
+    """セルごとの線形補間の推定誤差(発射角度, 風速, 風向, len(OUTPUT_NAMES))"""
+    axis_cell_error: tuple[np.ndarray, np.ndarray, np.ndarray] = field(init=False, repr=False)
+    """cell_errorの各軸方向の寄与"""
+
+    def __post_init__(self) -> None:
+        self.launcher_elevations = np.asarray(self.launcher_elevations, dtype=float)
+        self.wind_speeds = np.asarray(self.wind_speeds, dtype=float)
+        self.wind_directions = np.asarray(self.wind_directions, dtype=float)
+        self.outputs = np.asarray(self.outputs, dtype=float)
+        expected_shape = (
+            len(self.launcher_elevations),
+            len(self.wind_speeds),
+            len(self.wind_directions),
+            len(OUTPUT_NAMES),
+        )
+        if self.outputs.shape != expected_shape:
+            err_msg = "outputsの形状が格子と一致しません"
+            raise ValueError(err_msg, self.outputs.shape, expected_shape)
+        # 予測時の探索はPythonのリストに対するbisectの方が速い
+        self._elevation_list = self.launcher_elevations.tolist()
+        self._speed_list = self.wind_speeds.tolist()
+        self._direction_list = self.wind_directions.tolist()
+        self._estimate_error()
+
+    def _estimate_error(self) -> None:
+        """格子点の2階差分から各セルの線形補間誤差(h^2/8 * |f''|)を推定する"""
+        coords = (self.launcher_elevations, self.wind_speeds, self.wind_directions)
+        periodic = (False, False, True)
+        contributions = []
+        for axis in range(3):
+            moved = np.moveaxis(self.outputs, axis, 0)
+            curvature = _nodes_to_cells(
+                _node_curvature(moved, coords[axis], periodic=periodic[axis]),
+                periodic=periodic[axis],
+            )
+            widths = _cell_widths(coords[axis], periodic=periodic[axis])
+            error = np.moveaxis(widths.reshape(-1, *([1] * (moved.ndim - 1))) ** 2 / 8 * curvature, 0, axis)
+            # 他の軸についてはセルの両端の格子点の最大値をとる
+            for other in range(3):
+                if other != axis:
+                    error = np.moveaxis(error, other, 0)
+                    error = np.moveaxis(_nodes_to_cells(error, periodic=periodic[other]), 0, other)
+            contributions.append(error)
+        self.axis_cell_error = tuple(contributions)
+        self.cell_error = contributions[0] + contributions[1] + contributions[2]
+
+    def predict_array(
+        self,
+        launcher_elevation: float,
+        wind_speed: float,
+        wind_direction: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """出力と推定誤差をOUTPUT_NAMESの順の配列で予測する
+
+        Args:
+            launcher_elevation (float): 発射角度[deg]
+            wind_speed (float): 風速[m/s]
+            wind_direction (float): 風向[deg]
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: 予測値と推定誤差
+
+        Raises:
+            ValueError: 発射角度か風速が格子の範囲外の場合
+        """
+        i0, i1, a = _locate(self._elevation_list, launcher_elevation, "発射角度")
+        j0, j1, b = _locate(self._speed_list, wind_speed, "風速")
+        k0, k1, c = _locate_periodic(self._direction_list, wind_direction)
+        v = self.outputs
+        lower = (1 - b) * ((1 - c) * v[i0, j0, k0] + c * v[i0, j0, k1]) + b * (
+            (1 - c) * v[i0, j1, k0] + c * v[i0, j1, k1]
+        )
+        upper = (1 - b) * ((1 - c) * v[i1, j0, k0] + c * v[i1, j0, k1]) + b * (
+            (1 - c) * v[i1, j1, k0] + c * v[i1, j1, k1]
+        )
+        return (1 - a) * lower + a * upper, self.cell_error[i0, j0, k0]
+
+    def predict(
+        self,
+        launcher_elevation: float,
+        wind_speed: float,
+        wind_direction: float,
+    ) -> LandingPrediction:
+        """着地点、最高高度、飛行時間を予測する
+
+        Args:
+            launcher_elevation (float): 発射角度[deg]
+            wind_speed (float): 風速[m/s]
+            wind_direction (float): 風向[deg]
+
+        Returns:
+            LandingPrediction: 予測結果
+        """
+        values, error = self.predict_array(launcher_elevation, wind_speed, wind_direction)
+        return LandingPrediction(
+            outputs=dict(zip(OUTPUT_NAMES, values.tolist(), strict=True)),
+            error=dict(zip(OUTPUT_NAMES, error.tolist(), strict=True)),
+        )
+
+    def max_error(self) -> dict[str, float]:
+        """全セルでの推定誤差の最大値
+
+        Returns:
+            dict[str, float]: 出力名から推定誤差の最大値への辞書
+        """
+        return dict(zip(OUTPUT_NAMES, self.cell_error.max(axis=(0, 1, 2)).tolist(), strict=True))
+
+    def refine(
+        self,
+        evaluate: Evaluator,
+        tolerance: dict[str, float],
+        max_iterations: int = 3,
+    ) -> "LandingSurrogate":
+        """推定誤差が許容値を超えるセルに格子点を追加する
+
+        誤差への寄与が最も大きい軸についてセルの中点に格子線を挿入し、
+        新しい格子点だけをevaluateで計算する。
+
+        Args:
+            evaluate (Evaluator): 設定のリストから出力を計算する関数
+            tolerance (dict[str, float]): 出力名から許容誤差への辞書
+            max_iterations (int): 細分化の最大回数
+
+        Returns:
+            LandingSurrogate: 細分化したサロゲートモデル
+        """
+        if max_iterations <= 0:
+            return self
+        indices = [OUTPUT_NAMES.index(name) for name in tolerance]
+        limits = np.array(list(tolerance.values()))
+        ratio = [error[..., indices] / limits for error in self.axis_cell_error]
+        flagged = np.argwhere((ratio[0] + ratio[1] + ratio[2]).max(axis=-1) > 1)
+        split: tuple[set[int], set[int], set[int]] = (set(), set(), set())
+        for cell in map(tuple, flagged):
+            axis = int(np.argmax([r[cell].max() for r in ratio]))
+            split[axis].add(int(cell[axis]))
+        refined = self._split(split, evaluate)
+        if refined.outputs.shape == self.outputs.shape:
+            return self
+        return refined.refine(evaluate, tolerance, max_iterations - 1)
+
+    def _split(self, split: tuple[set[int], set[int], set[int]], evaluate: Evaluator) -> "LandingSurrogate":
+        def midpoints(coords: np.ndarray, cells: set[int], *, periodic: bool) -> list[float]:
+            n = len(coords)
+            if n == 1 and not periodic:
+                return []
+            points = []
+            for i in cells:
+                upper = coords[0] + FULL_CIRCLE if i == n - 1 else coords[i + 1]
+                points.append(((coords[i] + upper) / 2) % FULL_CIRCLE if periodic else (coords[i] + upper) / 2)
+            return points
+
+        elevations = np.unique(
+            np.append(self.launcher_elevations, midpoints(self.launcher_elevations, split[0], periodic=False)),
+        )
+        speeds = np.unique(np.append(self.wind_speeds, midpoints(self.wind_speeds, split[1], periodic=False)))
+        directions = np.unique(
+            np.append(self.wind_directions, midpoints(self.wind_directions, split[2], periodic=True)),
+        )
+        values = np.full((len(elevations), len(speeds), len(directions), len(OUTPUT_NAMES)), np.nan)
+        values[
+            np.ix_(
+                np.searchsorted(elevations, self.launcher_elevations),
+                np.searchsorted(speeds, self.wind_speeds),
+                np.searchsorted(directions, self.wind_directions),
+            )
+        ] = self.outputs
+        missing = np.argwhere(np.isnan(values[..., 0]))
+        settings = [
+            Setting(
+                launcher_elevation=float(elevations[i]),
+                wind_speed=float(speeds[j]),
+                wind_direction=float(directions[k]),
+            )
+            for i, j, k in missing
+        ]
+        if settings:
+            values[tuple(missing.T)] = evaluate(settings)
+        return LandingSurrogate(elevations, speeds, directions, values)
+
+    @classmethod
+    def build(
+        cls,
+        evaluate: Evaluator,
+        launcher_elevations: list[float],
+        wind_speeds: list[float],
+        wind_directions: list[float],
+    ) -> "LandingSurrogate":
+        """格子上の全ての点を計算してサロゲートモデルを作成する
+
+        Args:
+            evaluate (Evaluator): 設定のリストから出力を計算する関数
+            launcher_elevations (list[float]): 発射角度の格子[deg]
+            wind_speeds (list[float]): 風速の格子[m/s]
+            wind_directions (list[float]): 風向の格子[deg]
+
+        Returns:
+            LandingSurrogate: サロゲートモデル
+        """
+        elevations = np.unique(launcher_elevations)
+        speeds = np.unique(wind_speeds)
+        directions = np.unique(np.mod(wind_directions, FULL_CIRCLE))
+        settings = [
+            Setting(launcher_elevation=float(e), wind_speed=float(s), wind_direction=float(d))
+            for e in elevations
+            for s in speeds
+            for d in directions
+        ]
+        values = evaluate(settings).reshape(len(elevations), len(speeds), len(directions), len(OUTPUT_NAMES))
+        return cls(elevations, speeds, directions, values)
+
+    @classmethod
+    def from_samples(cls, settings: list[Setting], values: np.ndarray) -> "LandingSurrogate":
+        """計算済みのサンプルからサロゲートモデルを作成する
+
+        Args:
+            settings (list[Setting]): サンプルの設定
+            values (np.ndarray): サンプルの出力(サンプル数, len(OUTPUT_NAMES))
+
+        Returns:
+            LandingSurrogate: サロゲートモデル
+
+        Raises:
+            ValueError: サンプルが格子を埋めていない場合
+        """
+        elevations = np.unique([s.launcher_elevation for s in settings])
+        speeds = np.unique([s.wind_speed for s in settings])
+        directions = np.unique([s.wind_direction % FULL_CIRCLE for s in settings])
+        grid = np.full((len(elevations), len(speeds), len(directions), len(OUTPUT_NAMES)), np.nan)
+        for setting, value in zip(settings, values, strict=True):
+            grid[
+                np.searchsorted(elevations, setting.launcher_elevation),
+                np.searchsorted(speeds, setting.wind_speed),
+                np.searchsorted(directions, setting.wind_direction % FULL_CIRCLE),
+            ] = value
+        if np.isnan(grid).any():
+            err_msg = "サンプルが(発射角度, 風速, 風向)の格子を埋めていません"
+            raise ValueError(err_msg)
+        return cls(elevations, speeds, directions, grid)
+
+    @classmethod
+    def from_result_for_report(cls, result: ResultForReport) -> "LandingSurrogate":
+        """レポート用の計算結果からサロゲートモデルを作成する
+
+        Args:
+            result (ResultForReport): レポート用の計算結果
+
+        Returns:
+            LandingSurrogate: サロゲートモデル
+        """
+        settings = []
+        values = []
+        for elevation_result in result.result_by_launcher_elevation:
+            for speed_result in elevation_result.result:
+                for direction_result in speed_result.result:
+                    settings.append(
+                        Setting(
+                            launcher_elevation=elevation_result.launcher_elevation,
+                            wind_speed=speed_result.wind_speed,
+                            wind_direction=direction_result.wind_direction,
+                        ),
+                    )
+                    values.append(
+                        outputs_from_result(
+                            direction_result.result_parachute_off,
+                            direction_result.result_parachute_on,
+                        ),
+                    )
+        return cls.from_samples(settings, np.array(values))
+
+    def save(self, path: Path) -> None:
+        """ファイルに保存する
+
+        Args:
+            path (Path): 保存先(.npz)
+        """
+        np.savez(
+            path,
+            launcher_elevations=self.launcher_elevations,
+            wind_speeds=self.wind_speeds,
+            wind_directions=self.wind_directions,
+            values=self.outputs,
+            output_names=np.array(OUTPUT_NAMES),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "LandingSurrogate":
+        """ファイルから読み込む
+
+        Args:
+            path (Path): saveで保存したファイル
+
+        Returns:
+            LandingSurrogate: サロゲートモデル
+
+        Raises:
+            ValueError: 出力の種類が現在のOUTPUT_NAMESと一致しない場合
+        """
+        with np.load(path) as data:
+            if tuple(data["output_names"].tolist()) != OUTPUT_NAMES:
+                err_msg = "保存されたサロゲートモデルの出力の種類が一致しません"
+                raise ValueError(err_msg)
+            return cls(data["launcher_elevations"], data["wind_speeds"], data["wind_directions"], data["values"])
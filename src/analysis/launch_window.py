@@ -0,0 +1,237 @@
+import contextlib
+import copy
+import typing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.core import simple_simulation
+from src.core.config import Config
+from src.core.simulation_context import SimulationContext
+from src.core.wind_profile import WindProfile
+from src.geography.launch_site import LaunchSite
+
+LANDING_NAMES = (
+    "landing_north_parachute_off",
+    "landing_east_parachute_off",
+    "landing_north_parachute_on",
+    "landing_east_parachute_on",
+)
+"""着地点の計算結果の名前(ProfileEvaluatorの出力の最後の軸の順番)"""
+
+DEFAULT_MEMBER = "0"
+"""アンサンブルのメンバーが指定されていない予報のメンバー名"""
+
+ProfileKey = tuple[float, str]
+"""(予報の時刻, アンサンブルのメンバー)"""
+
+ProfileEvaluator = typing.Callable[[list[WindProfile]], np.ndarray]
+"""風の分布のリストから着地点の配列(分布数, len(LANDING_NAMES))を計算する関数"""
+
+
+def forecast_profiles(
+    forecast: pd.DataFrame,
+    times: typing.Sequence[float] | None = None,
+) -> dict[ProfileKey, WindProfile]:
+    """予報値の表から時刻とメンバーごとの風の分布を作成する
+
+    Args:
+        forecast (pd.DataFrame): time、altitude[m]、wind_speed[m/s]、wind_direction[deg]のカラムを持つ表。
+            memberのカラムがある場合はアンサンブル予報とみなす
+        times (typing.Sequence[float] | None): 評価する時刻。予報の時刻の間は線形補間する。
+            Noneの場合は予報に含まれる全ての時刻
+
+    Returns:
+        dict[ProfileKey, WindProfile]: (時刻, メンバー)から風の分布への辞書
+
+    Raises:
+        ValueError: timeのカラムがない場合
+    """
+    if "time" not in forecast.columns:
+        err_msg = "予報の表にはtimeのカラムが必要です"
+        raise ValueError(err_msg)
+    if times is None:
+        times = np.unique(forecast["time"].to_numpy(dtype=float)).tolist()
+    members = forecast["member"].astype(str) if "member" in forecast.columns else DEFAULT_MEMBER
+    profiles = {}
+    for member, df in forecast.assign(member=members).groupby("member", sort=True):
+        profile = WindProfile.from_df(df.drop(columns="member"))
+        for time in times:
+            profiles[float(time), str(member)] = profile.at_time(time)
+    return profiles
+
+
+ProfileArrays = tuple[np.ndarray, np.ndarray, np.ndarray]
+"""ワーカーに送る時間変化しない風の分布(高度, 北向き成分, 東向き成分)"""
+
+
+def profile_context(original: SimulationContext, profile: WindProfile) -> SimulationContext:
+    """作成済みのSimulationContextの風を風の分布に置き換える
+
+    Args:
+        original (SimulationContext): 変更前のコンテキスト(書き換えない)
+        profile (WindProfile): 時間変化しない風の分布
+
+    Returns:
+        SimulationContext: 変更したコピー
+    """
+    context = copy.copy(original)
+    context.wind = profile
+    context.wind_batch = profile.batch
+    return context
+
+
+@dataclass
+class _WorkerState:
+    """ワーカーのプロセスごとに1度だけ受け取るコンテキスト"""
+
+    context: SimulationContext | None = None
+
+
+_worker = _WorkerState()
+
+
+def _initialize(context: SimulationContext) -> None:
+    """ワーカーの起動時にコンテキストを受け取る(分布ごとにコンフィグを送らないようにする)"""
+    _worker.context = context
+
+
+def _landing(arrays: ProfileArrays) -> np.ndarray:
+    """ワーカーが受け取ったコンテキストで、風の分布を与えた場合の着地点をLANDING_NAMESの順に求める"""
+    context = profile_context(typing.cast("SimulationContext", _worker.context), WindProfile(*arrays))
+    parachute_off, parachute_on = simple_simulation.predict_landing(
+        context,
+        0,
+        simple_simulation.initial_state(context),
+        outputs=(),
+        fast=False,
+    )
+    return np.array([*parachute_off.landing_position[:2], *parachute_on.landing_position[:2]])
+
+
+@contextlib.contextmanager
+def landing_evaluator(config: Config, max_workers: int | None = None) -> Iterator[ProfileEvaluator]:
+    """着地点だけを求めるシミュレーションを並列に実行する関数を生成する
+
+    プロセスのプールはwithに入った時に1度だけ作成する。コンフィグは親のプロセスでSimulationContextに変換して
+    ワーカーの起動時に1度だけ送り、各タスクでは風の分布の配列だけを送る。
+
+    Args:
+        config (Config): コンフィグ
+        max_workers (int | None): 並列に実行するプロセス数(Noneの場合はCPU数)
+
+    Yields:
+        ProfileEvaluator: 風の分布のリストから着地点の配列を計算する関数(withの中でのみ使用できる)
+    """
+    with ProcessPoolExecutor(
+        max_workers,
+        initializer=_initialize,
+        initargs=(SimulationContext(config),),
+    ) as executor:
+
+        def evaluate(profiles: list[WindProfile]) -> np.ndarray:
+            # 時間変化する分布はwind_profile_timeを0とした場合と同じく時刻0の分布を用いる
+            arrays = [
+                (profile.altitude, profile.wind_north[0], profile.wind_east[0])
+                for profile in (profile.at_time(0.0) for profile in profiles)
+            ]
+            return np.array(list(executor.map(_landing, arrays))).reshape(-1, len(LANDING_NAMES))
+
+        yield evaluate
+
+
+def _profile_key(profile: WindProfile) -> bytes:
+    """同じ風の分布を判定するためのキー"""
+    return profile.altitude.tobytes() + profile.wind_north.tobytes() + profile.wind_east.tobytes()
+
+
+def simulate_landings(
+    evaluate: ProfileEvaluator,
+    profiles: dict[ProfileKey, WindProfile],
+    cache: dict[bytes, np.ndarray] | None = None,
+) -> pd.DataFrame:
+    """時刻とメンバーごとの着地点を求める
+
+    同じ風の分布は一度だけ計算する。
+
+    Args:
+        evaluate (ProfileEvaluator): 風の分布のリストから着地点を計算する関数
+        profiles (dict[ProfileKey, WindProfile]): (時刻, メンバー)から風の分布への辞書
+        cache (dict[bytes, np.ndarray] | None): 計算済みの着地点。
+            呼び出しをまたいで再利用する場合に渡し、新たに計算した着地点が追加される
+
+    Returns:
+        pd.DataFrame: time、memberとLANDING_NAMESのカラムを持つ表
+    """
+    cache = {} if cache is None else cache
+    keys = [_profile_key(profile) for profile in profiles.values()]
+    missing = {key: profile for key, profile in zip(keys, profiles.values(), strict=True) if key not in cache}
+    if missing:
+        cache.update(zip(missing, evaluate(list(missing.values())), strict=True))
+    df = pd.DataFrame(
+        np.array([cache[key] for key in keys]).reshape(-1, len(LANDING_NAMES)),
+        columns=list(LANDING_NAMES),
+    )
+    df.insert(0, "time", [time for time, _ in profiles])
+    df.insert(1, "member", [member for _, member in profiles])
+    return df
+
+
+def launch_window(landings: pd.DataFrame, site: LaunchSite, margin: float = 0.0) -> pd.DataFrame:
+    """時刻ごとの着地点の統計と打ち上げ可否を求める
+
+    全てのメンバーについて、パラシュートが開いた場合と開かなかった場合の着地点が
+    落下可能域の境界からmargin以上内側にある時刻を打ち上げ可能とする。
+
+    Args:
+        landings (pd.DataFrame): simulate_landingsで求めた着地点
+        site (LaunchSite): 射場
+        margin (float): 落下可能域の境界から必要な距離[m]
+
+    Returns:
+        pd.DataFrame: 時刻をindexとし、メンバー数、着地点の平均とばらつき、
+            境界までの最小の余裕、打ち上げ可否を持つ表
+    """
+    rows = []
+    for time, df in landings.groupby("time", sort=True):
+        row: dict[str, float | int | bool] = {"time": float(time), "members": len(df)}
+        margins = []
+        for state in ("parachute_off", "parachute_on"):
+            north = df[f"landing_north_{state}"].to_numpy()
+            east = df[f"landing_east_{state}"].to_numpy()
+            row[f"landing_north_{state}"] = north.mean()
+            row[f"landing_east_{state}"] = east.mean()
+            # メンバー間のばらつきは平均の着地点からの最大距離で表す
+            row[f"spread_{state}"] = np.hypot(north - north.mean(), east - east.mean()).max()
+            margins.append(site.margin(north, east).min())
+        row["min_margin"] = min(margins)
+        row["go"] = bool(row["min_margin"] >= margin)
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("time")
+
+
+def plan_launch_window(
+    config: Config,
+    site: LaunchSite,
+    forecast: pd.DataFrame,
+    margin: float = 0.0,
+    times: typing.Sequence[float] | None = None,
+) -> pd.DataFrame:
+    """風の予報から打ち上げ可能な時刻を求める
+
+    Args:
+        config (Config): コンフィグ
+        site (LaunchSite): 射場
+        forecast (pd.DataFrame): forecast_profilesに渡す予報値の表
+        margin (float): 落下可能域の境界から必要な距離[m]
+        times (typing.Sequence[float] | None): 評価する時刻(Noneの場合は予報に含まれる全ての時刻)
+
+    Returns:
+        pd.DataFrame: launch_windowの表
+    """
+    with landing_evaluator(config) as evaluate:
+        landings = simulate_landings(evaluate, forecast_profiles(forecast, times))
+    return launch_window(landings, site, margin)
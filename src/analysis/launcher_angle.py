@@ -0,0 +1,173 @@
+import dataclasses
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.analysis.landing_surrogate import (
+    FULL_CIRCLE,
+    OUTPUT_NAMES,
+    Evaluator,
+    LandingSurrogate,
+    simulation_evaluator,
+)
+from src.core.config import Config
+from src.geography.launch_site import LaunchSite
+from src.make_report.make_result_for_report import Setting
+
+_LANDING_INDICES = [
+    [OUTPUT_NAMES.index("landing_north_parachute_off"), OUTPUT_NAMES.index("landing_east_parachute_off")],
+    [OUTPUT_NAMES.index("landing_north_parachute_on"), OUTPUT_NAMES.index("landing_east_parachute_on")],
+]
+"""出力の配列での着地点(北, 東)の位置(パラシュートが開かなかった場合, 開いた場合)"""
+
+
+@dataclass
+class LauncherAngle:
+    """ランチャーの角度の最適化結果"""
+
+    elevation: float
+    """発射角度[deg]"""
+    azimuth: float
+    """方位角[deg]"""
+    predicted_margin: float
+    """サロゲートモデルで予測した落下可能域の境界までの最小の余裕[m]"""
+    margin: float
+    """シミュレーションで確認した落下可能域の境界までの最小の余裕[m]"""
+    landings: np.ndarray
+    """確認したシミュレーションでの着地点(風の組み合わせ数, 2(パラシュートの有無), 2(北, 東))"""
+    simulations: int
+    """実行したシミュレーションの回数"""
+
+
+def rotated_landings(outputs: np.ndarray, rotation: float) -> np.ndarray:
+    """出力の配列から着地点を取り出し、発射地点を中心に回転する
+
+    Args:
+        outputs (np.ndarray): OUTPUT_NAMESの順の出力(N, len(OUTPUT_NAMES))
+        rotation (float): 北から東への回転角[deg]
+
+    Returns:
+        np.ndarray: 回転した着地点(N, 2(パラシュートの有無), 2(北, 東))
+    """
+    landings = np.asarray(outputs)[:, _LANDING_INDICES]
+    theta = np.deg2rad(rotation)
+    north = landings[..., 0] * np.cos(theta) - landings[..., 1] * np.sin(theta)
+    east = landings[..., 0] * np.sin(theta) + landings[..., 1] * np.cos(theta)
+    return np.stack([north, east], axis=-1)
+
+
+def predicted_landings(
+    surrogate: LandingSurrogate,
+    reference_azimuth: float,
+    elevation: float,
+    azimuth: float,
+    winds: list[tuple[float, float]],
+) -> np.ndarray:
+    """サロゲートモデルから任意の方位角での着地点を予測する
+
+    機体と風は鉛直軸まわりに対称なため、方位角をΔだけ回した場合の着地点は
+    風向を-Δだけ回した場合の着地点をΔだけ回したものとなる。
+    そのため、基準の方位角で作成したサロゲートモデルで全ての方位角を予測できる。
+
+    Args:
+        surrogate (LandingSurrogate): 方位角reference_azimuthで作成したサロゲートモデル
+        reference_azimuth (float): サロゲートモデルの方位角[deg]
+        elevation (float): 発射角度[deg]
+        azimuth (float): 方位角[deg]
+        winds (list[tuple[float, float]]): (風速[m/s], 風向[deg])のリスト
+
+    Returns:
+        np.ndarray: 着地点(風の組み合わせ数, 2(パラシュートの有無), 2(北, 東))
+    """
+    rotation = azimuth - reference_azimuth
+    outputs = np.array(
+        [surrogate.predict_array(elevation, speed, direction - rotation)[0] for speed, direction in winds],
+    )
+    return rotated_landings(outputs, rotation)
+
+
+def minimum_margin(site: LaunchSite, landings: np.ndarray) -> float:
+    """着地点から落下可能域の境界までの最小の余裕を求める
+
+    Args:
+        site (LaunchSite): 射場
+        landings (np.ndarray): 着地点(..., 2(北, 東))
+
+    Returns:
+        float: 最小の余裕[m](外側にある着地点がある場合は負)
+    """
+    return float(site.margin(landings[..., 0].ravel(), landings[..., 1].ravel()).min())
+
+
+def optimize_launcher_angle(
+    config: Config,
+    site: LaunchSite,
+    wind_speeds: typing.Sequence[float],
+    wind_directions: typing.Sequence[float],
+    elevation_range: tuple[float, float],
+    *,
+    surrogate_elevations: int = 3,
+    surrogate_directions: int = 12,
+    evaluator: typing.Callable[[Config], Evaluator] = simulation_evaluator,
+) -> LauncherAngle:
+    """風の格子の全ての着地点が落下可能域に収まるようにランチャーの角度を求める
+
+    configの方位角で(発射角度, 風速, 風向)のサロゲートモデルを作成し、
+    回転対称性を用いて全ての方位角での着地点を予測する。
+    予測した最小の余裕が最大となる角度を粗い格子と細かい格子で探し、
+    最後にその角度で風の格子の全ての組み合わせをシミュレーションして確認する。
+    シミュレーションの回数はsurrogate_elevations * len(wind_speeds) * surrogate_directions
+    + len(wind_speeds) * len(wind_directions)となる。
+
+    Args:
+        config (Config): コンフィグ
+        site (LaunchSite): 射場
+        wind_speeds (typing.Sequence[float]): 風速の格子[m/s]
+        wind_directions (typing.Sequence[float]): 風向の格子[deg]
+        elevation_range (tuple[float, float]): 探索する発射角度の範囲[deg]
+        surrogate_elevations (int): サロゲートモデルの発射角度の格子点の数
+        surrogate_directions (int): サロゲートモデルの風向の格子点の数
+        evaluator (typing.Callable[[Config], Evaluator]): コンフィグから設定のリストの出力を計算する関数を作る関数
+
+    Returns:
+        LauncherAngle: 最適化結果
+    """
+    reference_azimuth = config.first_azimuth
+    surrogate = LandingSurrogate.build(
+        evaluator(config),
+        np.linspace(*elevation_range, surrogate_elevations).tolist(),
+        list(wind_speeds),
+        np.arange(surrogate_directions) * FULL_CIRCLE / surrogate_directions,
+    )
+    winds = [(float(speed), float(direction)) for speed in wind_speeds for direction in wind_directions]
+
+    def predicted_margin(elevation: float, azimuth: float) -> float:
+        landings = predicted_landings(surrogate, reference_azimuth, elevation, azimuth, winds)
+        return minimum_margin(site, landings)
+
+    def best(elevations: np.ndarray, azimuths: np.ndarray) -> tuple[float, float, float]:
+        candidates = [(predicted_margin(e, a), e, a) for e in elevations.tolist() for a in azimuths.tolist()]
+        return max(candidates)
+
+    low, high = elevation_range
+    margin, elevation, azimuth = best(np.linspace(low, high, 11), np.arange(0.0, FULL_CIRCLE, 5.0))
+    # 粗い格子の最良点のまわりを細かく探す
+    margin, elevation, azimuth = best(
+        np.clip(elevation + np.linspace(-1.5, 1.5, 13), low, high),
+        (azimuth + np.arange(-5.0, 5.5, 0.5)) % FULL_CIRCLE,
+    )
+
+    settings = [
+        Setting(launcher_elevation=elevation, wind_speed=speed, wind_direction=direction) for speed, direction in winds
+    ]
+    outputs = evaluator(dataclasses.replace(config, first_azimuth=azimuth))(settings)
+    landings = rotated_landings(outputs, 0.0)
+    return LauncherAngle(
+        elevation=elevation,
+        azimuth=azimuth,
+        predicted_margin=margin,
+        margin=minimum_margin(site, landings),
+        landings=landings,
+        simulations=surrogate.outputs[..., 0].size + len(settings),
+    )
@@ -0,0 +1,233 @@
+import dataclasses
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.launch_window import LANDING_NAMES
+from src.analysis.parameter_fit import apply_parameters
+from src.core import point_mass
+from src.core.config import Config
+from src.make_report.simulation_worker import simulate_many
+
+LandingEvaluator = typing.Callable[[list[Config]], np.ndarray]
+"""コンフィグのリストから着地点の配列(コンフィグ数, len(LANDING_NAMES))を計算する関数"""
+
+
+@dataclass(frozen=True)
+class Dispersion:
+    """着地点の分散を求める際に揺らがせるパラメータの標準偏差"""
+
+    wind_speed: float = 1.0
+    """風速[m/s]"""
+    wind_direction: float = 15.0
+    """風向[deg]"""
+    CA: float = 0.05
+    """軸力係数(相対値)"""
+    thrust_scale: float = 0.03
+    """推力の倍率"""
+    elevation: float = 0.5
+    """発射角度[deg]"""
+
+    def sample(self, config: Config, size: int, rng: np.random.Generator) -> list[Config]:
+        """正規分布に従って揺らがせたコンフィグを作成する
+
+        Args:
+            config (Config): 基準のコンフィグ
+            size (int): 作成する数
+            rng (np.random.Generator): 乱数生成器
+
+        Returns:
+            list[Config]: 揺らがせたコンフィグのリスト(風速は0以上に切り詰める)
+
+        Raises:
+            ValueError: 空力係数の表を用いるコンフィグでCAを揺らがせる場合(表を用いる場合CAは軌道に影響しない)
+        """
+        if self.CA != 0 and config.aerodynamic_table is not None:
+            err_msg = "aerodynamics.csvを用いる場合はCAを揺らがせることができません"
+            raise ValueError(err_msg)
+        noise = rng.standard_normal((size, 5))
+        configs = []
+        for speed, direction, ca, thrust, elevation in noise.tolist():
+            wind = dataclasses.replace(
+                config.wind,
+                wind_speed=max(config.wind.wind_speed + self.wind_speed * speed, 0.0),
+                wind_direction=(config.wind.wind_direction + self.wind_direction * direction) % 360,
+            )
+            if config.aerodynamic_table is None:
+                changed = apply_parameters(
+                    config,
+                    ["CA", "thrust_scale"],
+                    np.array([config.CA * (1 + self.CA * ca), 1 + self.thrust_scale * thrust]),
+                )
+            else:
+                changed = apply_parameters(config, ["thrust_scale"], np.array([1 + self.thrust_scale * thrust]))
+            configs.append(
+                dataclasses.replace(
+                    changed,
+                    wind=wind,
+                    first_elevation=config.first_elevation + self.elevation * elevation,
+                ),
+            )
+        return configs
+
+
+def high_fidelity_evaluator(max_workers: int | None = None) -> LandingEvaluator:
+    """6自由度のモデルで着地点を並列に求める関数を生成する
+
+    計算はsimulate_manyのprocessで行い、着地点はRunResultの最後の行から読む。
+
+    Args:
+        max_workers (int | None): 並列に実行するプロセス数(Noneの場合はCPU数)
+
+    Returns:
+        LandingEvaluator: コンフィグのリストから着地点の配列を計算する関数
+    """
+
+    def evaluate(configs: list[Config]) -> np.ndarray:
+        results = simulate_many(configs, backend="process", max_workers=max_workers, landing_only=True)
+        return np.array(
+            [
+                [
+                    result.result_parachute_off["position_n"].iloc[-1],
+                    result.result_parachute_off["position_e"].iloc[-1],
+                    result.result_parachute_on["position_n"].iloc[-1],
+                    result.result_parachute_on["position_e"].iloc[-1],
+                ]
+                for result in results
+            ],
+        ).reshape(-1, len(LANDING_NAMES))
+
+    return evaluate
+
+
+def low_fidelity_evaluator(descent_dt: float = 1.0) -> LandingEvaluator:
+    """3自由度の質点モデルで着地点をまとめて求める関数を生成する
+
+    Args:
+        descent_dt (float): 下降中の最大の時間刻み[s]
+
+    Returns:
+        LandingEvaluator: コンフィグのリストから着地点の配列を計算する関数
+    """
+
+    def evaluate(configs: list[Config]) -> np.ndarray:
+        parachute_off, parachute_on = point_mass.simulate_landing_batch(configs, descent_dt=descent_dt)
+        return np.concatenate([parachute_off[:, :2], parachute_on[:, :2]], axis=1)
+
+    return evaluate
+
+
+@dataclass
+class ControlVariate:
+    """制御変量法による平均の推定結果(各値は出力ごとの配列)"""
+
+    mean: np.ndarray
+    """平均"""
+    std: np.ndarray
+    """標準偏差(低精度の出力で説明できる分の分散を全てのサンプルから求める)"""
+    standard_error: np.ndarray
+    """平均の標準誤差"""
+    plain_standard_error: np.ndarray
+    """高精度のサンプルだけから求めた場合の平均の標準誤差"""
+    correlation: np.ndarray
+    """高精度と低精度のモデルの相関係数"""
+    variance_reduction: np.ndarray
+    """平均の推定の分散の縮小率(高精度のサンプルだけの場合の分散 / 制御変量法の分散)"""
+
+
+def control_variate(high: np.ndarray, low_paired: np.ndarray, low_all: np.ndarray) -> ControlVariate:
+    """少数の高精度のサンプルと多数の低精度のサンプルを制御変量法で組み合わせる
+
+    low_pairedはhighと同じ入力での低精度の出力、low_allは全ての入力での低精度の出力とする。
+    βを回帰係数として、平均はmean(high) - β(mean(low_paired) - mean(low_all))、
+    分散はvar(high) + β^2 (var(low_all) - var(low_paired))で推定する。
+    平均の推定値の分散はvar(high) / n * (1 - r^2 (1 - n / N))となる(n, Nはそれぞれのサンプル数、rは相関係数)。
+
+    Args:
+        high (np.ndarray): 高精度の出力(n, 出力の数)
+        low_paired (np.ndarray): highと同じ入力での低精度の出力(n, 出力の数)
+        low_all (np.ndarray): 全ての入力での低精度の出力(N, 出力の数)
+
+    Returns:
+        ControlVariate: 推定結果
+
+    Raises:
+        ValueError: 高精度のサンプルが2つ未満の場合や、サンプル数が一致しない場合
+    """
+    high, low_paired, low_all = (np.asarray(values, dtype=float) for values in [high, low_paired, low_all])
+    n, total = len(high), len(low_all)
+    if n < 2 or len(low_paired) != n or total < n:  # noqa: PLR2004
+        err_msg = "高精度のサンプルは2つ以上で、低精度のサンプルの数以下である必要があります"
+        raise ValueError(err_msg)
+    high_variance = high.var(axis=0, ddof=1)
+    low_variance = low_paired.var(axis=0, ddof=1)
+    covariance = ((high - high.mean(axis=0)) * (low_paired - low_paired.mean(axis=0))).sum(axis=0) / (n - 1)
+    beta = np.where(low_variance == 0, 0.0, covariance / np.where(low_variance == 0, 1.0, low_variance))
+    scale = np.sqrt(high_variance * low_variance)
+    correlation = np.where(scale == 0, 0.0, covariance / np.where(scale == 0, 1.0, scale))
+    mean = high.mean(axis=0) - beta * (low_paired.mean(axis=0) - low_all.mean(axis=0))
+    plain_variance = high_variance / n
+    variance = plain_variance * (1 - correlation**2 * (1 - n / total))
+    return ControlVariate(
+        mean=mean,
+        std=np.sqrt(np.maximum(high_variance + beta**2 * (low_all.var(axis=0, ddof=1) - low_variance), 0.0)),
+        standard_error=np.sqrt(variance),
+        plain_standard_error=np.sqrt(plain_variance),
+        correlation=correlation,
+        variance_reduction=np.where(variance == 0, np.inf, plain_variance / np.where(variance == 0, 1.0, variance)),
+    )
+
+
+@dataclass
+class MultiFidelityResult:
+    """着地点の分散の推定結果"""
+
+    statistics: pd.DataFrame
+    """LANDING_NAMESを行とし、ControlVariateの各値を列とする表"""
+    high: np.ndarray
+    """高精度のモデルでの着地点(高精度のサンプル数, len(LANDING_NAMES))"""
+    low: np.ndarray
+    """低精度のモデルでの着地点(サンプル数, len(LANDING_NAMES))"""
+
+
+def multi_fidelity_dispersion(
+    config: Config,
+    dispersion: Dispersion,
+    samples: int,
+    high_fidelity_samples: int,
+    *,
+    seed: int = 0,
+    high_fidelity: LandingEvaluator | None = None,
+    low_fidelity: LandingEvaluator | None = None,
+) -> MultiFidelityResult:
+    """パラメータの誤差による着地点の分布の平均と標準偏差を多精度モンテカルロ法で求める
+
+    全てのサンプルを安い3自由度の質点モデルで計算し、そのうち先頭のhigh_fidelity_samples個だけを
+    6自由度のモデルで計算する。2つのモデルの着地点は強く相関するため、制御変量法で組み合わせると
+    同じ回数の6自由度のシミュレーションだけを用いる場合より標準誤差が小さくなる。
+
+    Args:
+        config (Config): 基準のコンフィグ
+        dispersion (Dispersion): 揺らがせるパラメータの標準偏差
+        samples (int): 低精度のモデルで計算するサンプル数
+        high_fidelity_samples (int): 高精度のモデルで計算するサンプル数
+        seed (int): 乱数のシード
+        high_fidelity (LandingEvaluator | None): 高精度のモデル(Noneの場合はhigh_fidelity_evaluator())
+        low_fidelity (LandingEvaluator | None): 低精度のモデル(Noneの場合はlow_fidelity_evaluator())
+
+    Returns:
+        MultiFidelityResult: 推定結果
+    """
+    high_fidelity = high_fidelity_evaluator() if high_fidelity is None else high_fidelity
+    low_fidelity = low_fidelity_evaluator() if low_fidelity is None else low_fidelity
+    configs = dispersion.sample(config, samples, np.random.default_rng(seed))
+    low = low_fidelity(configs)
+    high = high_fidelity(configs[:high_fidelity_samples])
+    estimate = control_variate(high, low[:high_fidelity_samples], low)
+    statistics = pd.DataFrame(
+        {field.name: getattr(estimate, field.name) for field in dataclasses.fields(ControlVariate)},
+        index=pd.Index(LANDING_NAMES),
+    )
+    return MultiFidelityResult(statistics=statistics, high=high, low=low)
@@ -0,0 +1,347 @@
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import pickle
+import typing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.core import simple_simulation
+from src.core.config import Config
+
+FIT_PARAMETERS = ("CA", "CN_alpha", "thrust_scale")
+"""同定できるパラメータ(thrust_scaleは推力の表全体に掛ける倍率)"""
+
+TABLE_PARAMETERS = ("CA", "CN_alpha")
+"""aerodynamics.csvを用いる場合はシミュレーションに影響しないため同定できないパラメータ"""
+
+LOG_COLUMNS = {"altitude": "高度[m]", "acceleration": "機軸方向の加速度[m/s^2]"}
+"""飛行ログで比較できるカラム"""
+
+ResidualEvaluator = typing.Callable[[list[np.ndarray]], np.ndarray]
+"""パラメータの配列のリストから残差の配列(パラメータ数, 残差の数)を計算する関数"""
+
+
+def apply_parameters(config: Config, names: typing.Sequence[str], values: np.ndarray) -> Config:
+    """パラメータを書き換えたコンフィグを作成する
+
+    Args:
+        config (Config): 元のコンフィグ
+        names (typing.Sequence[str]): FIT_PARAMETERSのうち書き換えるパラメータの名前
+        values (np.ndarray): パラメータの値
+
+    Returns:
+        Config: 書き換えたコンフィグ
+
+    Raises:
+        ValueError: 同定できないパラメータが指定された場合
+    """
+    check_parameters(config, names)
+    changes = {}
+    for name, value in zip(names, np.asarray(values, dtype=float).tolist(), strict=True):
+        if name == "thrust_scale":
+            changes["thrust"] = config.thrust * value
+        else:
+            changes[name] = value
+    return dataclasses.replace(config, **changes)
+
+
+def check_parameters(config: Config, names: typing.Sequence[str]) -> None:
+    """コンフィグで同定できるパラメータかを確認する
+
+    aerodynamics.csvを用いる場合、空力係数は表から求めるためCAとCN_alphaは軌道に影響しない。
+
+    Args:
+        config (Config): コンフィグ
+        names (typing.Sequence[str]): 同定するパラメータの名前
+
+    Raises:
+        ValueError: 同定できないパラメータが指定された場合
+    """
+    for name in names:
+        if name not in FIT_PARAMETERS:
+            err_msg = f"同定できないパラメータが指定されました: {name}"
+            raise ValueError(err_msg)
+        if name in TABLE_PARAMETERS and config.aerodynamic_table is not None:
+            err_msg = f"aerodynamics.csvを用いる場合は{name}を同定できません"
+            raise ValueError(err_msg)
+
+
+def sample_trajectory(result: pd.DataFrame, times: np.ndarray) -> pd.DataFrame:
+    """シミュレーション結果を任意の時刻で補間する
+
+    最も近い行を用いるのではなく、時刻の列を二分探索して前後のステップの間を補間する。
+    高度は速度を用いた3次エルミート補間、加速度は線形補間で求める。
+    シミュレーションの範囲外の時刻では端の値を用いる。
+
+    Args:
+        result (pd.DataFrame): SimulationResult.to_dfの結果
+        times (np.ndarray): 補間する時刻(N,)
+
+    Returns:
+        pd.DataFrame: LOG_COLUMNSのカラムを持つ表(N行)
+    """
+    time = result["time"].to_numpy(dtype=float)
+    times = np.clip(np.asarray(times, dtype=float), time[0], time[-1])
+    i = np.clip(np.searchsorted(time, times, side="right") - 1, 0, len(time) - 2)
+    dt = time[i + 1] - time[i]
+    s = (times - time[i]) / dt
+    altitude = -result["position_d"].to_numpy(dtype=float)
+    climb_rate = -result["velocity_d"].to_numpy(dtype=float)
+    h00 = 2 * s**3 - 3 * s**2 + 1
+    h10 = s**3 - 2 * s**2 + s
+    h01 = -2 * s**3 + 3 * s**2
+    h11 = s**3 - s**2
+    acceleration = result["acceleration_body_frame_x"].to_numpy(dtype=float)
+    return pd.DataFrame(
+        {
+            "altitude": h00 * altitude[i]
+            + h10 * dt * climb_rate[i]
+            + h01 * altitude[i + 1]
+            + h11 * dt * climb_rate[i + 1],
+            "acceleration": (1 - s) * acceleration[i] + s * acceleration[i + 1],
+        },
+    )
+
+
+def residual(result: pd.DataFrame, log: pd.DataFrame, weights: dict[str, float]) -> np.ndarray:
+    """飛行ログとシミュレーション結果の重み付きの残差を求める
+
+    Args:
+        result (pd.DataFrame): SimulationResult.to_dfの結果
+        log (pd.DataFrame): timeとLOG_COLUMNSのいずれかのカラムを持つ飛行ログ(欠損値は無視する)
+        weights (dict[str, float]): カラム名から残差に掛ける重み(測定誤差の逆数など)への辞書
+
+    Returns:
+        np.ndarray: weightsのカラムの順に並べた残差
+    """
+    sampled = sample_trajectory(result, log["time"].to_numpy(dtype=float))
+    residuals = []
+    for column, weight in weights.items():
+        measured = log[column].to_numpy(dtype=float)
+        valid = ~np.isnan(measured)
+        residuals.append(weight * (sampled[column].to_numpy()[valid] - measured[valid]))
+    return np.concatenate(residuals)
+
+
+@dataclass
+class _WorkerState:
+    """ワーカーのプロセスごとに1度だけ受け取るシミュレーションの条件"""
+
+    config: Config | None = None
+    names: tuple[str, ...] = ()
+    log: pd.DataFrame | None = None
+    weights: dict[str, float] = dataclasses.field(default_factory=dict)
+    parachute_on: bool = True
+
+
+_worker = _WorkerState()
+
+
+def _initialize(
+    config: Config,
+    names: tuple[str, ...],
+    log: pd.DataFrame,
+    weights: dict[str, float],
+    *,
+    parachute_on: bool,
+) -> None:
+    """ワーカーの起動時に条件を受け取る(各タスクでコンフィグや飛行ログを送らないようにする)"""
+    _worker.config = config
+    _worker.names = names
+    _worker.log = log
+    _worker.weights = weights
+    _worker.parachute_on = parachute_on
+
+
+def _worker_residual(values: np.ndarray) -> np.ndarray:
+    """ワーカーが受け取った条件で1つのパラメータの配列について残差を求める"""
+    config = apply_parameters(typing.cast("Config", _worker.config), _worker.names, values)
+    results = simple_simulation.simulate(config)
+    return residual(
+        results[int(_worker.parachute_on)].to_df(),
+        typing.cast("pd.DataFrame", _worker.log),
+        _worker.weights,
+    )
+
+
+@contextlib.contextmanager
+def simulation_residual_evaluator(
+    config: Config,
+    names: typing.Sequence[str],
+    log: pd.DataFrame,
+    weights: dict[str, float],
+    *,
+    parachute_on: bool = True,
+    max_workers: int | None = None,
+) -> Iterator[ResidualEvaluator]:
+    """シミュレーションを並列に実行して残差を計算する関数を生成する
+
+    プロセスのプールはwithに入った時に1度だけ作成し、同定の全ての反復で再利用する。
+    コンフィグ、飛行ログと重みはワーカーの起動時に1度だけ送り、各タスクではパラメータの配列だけを送る。
+
+    Args:
+        config (Config): コンフィグ
+        names (typing.Sequence[str]): 同定するパラメータの名前
+        log (pd.DataFrame): 飛行ログ
+        weights (dict[str, float]): カラム名から残差に掛ける重みへの辞書
+        parachute_on (bool): パラシュートが開いた場合の軌道と比較するか
+        max_workers (int | None): 並列に実行するプロセス数(Noneの場合はCPU数)
+
+    Yields:
+        ResidualEvaluator: パラメータの配列のリストから残差の配列を計算する関数(withの中でのみ使用できる)
+
+    Raises:
+        ValueError: 同定できないパラメータが指定された場合
+    """
+    check_parameters(config, names)
+    with ProcessPoolExecutor(
+        max_workers,
+        initializer=functools.partial(_initialize, parachute_on=parachute_on),
+        initargs=(config, tuple(names), log, weights),
+    ) as executor:
+
+        def evaluate(points: list[np.ndarray]) -> np.ndarray:
+            return np.array(list(executor.map(_worker_residual, points)))
+
+        yield evaluate
+
+
+def signature(*objects: object) -> str:
+    """計算結果を再利用できるかを判定するための入力のハッシュ"""
+    return hashlib.sha256(pickle.dumps(objects)).hexdigest()
+
+
+class EvaluationCache:
+    """評価済みのパラメータと残差をファイルに保存し、再開時に再利用する"""
+
+    path: Path | None
+    """保存先(.npz、Noneの場合は保存しない)"""
+    key: str
+    """入力のハッシュ(一致しない保存結果は読み込まない)"""
+
+    def __init__(self, path: Path | None = None, key: str = "") -> None:
+        self.path = path
+        self.key = key
+        self._values: dict[tuple[float, ...], np.ndarray] = {}
+        if path is not None and path.exists():
+            with np.load(path) as data:
+                if str(data["key"]) == key:
+                    for point, value in zip(data["points"], data["residuals"], strict=True):
+                        self._values[tuple(point.tolist())] = value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def evaluate(self, evaluate: ResidualEvaluator, points: list[np.ndarray]) -> tuple[np.ndarray, int]:
+        """保存されていない点だけをまとめて評価する
+
+        Args:
+            evaluate (ResidualEvaluator): 残差を計算する関数
+            points (list[np.ndarray]): パラメータの配列のリスト
+
+        Returns:
+            tuple[np.ndarray, int]: 残差の配列(点の数, 残差の数)と新たに評価した点の数
+        """
+        keys = [tuple(np.asarray(point, dtype=float).tolist()) for point in points]
+        missing = list(dict.fromkeys(key for key in keys if key not in self._values))
+        if missing:
+            self._values.update(zip(missing, evaluate([np.array(key) for key in missing]), strict=True))
+            self.save()
+        return np.array([self._values[key] for key in keys]), len(missing)
+
+    def save(self) -> None:
+        """ファイルに保存する"""
+        if self.path is None:
+            return
+        np.savez(
+            self.path,
+            key=np.array(self.key),
+            points=np.array(list(self._values)),
+            residuals=np.array(list(self._values.values())),
+        )
+
+
+@dataclass
+class FitResult:
+    """パラメータ同定の結果"""
+
+    parameters: np.ndarray
+    """同定したパラメータ"""
+    cost: float
+    """残差の二乗和の半分"""
+    residual: np.ndarray
+    """同定したパラメータでの残差"""
+    iterations: int
+    """反復回数"""
+    evaluations: int
+    """新たに評価した点の数(キャッシュから読んだ点を除く)"""
+
+
+def fit_parameters(
+    evaluate: ResidualEvaluator,
+    initial: np.ndarray,
+    *,
+    cache: EvaluationCache | None = None,
+    relative_step: float = 1e-3,
+    max_iterations: int = 20,
+    tolerance: float = 1e-6,
+) -> FitResult:
+    """差分近似したヤコビアンを用いるレーベンバーグ・マーカート法で残差の二乗和を最小化する
+
+    ヤコビアンを求めるための摂動した点と、減衰係数を変えた3つの試行点は
+    それぞれまとめてevaluateに渡すため並列に評価できる。
+    評価した全ての点はcacheに保存し、同じ入力で再開した場合は再計算しない。
+
+    Args:
+        evaluate (ResidualEvaluator): パラメータの配列のリストから残差を計算する関数
+        initial (np.ndarray): パラメータの初期値
+        cache (EvaluationCache | None): 評価済みの点
+        relative_step (float): 差分近似の刻みのパラメータに対する比
+        max_iterations (int): 最大の反復回数
+        tolerance (float): 二乗和の相対的な減少かパラメータの相対的な変化がこれ以下になると終了する
+
+    Returns:
+        FitResult: 同定結果
+    """
+    cache = EvaluationCache() if cache is None else cache
+    x = np.asarray(initial, dtype=float)
+    evaluations = 0
+
+    def run(points: list[np.ndarray]) -> np.ndarray:
+        nonlocal evaluations
+        values, count = cache.evaluate(evaluate, points)
+        evaluations += count
+        return values
+
+    r = run([x])[0]
+    cost = 0.5 * float(r @ r)
+    damping = 1e-3
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):  # noqa: B007
+        steps = relative_step * np.maximum(np.abs(x), 1e-3)
+        perturbed = run([x + step * unit for step, unit in zip(steps, np.eye(len(x)), strict=True)])
+        jacobian = ((perturbed - r) / steps[:, np.newaxis]).T
+        gradient = jacobian.T @ r
+        hessian = jacobian.T @ jacobian
+        dampings = [damping / 10, damping, damping * 10]
+        trials = [x - np.linalg.solve(hessian + d * np.diag(np.diag(hessian) + 1e-12), gradient) for d in dampings]
+        values = run(trials)
+        costs = [0.5 * float(value @ value) for value in values]
+        best = int(np.argmin(costs))
+        if costs[best] >= cost:
+            # どの試行点でも改善しない場合は減衰を強めて次の反復へ進む
+            damping *= 100
+            continue
+        improvement = (cost - costs[best]) / cost
+        change = np.linalg.norm(trials[best] - x) / max(float(np.linalg.norm(x)), 1e-12)
+        x, r, cost, damping = trials[best], values[best], costs[best], dampings[best]
+        if improvement <= tolerance or change <= tolerance:
+            break
+    return FitResult(parameters=x, cost=cost, residual=r, iterations=iteration, evaluations=evaluations)
@@ -0,0 +1,257 @@
+import contextlib
+import typing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.core import simple_simulation
+from src.core.config import Config
+from src.geography.launch_site import LaunchSite
+from src.make_report.make_result_for_report import Setting, changed_config
+
+LIMIT_OUTPUTS = (
+    "launch_clear_angle_of_attack",
+    "max_dynamic_pressure",
+    "landing_north_parachute_off",
+    "landing_east_parachute_off",
+    "landing_north_parachute_on",
+    "landing_east_parachute_on",
+)
+"""制約の判定に用いる量の名前(WindEvaluatorの出力の最後の軸の順番)"""
+
+ANGLE_OF_ATTACK = "angle_of_attack"
+"""ランチクリア時の迎角の制約"""
+DYNAMIC_PRESSURE = "dynamic_pressure"
+"""最大動圧の制約"""
+LANDING = "landing"
+"""着地点の制約"""
+
+FULL_CIRCLE = 360.0
+
+WindEvaluator = typing.Callable[[list[tuple[float, float]]], np.ndarray]
+"""(風速, 風向)のリストから出力の配列(組み合わせ数, len(LIMIT_OUTPUTS))を計算する関数"""
+
+
+@dataclass
+class WindLimitCriteria:
+    """風速制限を決める制約"""
+
+    max_angle_of_attack: float = 20.0
+    """ランチクリア時の迎角の上限[deg]"""
+    max_dynamic_pressure: float | None = None
+    """最大動圧の上限[Pa](Noneの場合は制約しない)"""
+    site: LaunchSite | None = None
+    """着地点が落下可能域に収まる必要がある射場(Noneの場合は制約しない)"""
+    landing_margin: float = 0.0
+    """落下可能域の境界から必要な距離[m]"""
+
+    def violations(self, outputs: np.ndarray) -> list[str]:
+        """満たさない制約を求める
+
+        Args:
+            outputs (np.ndarray): LIMIT_OUTPUTSの順に並べた出力
+
+        Returns:
+            list[str]: 満たさない制約の名前
+        """
+        values = dict(zip(LIMIT_OUTPUTS, outputs.tolist(), strict=True))
+        violated = []
+        if np.rad2deg(values["launch_clear_angle_of_attack"]) > self.max_angle_of_attack:
+            violated.append(ANGLE_OF_ATTACK)
+        if self.max_dynamic_pressure is not None and values["max_dynamic_pressure"] > self.max_dynamic_pressure:
+            violated.append(DYNAMIC_PRESSURE)
+        if self.site is not None:
+            north = np.array([values["landing_north_parachute_off"], values["landing_north_parachute_on"]])
+            east = np.array([values["landing_east_parachute_off"], values["landing_east_parachute_on"]])
+            if self.site.margin(north, east).min() < self.landing_margin:
+                violated.append(LANDING)
+        return violated
+
+
+@dataclass
+class _WorkerState:
+    """ワーカーのプロセスごとに1度だけ受け取るコンフィグと発射角度"""
+
+    config: Config | None = None
+    launcher_elevation: float = 0.0
+
+
+_worker = _WorkerState()
+
+
+def _initialize(config: Config, launcher_elevation: float) -> None:
+    """ワーカーの起動時にコンフィグを受け取る(探索の各段階でコンフィグを送らないようにする)"""
+    _worker.config = config
+    _worker.launcher_elevation = launcher_elevation
+
+
+def _limit_outputs(wind: tuple[float, float]) -> np.ndarray:
+    """ワーカーが受け取ったコンフィグで1つの風速と風向についてLIMIT_OUTPUTSを求める"""
+    speed, direction = wind
+    setting = Setting(launcher_elevation=_worker.launcher_elevation, wind_speed=speed, wind_direction=direction)
+    parachute_off, parachute_on = simple_simulation.simulate_landing(
+        changed_config(typing.cast("Config", _worker.config), setting),
+        outputs=("max_dynamic_pressure", "launch_clear_angle_of_attack"),
+    )
+    return np.array(
+        [
+            parachute_off.launch_clear_angle_of_attack,
+            max(parachute_off.max_dynamic_pressure, parachute_on.max_dynamic_pressure),
+            *parachute_off.landing_position[:2],
+            *parachute_on.landing_position[:2],
+        ],
+    )
+
+
+@contextlib.contextmanager
+def simulation_evaluator(
+    config: Config,
+    launcher_elevation: float,
+    max_workers: int | None = None,
+) -> Iterator[WindEvaluator]:
+    """軌道を記録しないシミュレーションを並列に実行して出力を計算する関数を生成する
+
+    プロセスのプールはwithに入った時に1度だけ作成し、探索の全ての段階で再利用する。
+    コンフィグはワーカーの起動時に1度だけ送り、各タスクでは風速と風向だけを送る。
+
+    Args:
+        config (Config): コンフィグ
+        launcher_elevation (float): 発射角度[deg]
+        max_workers (int | None): 並列に実行するプロセス数(Noneの場合はCPU数)
+
+    Yields:
+        WindEvaluator: (風速, 風向)のリストから出力の配列を計算する関数(withの中でのみ使用できる)
+    """
+    with ProcessPoolExecutor(max_workers, initializer=_initialize, initargs=(config, launcher_elevation)) as executor:
+
+        def evaluate(winds: list[tuple[float, float]]) -> np.ndarray:
+            return np.array(list(executor.map(_limit_outputs, winds))).reshape(-1, len(LIMIT_OUTPUTS))
+
+        yield evaluate
+
+
+def _cache_key(speed: float, direction: float) -> tuple[float, float]:
+    """計算済みの出力を探すためのキー(無風の結果は風向によらない)"""
+    return (0.0, 0.0) if speed == 0 else (float(speed), direction)
+
+
+@dataclass
+class _Bracket:
+    """風向ごとの風速制限の探索区間"""
+
+    low: float = 0.0
+    """制約を満たすことが分かっている最大の風速"""
+    high: float | None = None
+    """制約を満たさないことが分かっている最小の風速"""
+    violations: tuple[str, ...] = ()
+    """highで満たさない制約"""
+
+    def update(self, speed: float, violations: list[str]) -> None:
+        """風速speedでの判定結果で区間を狭める"""
+        if violations:
+            self.high = speed
+            self.violations = tuple(violations)
+        else:
+            self.low = speed
+
+    def next_speed(self, initial_speed: float, max_speed: float, tolerance: float) -> float | None:
+        """次に計算する風速(探索が終わった場合はNone)"""
+        if self.high is None:
+            if self.low >= max_speed:
+                return None
+            return min(max(self.low * 2, initial_speed), max_speed)
+        if self.high - self.low <= tolerance:
+            return None
+        return (self.low + self.high) / 2
+
+    @classmethod
+    def from_cache(
+        cls,
+        direction: float,
+        cache: dict[tuple[float, float], np.ndarray],
+        criteria: WindLimitCriteria,
+        max_speed: float,
+    ) -> "_Bracket":
+        """計算済みの結果から初期区間を決める"""
+        bracket = cls()
+        for (speed, cached_direction), outputs in sorted(cache.items()):
+            if cached_direction != direction or speed == 0 or speed > max_speed:
+                continue
+            violations = criteria.violations(outputs)
+            bracket.update(speed, violations)
+            if violations:
+                break
+        return bracket
+
+
+def search_wind_limit(
+    evaluate: WindEvaluator,
+    criteria: WindLimitCriteria,
+    wind_directions: typing.Sequence[float],
+    *,
+    initial_speed: float = 2.0,
+    max_speed: float = 20.0,
+    tolerance: float = 0.1,
+    cache: dict[tuple[float, float], np.ndarray] | None = None,
+) -> pd.DataFrame:
+    """風向ごとに制約を満たす最大の風速を求める
+
+    風速が大きいほど制約を満たしにくいと仮定し、風速0から倍々に広げて
+    制約を満たさない風速を挟んだ後、二分法で区間をtolerance以下まで狭める。
+    全ての風向の次の風速をまとめてevaluateに渡すため、並列に探索できる。
+    計算済みの(風速, 風向)はcacheから再利用し、探索の初期区間にも用いる。
+
+    Args:
+        evaluate (WindEvaluator): (風速, 風向)のリストから出力を計算する関数
+        criteria (WindLimitCriteria): 制約
+        wind_directions (typing.Sequence[float]): 風向[deg]
+        initial_speed (float): 区間を広げる最初の風速[m/s]
+        max_speed (float): 探索する最大の風速[m/s]
+        tolerance (float): 風速制限の許容誤差[m/s]
+        cache (dict[tuple[float, float], np.ndarray] | None): (風速, 風向)から出力への辞書。
+            呼び出しをまたいで再利用する場合に渡し、新たに計算した出力が追加される
+
+    Returns:
+        pd.DataFrame: 風向[deg]をindexとし、制約を満たす最大の風速(wind_speed_limit)、
+            制約を満たさない最小の風速(wind_speed_violation)、満たさない制約(limited_by)を持つ表
+    """
+    cache = {} if cache is None else cache
+
+    def ensure(winds: list[tuple[float, float]]) -> None:
+        missing = list(dict.fromkeys(_cache_key(*wind) for wind in winds if _cache_key(*wind) not in cache))
+        if missing:
+            cache.update(zip(missing, evaluate(missing), strict=True))
+
+    ensure([(0.0, 0.0)])
+    calm_violations = criteria.violations(cache[0.0, 0.0])
+    brackets = {}
+    for direction in [float(direction) % FULL_CIRCLE for direction in wind_directions]:
+        if calm_violations:
+            # 無風で制約を満たさない場合は探索しない
+            brackets[direction] = _Bracket(0.0, 0.0, tuple(calm_violations))
+        else:
+            brackets[direction] = _Bracket.from_cache(direction, cache, criteria, max_speed)
+
+    while True:
+        pending = {
+            direction: speed
+            for direction, bracket in brackets.items()
+            if (speed := bracket.next_speed(initial_speed, max_speed, tolerance)) is not None
+        }
+        if not pending:
+            break
+        ensure([(speed, direction) for direction, speed in pending.items()])
+        for direction, speed in pending.items():
+            brackets[direction].update(speed, criteria.violations(cache[_cache_key(speed, direction)]))
+
+    return pd.DataFrame(
+        {
+            "wind_speed_limit": [bracket.low for bracket in brackets.values()],
+            "wind_speed_violation": [np.nan if bracket.high is None else bracket.high for bracket in brackets.values()],
+            "limited_by": [",".join(bracket.violations) for bracket in brackets.values()],
+        },
+        index=pd.Index(list(brackets), name="wind_direction"),
+    )
@@ -0,0 +1,165 @@
+import contextlib
+import dataclasses
+import hashlib
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import config_read
+from .core.config import Config, TimeStepSchedule, WindPowerLow
+from .core.thrust_curve import ThrustCompression
+
+CACHE_DIRECTORY = ".compiled"
+"""設定のフォルダ内のキャッシュの保存先"""
+FORMAT_VERSION = 1
+"""キャッシュの形式の版(形式を変えた場合は増やして古いキャッシュを使わないようにする)"""
+
+_INDEX_FILE = "index.json"
+_META_FILE = "config.json"
+_DATACLASSES = {cls.__name__: cls for cls in (WindPowerLow, TimeStepSchedule, ThrustCompression)}
+
+
+def _source_stats(folder_path: Path) -> list[list[str | int]]:
+    """元のファイルの名前、サイズ、更新時刻(ハッシュを計算せずに変更を検出するため)"""
+    stats: list[list[str | int]] = []
+    for name in config_read.SOURCE_FILES:
+        path = folder_path / name
+        if path.exists():
+            stat = path.stat()
+            stats.append([name, stat.st_size, stat.st_mtime_ns])
+    return stats
+
+
+def source_hash(folder_path: Path) -> str:
+    """設定のフォルダの元のファイルとキャッシュの形式のハッシュ
+
+    Args:
+        folder_path (Path): フォルダのパス
+
+    Returns:
+        str: ハッシュ(16進数)
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{FORMAT_VERSION}:{','.join(f.name for f in dataclasses.fields(Config))}".encode())
+    for name in config_read.SOURCE_FILES:
+        path = folder_path / name
+        if not path.exists():
+            continue
+        digest.update(f"\0{name}\0".encode())
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def save(config: Config, path: Path) -> None:
+    """設定を読み込み済みの配列としてディレクトリに保存する
+
+    表は列ごと、配列は1つずつ.npyとして保存し、それ以外の値はconfig.jsonに保存する。
+
+    Args:
+        config (Config): 設定
+        path (Path): 保存先のディレクトリ(存在しない場合は作成する)
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    meta: dict[str, object] = {}
+    for field in dataclasses.fields(Config):
+        value = getattr(config, field.name)
+        if isinstance(value, pd.DataFrame):
+            np.save(path / f"{field.name}.index.npy", value.index.to_numpy())
+            for i, column in enumerate(value.columns):
+                np.save(path / f"{field.name}.{i}.npy", value[column].to_numpy())
+            meta[field.name] = {"table": [str(column) for column in value.columns], "index_name": value.index.name}
+        elif isinstance(value, np.ndarray):
+            np.save(path / f"{field.name}.npy", value)
+            meta[field.name] = {"array": True}
+        elif dataclasses.is_dataclass(value):
+            meta[field.name] = {"dataclass": type(value).__name__, "value": dataclasses.asdict(value)}
+        else:
+            meta[field.name] = {"value": value}
+    (path / _META_FILE).write_text(json.dumps(meta))
+
+
+def load(path: Path) -> Config:
+    """saveで保存した設定を読み込む
+
+    配列はメモリマップで開くため、読み込み時にはファイルの内容をコピーしない(読み取り専用となる)。
+
+    Args:
+        path (Path): saveの保存先
+
+    Returns:
+        Config: 設定
+    """
+    meta = json.loads((path / _META_FILE).read_text())
+    values: dict[str, object] = {}
+    for name, entry in meta.items():
+        if "table" in entry:
+            index = pd.Index(_map(path / f"{name}.index.npy"), name=entry["index_name"])
+            columns = {column: _map(path / f"{name}.{i}.npy") for i, column in enumerate(entry["table"])}
+            values[name] = pd.DataFrame(columns, index=index, copy=False)
+        elif "array" in entry:
+            values[name] = _map(path / f"{name}.npy")
+        elif "dataclass" in entry:
+            values[name] = _DATACLASSES[entry["dataclass"]](**entry["value"])
+        else:
+            values[name] = entry["value"]
+    return Config(**values)
+
+
+def _map(path: Path) -> np.ndarray:
+    """.npyをコピーせずに読み取り専用の配列として開く(np.memmapではなくnp.ndarrayとして扱う)"""
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
+
+def _write_index(cache_path: Path, stats: list[list[str | int]], digest: str) -> None:
+    """元のファイルの状態とハッシュの対応を書き換える(他のプロセスが途中の内容を読まないように置き換える)"""
+    with tempfile.NamedTemporaryFile("w", dir=cache_path, suffix=".tmp", delete=False) as f:
+        json.dump({"stats": stats, "hash": digest}, f)
+    Path(f.name).replace(cache_path / _INDEX_FILE)
+
+
+def read(folder_path: Path, cache_path: Path | None = None) -> Config:
+    """キャッシュを用いてフォルダから設定を読み込む
+
+    元のファイルのハッシュごとに読み込み済みの配列を保存し、2回目以降はpandasでCSVを解析せずに
+    メモリマップで読み込む。元のファイルのサイズと更新時刻が前回と同じ場合はハッシュの計算も省略する。
+    元のファイルが変わった場合はconfig_read.readで読み込み直してキャッシュを作り直す。
+    複数のプロセスから同時に呼ばれても、作成途中のキャッシュは読まない。
+
+    Args:
+        folder_path (Path): フォルダのパス
+        cache_path (Path | None): キャッシュの保存先(Noneの場合はフォルダ内のCACHE_DIRECTORY)
+
+    Returns:
+        Config: 設定(config_read.readと同じ値を持つ。表や配列は読み取り専用)
+    """
+    cache_path = folder_path / CACHE_DIRECTORY if cache_path is None else cache_path
+    stats = _source_stats(folder_path)
+    index_path = cache_path / _INDEX_FILE
+    if index_path.exists():
+        with contextlib.suppress(ValueError, KeyError):
+            index = json.loads(index_path.read_text())
+            if index["stats"] == stats and (cache_path / index["hash"]).is_dir():
+                return load(cache_path / index["hash"])
+
+    digest = source_hash(folder_path)
+    target = cache_path / digest
+    if not target.is_dir():
+        cache_path.mkdir(parents=True, exist_ok=True)
+        temporary = Path(tempfile.mkdtemp(dir=cache_path, suffix=".tmp"))
+        save(config_read.read(folder_path), temporary)
+        try:
+            temporary.rename(target)
+        except OSError:
+            # 他のプロセスが先に同じキャッシュを作成した
+            shutil.rmtree(temporary, ignore_errors=True)
+        for old in cache_path.iterdir():
+            if old.is_dir() and old.name != digest and not old.name.endswith(".tmp"):
+                shutil.rmtree(old, ignore_errors=True)
+    _write_index(cache_path, stats, digest)
+    return load(target)
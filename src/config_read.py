@@ -4,7 +4,11 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
-from .core.config import Config, WindPowerLow
+from .core import thrust_curve
+from .core.config import Config, TimeStepSchedule, WindPowerLow
+
+SOURCE_FILES = ("config.json", "mass.csv", "thrust.csv", "atmosphere.csv", "aerodynamics.csv", "wind_profile.csv")
+"""readが読み込むファイル(atmosphere.csv、aerodynamics.csv、wind_profile.csvは省略可能)"""
 
 
 def read(folder_path: Path) -> Config:
@@ -19,10 +23,21 @@ def read(folder_path: Path) -> Config:
     mass_path = folder_path / "mass.csv"
     thrust_path = folder_path / "thrust.csv"
     config_path = folder_path / "config.json"
+    atmosphere_path = folder_path / "atmosphere.csv"
+    aerodynamics_path = folder_path / "aerodynamics.csv"
+    wind_profile_path = folder_path / "wind_profile.csv"
 
     mass_df = pd.read_csv(mass_path, index_col=0)
-    thrust_df = pd.read_csv(thrust_path, index_col=0)
     js = json.loads(config_path.read_text())
+    thrust_tolerance = js.get("thrust_tolerance")
+    if thrust_tolerance is None:
+        thrust_df = pd.read_csv(thrust_path, index_col=0)
+        thrust_compression = None
+    else:
+        thrust_df, thrust_compression = thrust_curve.read_thrust_csv(thrust_path, thrust_tolerance)
+    atmosphere_df = pd.read_csv(atmosphere_path, index_col=0) if atmosphere_path.exists() else None
+    aerodynamics_df = pd.read_csv(aerodynamics_path) if aerodynamics_path.exists() else None
+    wind_profile_df = pd.read_csv(wind_profile_path) if wind_profile_path.exists() else None
     wind = WindPowerLow(
         js["wind_reference_height"],
         js["wind_speed"],
@@ -53,4 +68,11 @@ def read(folder_path: Path) -> Config:
         np.array(js["first_gravity_center"]),
         np.array(js["end_gravity_center"]),
         js["length"],
+        atmosphere=atmosphere_df,
+        aerodynamic_table=aerodynamics_df,
+        wind_profile=wind_profile_df,
+        wind_profile_time=js.get("wind_profile_time", 0.0),
+        parachute_descent_dt=js.get("parachute_descent_dt"),
+        dt_schedule=TimeStepSchedule(**js.get("dt_schedule", {})),
+        thrust_compression=thrust_compression,
     )
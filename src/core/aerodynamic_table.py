@@ -0,0 +1,144 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .interpolation import locate, locate_weight
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class AerodynamicTable:
+    """マッハ数と迎角に対する空気力係数の表
+
+    双線形補間で値を求める。直前に参照した格子の位置を保持し、
+    ステップ間で状態がほとんど変わらないことを利用して探索を省く。
+    表の範囲外では端の値を用いる。
+    """
+
+    mach: np.ndarray
+    """マッハ数の格子(昇順)"""
+    angle_of_attack: np.ndarray
+    """迎角の格子[rad](昇順)"""
+    axial_force_coefficient: np.ndarray
+    """各格子点での軸力係数CA(マッハ数, 迎角)"""
+    normal_force_coefficient: np.ndarray
+    """各格子点での法線力係数CN(マッハ数, 迎角)"""
+
+    def __init__(
+        self,
+        mach: np.ndarray,
+        angle_of_attack: np.ndarray,
+        axial_force_coefficient: np.ndarray,
+        normal_force_coefficient: np.ndarray,
+    ) -> None:
+        """表を作成する
+
+        Args:
+            mach (np.ndarray): マッハ数の格子(昇順)
+            angle_of_attack (np.ndarray): 迎角の格子[rad](昇順)
+            axial_force_coefficient (np.ndarray): 軸力係数CA(マッハ数, 迎角)
+            normal_force_coefficient (np.ndarray): 法線力係数CN(マッハ数, 迎角)
+
+        Raises:
+            ValueError: 格子が2点未満の場合や昇順でない場合、係数の形が格子と一致しない場合
+        """
+        self.mach = np.asarray(mach, dtype=float)
+        self.angle_of_attack = np.asarray(angle_of_attack, dtype=float)
+        shape = (len(self.mach), len(self.angle_of_attack))
+        for name, axis in [("マッハ数", self.mach), ("迎角", self.angle_of_attack)]:
+            if len(axis) < 2 or np.any(np.diff(axis) <= 0):  # noqa: PLR2004
+                err_msg = f"{name}の格子は2点以上の昇順である必要があります"
+                raise ValueError(err_msg, axis)
+        self.axial_force_coefficient = np.asarray(axial_force_coefficient, dtype=float)
+        self.normal_force_coefficient = np.asarray(normal_force_coefficient, dtype=float)
+        if self.axial_force_coefficient.shape != shape or self.normal_force_coefficient.shape != shape:
+            err_msg = "係数の表の形が格子と一致しません"
+            raise ValueError(err_msg, shape)
+        # スカラーの補間ではnumpyのスカラーよりPythonのリストの方が速い
+        self._mach = self.mach.tolist()
+        self._angle_of_attack = self.angle_of_attack.tolist()
+        self._ca = self.axial_force_coefficient.tolist()
+        self._cn = self.normal_force_coefficient.tolist()
+        self._hint = (0, 0)
+
+    @classmethod
+    def from_df(cls, df: "pd.DataFrame") -> "AerodynamicTable":
+        """縦持ちの表から作成する
+
+        Args:
+            df (pd.DataFrame): mach、alpha[deg]、CA、CNのカラムを持ち、
+                マッハ数と迎角の全ての組み合わせを含む表
+
+        Returns:
+            AerodynamicTable: 空気力係数の表
+
+        Raises:
+            ValueError: マッハ数と迎角の組み合わせが欠けている場合
+        """
+        table = df.pivot_table(index="mach", columns="alpha", values=["CA", "CN"], aggfunc="mean")
+        if table.isna().to_numpy().any():
+            err_msg = "マッハ数と迎角の全ての組み合わせが必要です"
+            raise ValueError(err_msg)
+        return cls(
+            table.index.to_numpy(dtype=float),
+            np.deg2rad(table["CA"].columns.to_numpy(dtype=float)),
+            table["CA"].to_numpy(),
+            table["CN"].to_numpy(),
+        )
+
+    def coefficients(self, mach: float, angle_of_attack: float) -> tuple[float, float]:
+        """軸力係数と法線力係数を求める
+
+        Args:
+            mach (float): マッハ数
+            angle_of_attack (float): 迎角[rad]
+
+        Returns:
+            tuple[float, float]: 軸力係数CAと法線力係数CN
+        """
+        hint_i, hint_j = self._hint
+        i = locate(self._mach, mach, hint_i)
+        j = locate(self._angle_of_attack, angle_of_attack, hint_j)
+        self._hint = (i, j)
+        s = locate_weight(self._mach, i, mach)
+        t = locate_weight(self._angle_of_attack, j, angle_of_attack)
+        w00 = (1 - s) * (1 - t)
+        w01 = (1 - s) * t
+        w10 = s * (1 - t)
+        w11 = s * t
+        ca = self._ca
+        cn = self._cn
+        return (
+            w00 * ca[i][j] + w01 * ca[i][j + 1] + w10 * ca[i + 1][j] + w11 * ca[i + 1][j + 1],
+            w00 * cn[i][j] + w01 * cn[i][j + 1] + w10 * cn[i + 1][j] + w11 * cn[i + 1][j + 1],
+        )
+
+    def coefficients_batch(self, mach: np.ndarray, angle_of_attack: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """軸力係数と法線力係数をまとめて求める
+
+        Args:
+            mach (np.ndarray): マッハ数(N,)
+            angle_of_attack (np.ndarray): 迎角[rad](N,)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: 軸力係数CA(N,)と法線力係数CN(N,)
+        """
+
+        def locate(axis: np.ndarray, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+            weight = np.clip((x - axis[i]) / (axis[i + 1] - axis[i]), 0.0, 1.0)
+            return i, weight
+
+        i, s = locate(self.mach, np.asarray(mach, dtype=float))
+        j, t = locate(self.angle_of_attack, np.asarray(angle_of_attack, dtype=float))
+
+        def interpolate(values: np.ndarray) -> np.ndarray:
+            return (
+                (1 - s) * (1 - t) * values[i, j]
+                + (1 - s) * t * values[i, j + 1]
+                + s * (1 - t) * values[i + 1, j]
+                + s * t * values[i + 1, j + 1]
+            )
+
+        return interpolate(self.axial_force_coefficient), interpolate(self.normal_force_coefficient)
@@ -6,6 +6,9 @@ from . import quaternion_util
 from .rocket_state import RocketState
 from .simulation_context import SimulationContext
 
+GRAVITATIONAL_ACCELERATION = 9.8
+"""重力加速度[m/s^2](パラシュートの終端速度から抗力を求めるときにも用いる)"""
+
 
 @dataclass
 class AirForceResult:
@@ -106,7 +109,7 @@ def air_force_moment(force: np.ndarray, wind_center: np.ndarray) -> np.ndarray:
     Returns:
         np.ndarray: モーメント
     """
-    return np.cross(wind_center, force)
+    return quaternion_util.cross(wind_center, force)
 
 
 def normal_force_coefficient(angle_of_attack: float, cn_alpha: float) -> float:
@@ -122,12 +125,44 @@ def normal_force_coefficient(angle_of_attack: float, cn_alpha: float) -> float:
     return cn_alpha * angle_of_attack
 
 
+def aerodynamic_coefficients(
+    airspeed: np.ndarray,
+    angle_of_attack: float,
+    altitude: float,
+    context: SimulationContext,
+) -> tuple[float, float]:
+    """軸力係数と法線力係数を求める
+
+    空気力係数の表がある場合はマッハ数と迎角から補間し、
+    ない場合はCAとCN_alphaを用いる。
+
+    Args:
+        airspeed (np.ndarray): 剛体系での機体の対気速度
+        angle_of_attack (float): 迎角[rad]
+        altitude (float): 高度
+        context (SimulationContext): ロケットの設定
+
+    Returns:
+        tuple[float, float]: 軸力係数CAと法線力係数CN
+    """
+    if context.aerodynamic_table is None:
+        return context.CA, normal_force_coefficient(angle_of_attack, context.CN_alpha)
+    mach = float(np.linalg.norm(airspeed, ord=2)) / context.atmosphere.speed_of_sound(altitude)
+    return context.aerodynamic_table.coefficients(mach, angle_of_attack)
+
+
 def parachute_force(
     velocity_air: np.ndarray,
     parachute_terminal_velocity: float,
     mass: float,
 ) -> np.ndarray:
-    return -9.8 * mass / parachute_terminal_velocity**2 * np.linalg.norm(velocity_air, ord=2) * velocity_air
+    return (
+        -GRAVITATIONAL_ACCELERATION
+        * mass
+        / parachute_terminal_velocity**2
+        * np.linalg.norm(velocity_air, ord=2)
+        * velocity_air
+    )
 
 
 def calculate(
@@ -155,14 +190,14 @@ def calculate(
         velocity_air_inertial_frame,
     )
     angle_of_attack_ = angle_of_attack(velocity_air_body_frame)
-    air_density = 1.204
+    air_density = context.atmosphere.density(z)
+    ca, cn = aerodynamic_coefficients(velocity_air_body_frame, angle_of_attack_, z, context)
     axial_force_ = axial_force(
         velocity_air_body_frame,
         air_density,
         context.body_area,
-        context.CA,
+        ca,
     )
-    cn = normal_force_coefficient(angle_of_attack_, context.CN_alpha)
     normal_force_ = normal_force(
         velocity_air_body_frame,
         air_density,
@@ -193,3 +228,184 @@ def calculate(
         dynamic_pressure=dynamic_pressure_,
         velocity_air_body_frame=velocity_air_body_frame,
     )
+
+
+@dataclass
+class AirForceBatchResult:
+    """複数の時刻での空気力の計算結果を表すクラス"""
+
+    force: np.ndarray
+    """剛体系での力(N, 3)"""
+
+    dynamic_pressure: np.ndarray
+    """動圧(N,)"""
+
+    velocity_air_body_frame: np.ndarray
+    """剛体系での対気速度(N, 3)"""
+
+
+def dynamic_pressure_batch(airspeed: np.ndarray, air_density: float | np.ndarray) -> np.ndarray:
+    """動圧をまとめて計算する
+
+    Args:
+        airspeed (np.ndarray): 剛体系での機体速度(N, 3)
+        air_density (float | np.ndarray): 空気密度
+
+    Returns:
+        np.ndarray: 動圧(N,)
+    """
+    return 0.5 * air_density * np.einsum("...i,...i->...", airspeed, airspeed)
+
+
+def angle_of_attack_batch(airspeed: np.ndarray) -> np.ndarray:
+    """迎角をまとめて計算する
+
+    Args:
+        airspeed (np.ndarray): 剛体系での機体速度(N, 3)
+
+    Returns:
+        np.ndarray: 迎角[rad](N,)
+    """
+    return np.arctan2(np.hypot(airspeed[..., 1], airspeed[..., 2]), airspeed[..., 0])
+
+
+def axial_force_batch(
+    dynamic_pressure: np.ndarray,
+    body_area: float,
+    axial_force_coefficient: float | np.ndarray,
+) -> np.ndarray:
+    """軸方向の力をまとめて計算する
+
+    Args:
+        dynamic_pressure (np.ndarray): 動圧(N,)
+        body_area (float): 断面積
+        axial_force_coefficient (float | np.ndarray): 軸方向の力係数CA
+
+    Returns:
+        np.ndarray: 軸方向の力(N, 3)
+    """
+    force = np.zeros((*np.shape(dynamic_pressure), 3))
+    force[..., 0] = -dynamic_pressure * body_area * axial_force_coefficient
+    return force
+
+
+def normal_force_batch(
+    airspeed: np.ndarray,
+    dynamic_pressure: np.ndarray,
+    body_area: float,
+    normal_force_coefficient: np.ndarray,
+) -> np.ndarray:
+    """法線方向の力をまとめて計算する
+
+    Args:
+        airspeed (np.ndarray): 剛体系での機体の対気速度(N, 3)
+        dynamic_pressure (np.ndarray): 動圧(N,)
+        body_area (float): 断面積
+        normal_force_coefficient (np.ndarray): 法線方向の力係数CN(N,)
+
+    Returns:
+        np.ndarray: 法線方向の力(N, 3)
+    """
+    normal_velocity_norm = np.hypot(airspeed[..., 1], airspeed[..., 2])
+    zero_division_threshold = 1e-4
+    valid = normal_velocity_norm >= zero_division_threshold
+    scale = np.zeros_like(normal_velocity_norm)
+    scale[valid] = (dynamic_pressure * body_area * normal_force_coefficient)[valid] / normal_velocity_norm[valid]
+    force = np.zeros_like(airspeed, dtype=float)
+    force[..., 1] = -airspeed[..., 1] * scale
+    force[..., 2] = -airspeed[..., 2] * scale
+    return force
+
+
+def parachute_force_batch(
+    velocity_air: np.ndarray,
+    parachute_terminal_velocity: float,
+    mass: float,
+) -> np.ndarray:
+    """パラシュートの力をまとめて計算する
+
+    Args:
+        velocity_air (np.ndarray): 剛体系での対気速度(N, 3)
+        parachute_terminal_velocity (float): パラシュートの終端速度
+        mass (float): 質量
+
+    Returns:
+        np.ndarray: パラシュートの力(N, 3)
+    """
+    speed = np.linalg.norm(velocity_air, ord=2, axis=-1)[..., np.newaxis]
+    return -GRAVITATIONAL_ACCELERATION * mass / parachute_terminal_velocity**2 * speed * velocity_air
+
+
+def aerodynamic_coefficients_batch(
+    airspeed: np.ndarray,
+    angle_of_attack: np.ndarray,
+    altitude: np.ndarray,
+    context: SimulationContext,
+) -> tuple[float | np.ndarray, np.ndarray]:
+    """軸力係数と法線力係数をまとめて求める
+
+    Args:
+        airspeed (np.ndarray): 剛体系での機体の対気速度(N, 3)
+        angle_of_attack (np.ndarray): 迎角[rad](N,)
+        altitude (np.ndarray): 高度(N,)
+        context (SimulationContext): ロケットの設定
+
+    Returns:
+        tuple[float | np.ndarray, np.ndarray]: 軸力係数CAと法線力係数CN(N,)
+    """
+    if context.aerodynamic_table is None:
+        return context.CA, normal_force_coefficient(angle_of_attack, context.CN_alpha)
+    mach = np.linalg.norm(airspeed, ord=2, axis=-1) / context.atmosphere.speed_of_sound_batch(altitude)
+    return context.aerodynamic_table.coefficients_batch(mach, angle_of_attack)
+
+
+def calculate_batch(
+    position: np.ndarray,
+    velocity: np.ndarray,
+    posture: np.ndarray,
+    context: SimulationContext,
+    *,
+    parachute_on: bool,
+) -> AirForceBatchResult:
+    """複数の状態での空気力をまとめて計算する
+
+    モーメントは計算しない。
+
+    Args:
+        position (np.ndarray): 慣性系での位置(N, 3)
+        velocity (np.ndarray): 慣性系での速度(N, 3)
+        posture (np.ndarray): (w, x, y, z)の順に並べた姿勢のクォータニオン(N, 4)
+        context (SimulationContext): ロケットの設定
+        parachute_on (bool): パラシュートが展開されているかどうか
+
+    Returns:
+        AirForceBatchResult: 空気力の計算結果
+    """
+    z = -position[:, 2]
+    velocity_air_inertial_frame = velocity - context.wind_batch(z)
+    velocity_air_body_frame = quaternion_util.inertial_to_body_batch(posture, velocity_air_inertial_frame)
+    air_density = context.atmosphere.density_batch(z)
+    dynamic_pressure_ = dynamic_pressure_batch(velocity_air_body_frame, air_density)
+    ca, cn = aerodynamic_coefficients_batch(
+        velocity_air_body_frame,
+        angle_of_attack_batch(velocity_air_body_frame),
+        z,
+        context,
+    )
+    air_force = axial_force_batch(dynamic_pressure_, context.body_area, ca) + normal_force_batch(
+        velocity_air_body_frame,
+        dynamic_pressure_,
+        context.body_area,
+        cn,
+    )
+    if parachute_on:
+        air_force += parachute_force_batch(
+            velocity_air_body_frame,
+            context.parachute_terminal_velocity,
+            context.mass(100),
+        )
+    return AirForceBatchResult(
+        force=air_force,
+        dynamic_pressure=dynamic_pressure_,
+        velocity_air_body_frame=velocity_air_body_frame,
+    )
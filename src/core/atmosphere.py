@@ -0,0 +1,204 @@
+import functools
+import itertools
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+GAS_CONSTANT = 287.05287
+"""乾燥空気の気体定数[J/(kg K)]"""
+HEAT_CAPACITY_RATIO = 1.4
+"""乾燥空気の比熱比"""
+STANDARD_GRAVITY = 9.80665
+"""標準大気の定義に用いる重力加速度[m/s^2]"""
+
+SEA_LEVEL_TEMPERATURE = 288.15
+"""標準大気の海面での気温[K]"""
+SEA_LEVEL_PRESSURE = 101325.0
+"""標準大気の海面での気圧[Pa]"""
+STANDARD_LAYERS = ((0.0, -0.0065), (11000.0, 0.0), (20000.0, 0.001), (32000.0, 0.0))
+"""標準大気の各層の下端の高度[m]と気温減率[K/m](最後の層は上端を表す)"""
+
+TABLE_STEP = 10.0
+"""表の高度方向の間隔[m]"""
+
+
+def standard_atmosphere(altitude: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """国際標準大気の気温と気圧を計算する
+
+    高度はジオポテンシャル高度とみなし、32kmより上では32kmでの値を用いる。
+
+    Args:
+        altitude (np.ndarray): 高度[m]
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: 気温[K]と気圧[Pa]
+    """
+    altitude = np.clip(np.asarray(altitude, dtype=float), STANDARD_LAYERS[0][0], STANDARD_LAYERS[-1][0])
+    temperature = np.full_like(altitude, SEA_LEVEL_TEMPERATURE)
+    pressure = np.full_like(altitude, SEA_LEVEL_PRESSURE)
+    base_temperature = SEA_LEVEL_TEMPERATURE
+    base_pressure = SEA_LEVEL_PRESSURE
+    for (base, lapse_rate), (top, _) in itertools.pairwise(STANDARD_LAYERS):
+        in_layer = altitude >= base
+        height = np.minimum(altitude[in_layer], top) - base
+        temperature[in_layer] = base_temperature + lapse_rate * height
+        if lapse_rate == 0:
+            pressure[in_layer] = base_pressure * np.exp(-STANDARD_GRAVITY * height / (GAS_CONSTANT * base_temperature))
+        else:
+            pressure[in_layer] = base_pressure * (temperature[in_layer] / base_temperature) ** (
+                -STANDARD_GRAVITY / (GAS_CONSTANT * lapse_rate)
+            )
+        # 次の層の下端での値
+        top_temperature = base_temperature + lapse_rate * (top - base)
+        if lapse_rate == 0:
+            base_pressure *= np.exp(-STANDARD_GRAVITY * (top - base) / (GAS_CONSTANT * base_temperature))
+        else:
+            base_pressure *= (top_temperature / base_temperature) ** (-STANDARD_GRAVITY / (GAS_CONSTANT * lapse_rate))
+        base_temperature = top_temperature
+    return temperature, pressure
+
+
+class AtmosphereTable:
+    """高度方向に等間隔な表から大気の状態を求める
+
+    表の添字は高度から直接計算できるため、探索を行わずにO(1)で線形補間する。
+    表の範囲外の高度では端の値を用いる。
+    """
+
+    altitude_min: float
+    """表の最低高度[m]"""
+    step: float
+    """表の高度方向の間隔[m]"""
+    temperature_table: np.ndarray
+    """各高度での気温[K]"""
+    pressure_table: np.ndarray
+    """各高度での気圧[Pa]"""
+    density_table: np.ndarray
+    """各高度での空気密度[kg/m^3]"""
+    speed_of_sound_table: np.ndarray
+    """各高度での音速[m/s]"""
+
+    def __init__(self, altitude_min: float, step: float, temperature: np.ndarray, pressure: np.ndarray) -> None:
+        """表を作成する
+
+        Args:
+            altitude_min (float): 表の最低高度[m]
+            step (float): 表の高度方向の間隔[m]
+            temperature (np.ndarray): altitude_minからstepごとの気温[K]
+            pressure (np.ndarray): altitude_minからstepごとの気圧[Pa]
+
+        Raises:
+            ValueError: 表の長さが足りない場合や一致しない場合
+        """
+        if len(temperature) < 2 or len(temperature) != len(pressure):  # noqa: PLR2004
+            err_msg = "気温と気圧の表は同じ長さで2点以上必要です"
+            raise ValueError(err_msg, len(temperature), len(pressure))
+        self.altitude_min = altitude_min
+        self.step = step
+        self.temperature_table = np.asarray(temperature, dtype=float)
+        self.pressure_table = np.asarray(pressure, dtype=float)
+        self.density_table = self.pressure_table / (GAS_CONSTANT * self.temperature_table)
+        self.speed_of_sound_table = np.sqrt(HEAT_CAPACITY_RATIO * GAS_CONSTANT * self.temperature_table)
+        self._inverse_step = 1 / step
+        self._last = len(temperature) - 1
+        # スカラーの補間ではnumpyのスカラーよりPythonのリストの方が速い
+        self._temperature = self.temperature_table.tolist()
+        self._pressure = self.pressure_table.tolist()
+        self._density = self.density_table.tolist()
+        self._speed_of_sound = self.speed_of_sound_table.tolist()
+
+    @classmethod
+    def standard(cls) -> "AtmosphereTable":
+        """国際標準大気の表を作成する
+
+        Returns:
+            AtmosphereTable: 0mから32kmまでの表
+        """
+        return _standard_table()
+
+    @classmethod
+    def from_sounding(cls, sounding: "pd.DataFrame", step: float = TABLE_STEP) -> "AtmosphereTable":
+        """高層気象観測などの高度ごとの気温と気圧から表を作成する
+
+        観測点の間は線形補間して等間隔の表に変換する。
+
+        Args:
+            sounding (pd.DataFrame): 高度[m]をindexとし、temperature[K]とpressure[Pa]のカラムを持つ
+            step (float): 表の高度方向の間隔[m]
+
+        Returns:
+            AtmosphereTable: 観測範囲の表
+        """
+        sounding = sounding.sort_index()
+        altitude = sounding.index.to_numpy(dtype=float)
+        grid = np.arange(altitude[0], altitude[-1] + step, step)
+        temperature = np.interp(grid, altitude, sounding["temperature"].to_numpy(dtype=float))
+        # 気圧は高度に対して指数的に変化するため対数で補間する
+        pressure = np.exp(np.interp(grid, altitude, np.log(sounding["pressure"].to_numpy(dtype=float))))
+        return cls(float(altitude[0]), step, temperature, pressure)
+
+    def _locate(self, altitude: float) -> tuple[int, float]:
+        x = (altitude - self.altitude_min) * self._inverse_step
+        if x <= 0:
+            return 0, 0.0
+        if x >= self._last:
+            return self._last - 1, 1.0
+        i = int(x)
+        return i, x - i
+
+    def temperature(self, altitude: float) -> float:
+        """気温[K]"""
+        i, s = self._locate(altitude)
+        table = self._temperature
+        return table[i] + (table[i + 1] - table[i]) * s
+
+    def pressure(self, altitude: float) -> float:
+        """気圧[Pa]"""
+        i, s = self._locate(altitude)
+        table = self._pressure
+        return table[i] + (table[i + 1] - table[i]) * s
+
+    def density(self, altitude: float) -> float:
+        """空気密度[kg/m^3]"""
+        i, s = self._locate(altitude)
+        table = self._density
+        return table[i] + (table[i + 1] - table[i]) * s
+
+    def speed_of_sound(self, altitude: float) -> float:
+        """音速[m/s]"""
+        i, s = self._locate(altitude)
+        table = self._speed_of_sound
+        return table[i] + (table[i + 1] - table[i]) * s
+
+    def _interpolate_batch(self, table: np.ndarray, altitude: np.ndarray) -> np.ndarray:
+        x = np.clip((np.asarray(altitude, dtype=float) - self.altitude_min) * self._inverse_step, 0, self._last)
+        i = np.minimum(x.astype(int), self._last - 1)
+        s = x - i
+        return table[i] + (table[i + 1] - table[i]) * s
+
+    def temperature_batch(self, altitude: np.ndarray) -> np.ndarray:
+        """気温[K]をまとめて求める"""
+        return self._interpolate_batch(self.temperature_table, altitude)
+
+    def pressure_batch(self, altitude: np.ndarray) -> np.ndarray:
+        """気圧[Pa]をまとめて求める"""
+        return self._interpolate_batch(self.pressure_table, altitude)
+
+    def density_batch(self, altitude: np.ndarray) -> np.ndarray:
+        """空気密度[kg/m^3]をまとめて求める"""
+        return self._interpolate_batch(self.density_table, altitude)
+
+    def speed_of_sound_batch(self, altitude: np.ndarray) -> np.ndarray:
+        """音速[m/s]をまとめて求める"""
+        return self._interpolate_batch(self.speed_of_sound_table, altitude)
+
+
+@functools.cache
+def _standard_table() -> AtmosphereTable:
+    """国際標準大気の表は共通なので一度だけ作成する"""
+    grid = np.arange(STANDARD_LAYERS[0][0], STANDARD_LAYERS[-1][0] + TABLE_STEP, TABLE_STEP)
+    temperature, pressure = standard_atmosphere(grid)
+    return AtmosphereTable(STANDARD_LAYERS[0][0], TABLE_STEP, temperature, pressure)
@@ -1,7 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
+
+from .thrust_curve import ThrustCompression
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass
@@ -12,11 +17,29 @@ class WindPowerLow:
     wind_direction: float
 
 
+@dataclass
+class TimeStepSchedule:
+    """飛行の区間ごとの時間刻み(Noneの区間はConfig.dtを用いる)"""
+
+    launcher: float | None = None
+    """ランチャー上"""
+    burn: float | None = None
+    """ランチクリアから燃焼終了まで"""
+    coast: float | None = None
+    """燃焼終了から最高高度まで"""
+    parachute_delay: float | None = None
+    """最高高度から開傘まで"""
+    descent: float | None = None
+    """開傘から着地まで(パラシュートが開かない場合も含む)"""
+    after_burnout_scale: float | None = None
+    """coast、parachute_delay、descentを省略した場合にdtに掛ける倍率"""
+
+
 @dataclass
 class Config:
-    mass: pd.DataFrame
+    mass: "pd.DataFrame"
     wind: WindPowerLow
-    thrust: pd.DataFrame
+    thrust: "pd.DataFrame"
     CA: float
     CN_alpha: float
     body_area: float
@@ -37,3 +60,17 @@ class Config:
     first_gravity_center: np.ndarray
     end_gravity_center: np.ndarray
     length: float
+    atmosphere: "pd.DataFrame | None" = None
+    """高度をindexとし気温と気圧を持つ大気の観測値(Noneの場合は国際標準大気)"""
+    aerodynamic_table: "pd.DataFrame | None" = None
+    """マッハ数と迎角ごとのCAとCN(Noneの場合はCAとCN_alphaを用いる)"""
+    wind_profile: "pd.DataFrame | None" = None
+    """高度(と時刻)ごとの風速と風向の観測値や予報値(Noneの場合はwindのべき法則を用いる)"""
+    wind_profile_time: float = 0.0
+    """wind_profileが時刻ごとの場合に用いる時刻"""
+    parachute_descent_dt: float | None = None
+    """パラシュート下降を3自由度の質点モデルで計算する場合の時間刻み(Noneの場合は6自由度のモデルでdtを用いる)"""
+    dt_schedule: TimeStepSchedule = field(default_factory=TimeStepSchedule)
+    """飛行の区間ごとの時間刻み"""
+    thrust_compression: ThrustCompression | None = None
+    """推力の表を読み込み時に間引いた場合の誤差(Noneの場合は間引いていない)"""
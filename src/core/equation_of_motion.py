@@ -1,6 +1,7 @@
 import numpy as np
 
 from . import inertia_tensor as it
+from . import quaternion_util
 
 
 def angular_acceleration(
@@ -18,4 +19,4 @@ def angular_acceleration(
     Returns:
         np.ndarray: 慣性系での角加速度
     """
-    return inertia.inverse @ (moment - np.cross(rotation, inertia.tensor @ rotation))
+    return inertia.inverse @ (moment - quaternion_util.cross(rotation, inertia.tensor @ rotation))
@@ -0,0 +1,176 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+import quaternion
+
+from .rocket_state import RocketState
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LAUNCH_CLEAR = "launch_clear"
+"""ランチャーを離れた"""
+BURNOUT = "burnout"
+"""推力がTHRUST_THRESHOLD以下になった"""
+APOGEE = "apogee"
+"""最高高度に達した"""
+PARACHUTE_DEPLOY = "parachute_deploy"
+"""パラシュートが開いた"""
+LANDING = "landing"
+"""着地した"""
+
+_BISECTION_ITERATIONS = 50
+"""イベント時刻を求める二分法の反復回数"""
+
+
+@dataclass
+class FlightEvent:
+    """飛行中のイベントの時刻と状態"""
+
+    name: str
+    """イベント名"""
+    time: float
+    """ステップ間で補間したイベントの時刻"""
+    state: RocketState
+    """イベントの時刻でのロケットの状態"""
+
+    def to_df_row(self) -> list:
+        """DataFrame用の行に変換する
+
+        Returns:
+            list: DataFrameの行
+        """
+        return [
+            self.name,
+            self.time,
+            *self.state.position,
+            *self.state.velocity,
+        ]
+
+
+def events_to_df(events: list[FlightEvent]) -> "pd.DataFrame":
+    """イベントのリストをDataFrameに変換する
+
+    Args:
+        events (list[FlightEvent]): イベントのリスト
+
+    Returns:
+        pd.DataFrame: DataFrame
+    """
+    import pandas as pd  # noqa: PLC0415
+
+    return pd.DataFrame(
+        [event.to_df_row() for event in events],
+        columns=[
+            "event",
+            "time",
+            "position_n",
+            "position_e",
+            "position_d",
+            "velocity_n",
+            "velocity_e",
+            "velocity_d",
+        ],
+    )
+
+
+def interpolate_state(
+    t0: float,
+    state0: RocketState,
+    t1: float,
+    state1: RocketState,
+    t: float,
+) -> RocketState:
+    """2つのステップの間の状態を補間する
+
+    位置は速度を用いた3次エルミート補間、姿勢は球面線形補間、
+    速度と角速度は線形補間で求める。
+
+    Args:
+        t0 (float): 前のステップの時刻
+        state0 (RocketState): 前のステップの状態
+        t1 (float): 後のステップの時刻
+        state1 (RocketState): 後のステップの状態
+        t (float): 補間する時刻
+
+    Returns:
+        RocketState: 時刻tでの状態
+    """
+    dt = t1 - t0
+    s = (t - t0) / dt
+    h00 = 2 * s**3 - 3 * s**2 + 1
+    h10 = s**3 - 2 * s**2 + s
+    h01 = -2 * s**3 + 3 * s**2
+    h11 = s**3 - s**2
+    position = h00 * state0.position + h10 * dt * state0.velocity + h01 * state1.position + h11 * dt * state1.velocity
+    return RocketState(
+        position,
+        (1 - s) * state0.velocity + s * state1.velocity,
+        quaternion.slerp_evaluate(state0.posture, state1.posture, s),
+        (1 - s) * state0.rotation + s * state1.rotation,
+    )
+
+
+def find_event(
+    name: str,
+    start: tuple[float, RocketState],
+    end: tuple[float, RocketState],
+    function: Callable[[float, RocketState], float],
+) -> FlightEvent:
+    """2つのステップの間でfunctionが正になる時刻を二分法で求める
+
+    Args:
+        name (str): イベント名
+        start (tuple[float, RocketState]): 前のステップの時刻と状態(function<=0)
+        end (tuple[float, RocketState]): 後のステップの時刻と状態(function>0)
+        function (Callable[[float, RocketState], float]): 時刻と状態を受け取り、イベント後に正となる関数
+
+    Returns:
+        FlightEvent: イベント
+    """
+    t0, state0 = start
+    t1, state1 = end
+    if function(t0, state0) > 0:
+        # 前のステップで既に条件を満たしている場合は補間しない
+        return FlightEvent(name, t0, state0)
+    low, high = t0, t1
+    for _ in range(_BISECTION_ITERATIONS):
+        middle = (low + high) / 2
+        if function(middle, interpolate_state(t0, state0, t1, state1, middle)) > 0:
+            high = middle
+        else:
+            low = middle
+    return FlightEvent(name, high, interpolate_state(t0, state0, t1, state1, high))
+
+
+def launch_clear_function(launcher_length: float) -> Callable[[float, RocketState], float]:
+    """ランチャーを離れると正になる関数を生成する"""
+
+    def function(_: float, state: RocketState) -> float:
+        return float(np.linalg.norm(state.position, ord=2)) - launcher_length
+
+    return function
+
+
+def apogee_function(_: float, state: RocketState) -> float:
+    """下降を始めると正になる関数"""
+    return state.velocity[2]
+
+
+def landing_function(_: float, state: RocketState) -> float:
+    """着地すると正になる関数"""
+    return state.position[2]
+
+
+def burnout_function(
+    thrust: Callable[[float], float],
+    threshold: float,
+) -> Callable[[float, RocketState], float]:
+    """推力がthreshold以下になると正になる関数を生成する"""
+
+    def function(t: float, _: RocketState) -> float:
+        return 1.0 if thrust(t) <= threshold else -1.0
+
+    return function
@@ -0,0 +1,131 @@
+import copy
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .simulation_result import SimulationResultRow
+
+
+def _acceleration_norm(row: "SimulationResultRow") -> float:
+    return float(np.linalg.norm(row.acceleration_body_frame, ord=2))
+
+
+_CRITERIA: dict[str, tuple[Callable[["SimulationResultRow"], bool], Callable[["SimulationResultRow"], float]]] = {
+    # 条件を満たす最初の行を選ぶため評価値は定数とする
+    "launch_clear": (lambda row: not row.on_launcher, lambda _: 0.0),
+    "max_dynamic_pressure_burning": (lambda row: row.burning, lambda row: row.dynamic_pressure),
+    "max_dynamic_pressure": (lambda _: True, lambda row: row.dynamic_pressure),
+    "max_altitude": (lambda _: True, lambda row: -row.position[2]),
+    "max_acceleration": (lambda _: True, _acceleration_norm),
+}
+"""指標ごとの(行が対象となる条件, 評価値)。評価値が最大となる最初の行を記録する"""
+
+
+@dataclass
+class FlightMetrics:
+    """積分の各ステップで更新するレポート用の飛行指標
+
+    各指標について評価値が最大となる行と最後の行だけを保持するため、
+    使用するメモリは飛行時間によらない。
+    最後に追加された行はSimulationResult.joinで除かれる可能性があるため、
+    確定した行とは別に保持する。
+    """
+
+    last: "SimulationResultRow | None" = None
+    """最後に追加された行"""
+    _best: dict[str, tuple[float, "SimulationResultRow"]] = field(default_factory=dict)
+    """lastを除いた行での指標ごとの(評価値, 行)"""
+
+    def update(self, row: "SimulationResultRow") -> None:
+        """次の時刻の行で指標を更新する
+
+        Args:
+            row (SimulationResultRow): 追加する行
+        """
+        if self.last is not None:
+            self._best = self._selected(self._best, self.last)
+        self.last = row
+
+    @staticmethod
+    def _selected(
+        best: dict[str, tuple[float, "SimulationResultRow"]],
+        row: "SimulationResultRow",
+    ) -> dict[str, tuple[float, "SimulationResultRow"]]:
+        """bestにrowを加えた場合の指標ごとの(評価値, 行)を求める"""
+        selected = dict(best)
+        for name, (condition, key) in _CRITERIA.items():
+            if not condition(row):
+                continue
+            value = key(row)
+            # 評価値が等しい場合は先の行を優先する
+            if name not in selected or value > selected[name][0]:
+                selected[name] = (value, row)
+        return selected
+
+    def merge(self, other: "FlightMetrics") -> "FlightMetrics":
+        """後に続く区間の指標と結合する
+
+        SimulationResult.joinと同様に、このインスタンスの最後の行は除かれる
+
+        Args:
+            other (FlightMetrics): 結合する指標
+
+        Returns:
+            FlightMetrics: 結合した指標
+        """
+        best = dict(self._best)
+        for name, (value, row) in other._best.items():  # noqa: SLF001
+            if name not in best or value > best[name][0]:
+                best[name] = (value, row)
+        return FlightMetrics(last=other.last, _best=best)
+
+    def deepcopy(self) -> "FlightMetrics":
+        """指標をディープコピーする
+
+        Returns:
+            FlightMetrics: ディープコピーした指標
+        """
+        return copy.deepcopy(self)
+
+    def _get(self, name: str) -> "SimulationResultRow":
+        best = self._best if self.last is None else self._selected(self._best, self.last)
+        if name not in best:
+            err_msg = f"{name}に該当する行がありません"
+            raise ValueError(err_msg)
+        return best[name][1]
+
+    @property
+    def launch_clear(self) -> "SimulationResultRow":
+        """ランチャーを離れた最初の行"""
+        return self._get("launch_clear")
+
+    @property
+    def max_dynamic_pressure_burning(self) -> "SimulationResultRow":
+        """燃焼中に動圧が最大となる行"""
+        return self._get("max_dynamic_pressure_burning")
+
+    @property
+    def max_dynamic_pressure(self) -> "SimulationResultRow":
+        """全飛行時間を通して動圧が最大となる行"""
+        return self._get("max_dynamic_pressure")
+
+    @property
+    def max_altitude(self) -> "SimulationResultRow":
+        """高度が最大となる行"""
+        return self._get("max_altitude")
+
+    @property
+    def max_acceleration(self) -> "SimulationResultRow":
+        """ボディ座標系での加速度の大きさが最大となる行"""
+        return self._get("max_acceleration")
+
+    @property
+    def landing(self) -> "SimulationResultRow":
+        """最後の行"""
+        if self.last is None:
+            err_msg = "行がありません"
+            raise ValueError(err_msg)
+        return self.last
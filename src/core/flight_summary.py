@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SUMMARY_OUTPUTS = ("apogee", "max_dynamic_pressure", "launch_clear_velocity", "launch_clear_angle_of_attack")
+"""着地点と着地時刻以外に選択して記録できる量"""
+
+
+@dataclass
+class FlightSummary:
+    """軌道を記録せずに求めた飛行の要約
+
+    着地点と着地時刻は常に記録され、それ以外は記録しなかった場合Noneとなる。
+    """
+
+    landing_time: float
+    """着地時刻"""
+    landing_position: np.ndarray
+    """慣性系での着地点"""
+    apogee_time: float | None = None
+    """最高高度に達した時刻"""
+    apogee_position: np.ndarray | None = None
+    """慣性系での最高高度に達した位置"""
+    max_dynamic_pressure: float | None = None
+    """全飛行時間を通した最大動圧"""
+    launch_clear_velocity: float | None = None
+    """ランチクリア時の速さ"""
+    launch_clear_angle_of_attack: float | None = None
+    """ランチクリア時の迎角[rad]"""
+
+    @property
+    def apogee(self) -> float | None:
+        """最高高度"""
+        if self.apogee_position is None:
+            return None
+        return -self.apogee_position[2]
+
+    def to_df(self) -> "pd.DataFrame":
+        """最高高度と着地点の行からなるDataFrameに変換する
+
+        SimulationResult.to_dfと同じ名前の時刻と位置のカラムを持ち、
+        最後の行が着地点となる。
+
+        Returns:
+            pd.DataFrame: DataFrame
+        """
+        import pandas as pd  # noqa: PLC0415
+
+        rows = []
+        if self.apogee_time is not None and self.apogee_position is not None:
+            rows.append([self.apogee_time, *self.apogee_position])
+        rows.append([self.landing_time, *self.landing_position])
+        return pd.DataFrame(rows, columns=["time", "position_n", "position_e", "position_d"])
@@ -1,20 +1,25 @@
+import functools
 import typing
+from typing import TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
 
 from . import interpolation
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def thrust_end_time(thrust_df: pd.DataFrame) -> float:
+
+def thrust_end_time(thrust_df: "pd.DataFrame") -> float:
     threshold = 1e-10
-    return float(thrust_df[thrust_df["thrust"] < threshold].index[0])
+    time = thrust_df.index.to_numpy(dtype=float)
+    return float(time[np.flatnonzero(thrust_df["thrust"].to_numpy(dtype=float) < threshold)[0]])
 
 
 def create_gravity_center_function_from_dataframe(
     first_gravity_center: np.ndarray,
     end_gravity_center: np.ndarray,
-    thrust_df: pd.DataFrame,
+    thrust_df: "pd.DataFrame",
 ) -> typing.Callable[[float], np.ndarray]:
     """DataFrameから重心位置を計算する関数を作成する
 
@@ -29,29 +34,25 @@ def create_gravity_center_function_from_dataframe(
     # 閾値
     thrust_end_time_ = thrust_end_time(thrust_df)
 
-    # 重心位置のデータフレームを作成
-    gravity_center_df = pd.DataFrame(
-        {
-            "time": [0, thrust_end_time_, 1000],
-            "gravity_center": [
-                first_gravity_center,
-                end_gravity_center,
-                end_gravity_center,
-            ],
-        },
-    ).set_index("time")
-
     # 補間関数を取得
-    interp_func = interpolation.df_to_function_1d_array(gravity_center_df)
-
-    # エラー処理を追加
-    def gravity_center_func(time: float) -> np.ndarray:
-        try:
-            return interp_func(time)
-        except ValueError:
-            # 範囲外の値の場合は適切な値を返す
-            if time < 0:
-                return first_gravity_center
-            return end_gravity_center
-
-    return gravity_center_func
+    interp_func = interpolation.arrays_to_function_1d_array(
+        np.array([0.0, thrust_end_time_, 1000.0]),
+        np.array([first_gravity_center, end_gravity_center, end_gravity_center]),
+    )
+
+    return functools.partial(_gravity_center, interp_func, first_gravity_center, end_gravity_center)
+
+
+def _gravity_center(
+    interp_func: typing.Callable[[float], np.ndarray],
+    first_gravity_center: np.ndarray,
+    end_gravity_center: np.ndarray,
+    time: float,
+) -> np.ndarray:
+    try:
+        return interp_func(time)
+    except ValueError:
+        # 範囲外の値の場合は適切な値を返す
+        if time < 0:
+            return first_gravity_center
+        return end_gravity_center
@@ -1,10 +1,15 @@
+import bisect
+import functools
 import typing as t
+from typing import TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def df_to_function_1d(df: pd.DataFrame) -> t.Callable[[float], float]:
+
+def df_to_function_1d(df: "pd.DataFrame") -> t.Callable[[float], float]:
     """線形補完によりDataFrameをインデックスから1番目のカラムへの関数に変換する
 
     Args:
@@ -13,11 +18,39 @@ def df_to_function_1d(df: pd.DataFrame) -> t.Callable[[float], float]:
     Returns:
         np.ndarray: 関数
     """
-    return lambda x: float(np.interp(x, df.index, df.iloc[:, 0]))
+    # 呼び出しごとにDataFrameを参照すると遅いため、配列を先に取り出しておく
+    x_data = df.index.to_numpy(dtype=float)
+    y_data = df.iloc[:, 0].to_numpy(dtype=float)
+    # 並列計算のワーカーに送れるように、クロージャではなくpickleできるpartialとする
+    return functools.partial(_interpolate, x_data, y_data)
+
+
+def _interpolate(x_data: np.ndarray, y_data: np.ndarray, x: float) -> float:
+    return float(np.interp(x, x_data, y_data))
+
+
+def df_to_function_1d_batch(df: "pd.DataFrame") -> t.Callable[[np.ndarray], np.ndarray]:
+    """線形補完によりDataFrameをインデックスから1番目のカラムへの関数に変換する
+
+    df_to_function_1dと同じ補間を配列に対してまとめて行う。
+
+    Args:
+        df (pd.DataFrame): DataFrame
+
+    Returns:
+        t.Callable[[np.ndarray], np.ndarray]: 配列を受け取り、各要素を補間した配列を返す関数
+    """
+    x_data = df.index.to_numpy(dtype=float)
+    y_data = df.iloc[:, 0].to_numpy(dtype=float)
+    return functools.partial(_interpolate_batch, x_data, y_data)
+
+
+def _interpolate_batch(x_data: np.ndarray, y_data: np.ndarray, x: np.ndarray) -> np.ndarray:
+    return np.interp(x, x_data, y_data)
 
 
 def df_to_function_1d_array(
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
 ) -> t.Callable[[float], np.ndarray]:
     """インデックスから1番目のカラムへの関数をnumpy配列で返す
 
@@ -34,32 +67,82 @@ def df_to_function_1d_array(
         ValueError: 補間範囲外の値が指定された場合
     """
     # DataFrameからデータを取得
-    indices = np.array(df.index)
-    values = df.iloc[:, 0].to_numpy()
+    return arrays_to_function_1d_array(np.array(df.index), df.iloc[:, 0].to_numpy())
+
+
+def arrays_to_function_1d_array(indices: np.ndarray, values: np.ndarray) -> t.Callable[[float], np.ndarray]:
+    """df_to_function_1d_arrayと同じ補間をDataFrameを作らずに配列から行う
+
+    Args:
+        indices (np.ndarray): 昇順の補間点
+        values (np.ndarray): 各補間点での値(1番目の軸が補間点に対応する)
+
+    Returns:
+        t.Callable[[float], np.ndarray]: numpy配列を返す関数
+
+    Raises:
+        ValueError: 補間範囲外の値が指定された場合
+    """
+    return functools.partial(_interpolate_array, indices, values, float(indices[0]), float(indices[-1]))
+
+
+def _interpolate_array(indices: np.ndarray, values: np.ndarray, min_x: float, max_x: float, x: float) -> np.ndarray:
+    # x値がインデックスの範囲外の場合はエラー
+    if x < min_x or x > max_x:
+        err_msg = "補間範囲外の値です"
+        raise ValueError(err_msg, x, min_x, max_x)
+
+    # 境界値の場合はその値を返す
+    if x == min_x:
+        return values[0]
+    if x == max_x:
+        return values[-1]
+
+    # 補間用のインデックスを検索
+    idx = np.searchsorted(indices, x) - 1
+    idx_next = idx + 1
 
-    min_x = float(indices[0])
-    max_x = float(indices[-1])
+    # 補間係数を計算
+    t = (x - indices[idx]) / (indices[idx_next] - indices[idx])
 
-    def interpolate_array(x: float) -> np.ndarray:
-        # x値がインデックスの範囲外の場合はエラー
-        if x < min_x or x > max_x:
-            err_msg = "補間範囲外の値です"
-            raise ValueError(err_msg, x, min_x, max_x)
+    # 線形補間を実行
+    return (1 - t) * values[idx] + t * values[idx_next]
 
-        # 境界値の場合はその値を返す
-        if x == min_x:
-            return values[0]
-        if x == max_x:
-            return values[-1]
 
-        # 補間用のインデックスを検索
-        idx = np.searchsorted(indices, x) - 1
-        idx_next = idx + 1
+def locate(axis: list[float], x: float, hint: int) -> int:
+    """昇順の格子でxを含む区間の添字を求める
 
-        # 補間係数を計算
-        t = (x - indices[idx]) / (indices[idx_next] - indices[idx])
+    軌道に沿った参照では前回の区間かその隣にあることが多いため、
+    hintとその隣から探し、見つからなければ二分探索する。
+    範囲外の場合は端の区間を返す。
+
+    Args:
+        axis (list[float]): 2点以上の昇順の格子
+        x (float): 探す値
+        hint (int): 前回の区間の添字
+
+    Returns:
+        int: axis[i] <= x < axis[i + 1]となるi(0からlen(axis) - 2まで)
+    """
+    last = len(axis) - 2
+    if axis[hint] <= x < axis[hint + 1]:
+        return hint
+    if hint < last and axis[hint + 1] <= x < axis[hint + 2]:
+        return hint + 1
+    if hint > 0 and axis[hint - 1] <= x < axis[hint]:
+        return hint - 1
+    return min(max(bisect.bisect_right(axis, x) - 1, 0), last)
 
-        # 線形補間を実行
-        return (1 - t) * values[idx] + t * values[idx_next]
 
-    return interpolate_array
+def locate_weight(axis: list[float], i: int, x: float) -> float:
+    """区間i内でのxの位置を0から1で求める(範囲外では端の値となるよう制限する)
+
+    Args:
+        axis (list[float]): 昇順の格子
+        i (int): 区間の添字
+        x (float): 値
+
+    Returns:
+        float: 補間の重み
+    """
+    return min(max((x - axis[i]) / (axis[i + 1] - axis[i]), 0.0), 1.0)
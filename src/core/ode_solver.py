@@ -4,6 +4,30 @@ from typing import TypeVar
 T = TypeVar("T")  # 状態を表す型変数
 
 
+def runge_kutta4_step(
+    f: Callable[[float, T], T],
+    t_n: float,
+    y_n: T,
+    time_step: float,
+) -> T:
+    """Runge-Kutta法で1ステップ進める
+
+    Args:
+        f (Callable[[float, T], T]): 微分を求める式(dy/dt=f(y,t))
+        t_n (float): 現在の時刻
+        y_n (T): 現在の状態
+        time_step (float): 時間の刻み幅
+
+    Returns:
+        T: time_step後の状態
+    """
+    k1 = f(t_n, y_n)
+    k2 = f(t_n + time_step / 2, y_n + k1 * (time_step / 2))
+    k3 = f(t_n + time_step / 2, y_n + k2 * (time_step / 2))
+    k4 = f(t_n + time_step, y_n + k3 * time_step)
+    return y_n + (k1 + k2 * 2 + k3 * 2 + k4) * (time_step / 6)
+
+
 def runge_kutta4(
     f: Callable[[float, T], T],
     initial_state: T,
@@ -26,10 +50,66 @@ def runge_kutta4(
     result = [(initial_time, initial_state)]
     while not end_condition(*result[-1]):
         t_n, y_n = result[-1]
-        k1 = f(t_n, y_n)
-        k2 = f(t_n + time_step / 2, y_n + k1 * (time_step / 2))
-        k3 = f(t_n + time_step / 2, y_n + k2 * (time_step / 2))
-        k4 = f(t_n + time_step, y_n + k3 * time_step)
-        y_n1 = y_n + (k1 + k2 * 2 + k3 * 2 + k4) * (time_step / 6)
-        result.append((t_n + time_step, y_n1))
+        result.append((t_n + time_step, runge_kutta4_step(f, t_n, y_n, time_step)))
     return result
+
+
+def runge_kutta4_variable(
+    f: Callable[[float, T], T],
+    initial_state: T,
+    initial_time: float,
+    time_step: Callable[[float, T], float],
+    end_condition: Callable[[float, T], bool],
+) -> list[tuple[float, T]]:
+    """状態に応じて時間刻みを変えるRunge-Kutta法による常微分方程式の数値解法
+
+    Args:
+        f (Callable[[float, T], T]): 微分を求める式(dy/dt=f(y,t))
+        initial_state (T): 初期状態
+        initial_time (float): 初期時刻
+        time_step (Callable[[float, T], float]): 時刻と状態から次のステップの時間の刻み幅を求める関数
+        end_condition (Callable[[float, T], bool]): 終了条件(Trueを返すと終了する)
+
+    Returns:
+        List[Tuple[float, T]]: 時刻と状態のリスト
+    """
+    result = [(initial_time, initial_state)]
+    while not end_condition(*result[-1]):
+        t_n, y_n = result[-1]
+        h = time_step(t_n, y_n)
+        result.append((t_n + h, runge_kutta4_step(f, t_n, y_n, h)))
+    return result
+
+
+def runge_kutta4_last(
+    f: Callable[[float, T], T],
+    initial_state: T,
+    initial_time: float,
+    time_step: float | Callable[[float, T], float],
+    end_condition: Callable[[float, T], bool],
+    *,
+    observer: Callable[[float, T], None] | None = None,
+) -> tuple[float, T]:
+    """途中の状態を保存せずにRunge-Kutta法で終了条件まで解く
+
+    Args:
+        f (Callable[[float, T], T]): 微分を求める式(dy/dt=f(y,t))
+        initial_state (T): 初期状態
+        initial_time (float): 初期時刻
+        time_step (float | Callable[[float, T], float]): 時間の刻み幅、または時刻と状態から刻み幅を求める関数
+        end_condition (Callable[[float, T], bool]): 終了条件(Trueを返すと終了する)
+        observer (Callable[[float, T], None] | None): 初期状態を含む各ステップの時刻と状態を受け取る関数
+
+    Returns:
+        tuple[float, T]: 最後の時刻と状態
+    """
+    t_n, y_n = initial_time, initial_state
+    if observer is not None:
+        observer(t_n, y_n)
+    while not end_condition(t_n, y_n):
+        h = time_step(t_n, y_n) if callable(time_step) else time_step
+        y_n = runge_kutta4_step(f, t_n, y_n, h)
+        t_n += h
+        if observer is not None:
+            observer(t_n, y_n)
+    return t_n, y_n
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import flight_event
+
+
+@dataclass(frozen=True)
+class PhaseIndex:
+    """飛行の各段階に対応する行の範囲
+
+    各段階は連続した行の範囲なので、DataFrame.ilocやnumpyのスライスで
+    コピーせずに取り出せる。燃焼はランチャー上から始まるためlauncherとburnは重なる。
+    パラシュートが開かない場合、delayは空となり最高高度以降は全てdescentとなる。
+    """
+
+    launcher: slice
+    """ランチャー上"""
+    burn: slice
+    """燃焼中"""
+    coast: slice
+    """燃焼終了から最高高度まで"""
+    delay: slice
+    """最高高度から開傘まで"""
+    descent: slice
+    """開傘から着地まで"""
+
+    @property
+    def after_burnout(self) -> slice:
+        """燃焼終了から着地まで"""
+        return slice(self.burn.stop, self.descent.stop)
+
+    @classmethod
+    def from_events(cls, time: np.ndarray, events: list[flight_event.FlightEvent]) -> "PhaseIndex":
+        """イベントの時刻から各段階の行の範囲を求める
+
+        イベントの時刻は前後のステップの間に補間されているため、
+        イベントの時刻以降の最初の行を次の段階の始まりとする。
+
+        Args:
+            time (np.ndarray): 各行の時刻(昇順)
+            events (list[FlightEvent]): 飛行中のイベント
+
+        Returns:
+            PhaseIndex: 各段階の行の範囲
+        """
+        times = {event.name: event.time for event in events}
+        n = len(time)
+
+        def start(name: str, default: int) -> int:
+            if name not in times:
+                return default
+            return int(np.searchsorted(time, times[name], side="left"))
+
+        launch_clear = start(flight_event.LAUNCH_CLEAR, n)
+        burnout = start(flight_event.BURNOUT, n)
+        apogee = max(burnout, start(flight_event.APOGEE, n))
+        deploy = max(apogee, start(flight_event.PARACHUTE_DEPLOY, apogee))
+        return cls(
+            launcher=slice(0, launch_clear),
+            burn=slice(0, burnout),
+            coast=slice(burnout, apogee),
+            delay=slice(apogee, deploy),
+            descent=slice(deploy, n),
+        )
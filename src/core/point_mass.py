@@ -0,0 +1,364 @@
+import typing
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import air_force, ode_solver, quaternion_util
+from .atmosphere import AtmosphereTable
+from .config import Config
+from .flight_summary import FlightSummary
+from .simulation_context import SimulationContext
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Gravitational_acceleration = np.array([0, 0, air_force.GRAVITATIONAL_ACCELERATION])
+
+_RAIL = 0
+"""ランチャー上"""
+_FLIGHT = 1
+"""ランチクリアから最高高度まで"""
+_DELAY = 2
+"""最高高度から開傘まで"""
+_DESCENT = 3
+"""開傘から着地まで(機軸の向きは変えない)"""
+_DONE = 4
+"""その区間の計算を終えた"""
+
+
+def _stack_tables(tables: "list[pd.DataFrame]", name: str) -> tuple[np.ndarray, np.ndarray]:
+    """共通の時刻の格子を持つ表を(設定の数, 格子点の数)の配列にまとめる
+
+    Raises:
+        ValueError: 表の時刻の格子が一致しない場合
+    """
+    grid = tables[0].index.to_numpy(dtype=float)
+    for table in tables[1:]:
+        if not np.array_equal(table.index.to_numpy(dtype=float), grid):
+            err_msg = f"{name}の時刻の格子は全ての設定で一致する必要があります"
+            raise ValueError(err_msg)
+    return grid, np.array([table.iloc[:, 0].to_numpy(dtype=float) for table in tables])
+
+
+def _interpolate_rows(grid: np.ndarray, values: np.ndarray, x: float | np.ndarray) -> np.ndarray:
+    """各行をxで線形補間する(範囲外では端の値を用いる)
+
+    xが配列(設定の数,)の場合は行ごとに異なる値で補間する。
+    """
+    if np.ndim(x) == 0:
+        i = int(np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2))
+        s = min(max((x - grid[i]) / (grid[i + 1] - grid[i]), 0.0), 1.0)
+        return values[:, i] * (1 - s) + values[:, i + 1] * s
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+    s = np.clip((x - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+    rows = np.arange(len(values))
+    return values[rows, i] * (1 - s) + values[rows, i + 1] * s
+
+
+@dataclass
+class PointMassBatch:
+    """3自由度の質点モデルでまとめて計算する機体の設定
+
+    配列の先頭の軸は設定の数とする。推力は機軸の方向、軸力は対気速度と逆向きにかけ、
+    法線力による並進と姿勢の振動は無視する。機軸の向きは風見安定の固有角振動数
+    sqrt(密度 * weathercock_coefficient) * 対気速度で対気速度の方向へ一次遅れで近づくとみなす。
+    """
+
+    thrust_time: np.ndarray
+    """推力の表の時刻(M,)"""
+    thrust: np.ndarray
+    """推力(N, M)"""
+    mass_time: np.ndarray
+    """質量の表の時刻(K,)"""
+    mass: np.ndarray
+    """質量(N, K)"""
+    CA: np.ndarray
+    """軸力係数"""
+    body_area: np.ndarray
+    """断面積"""
+    weathercock_coefficient: np.ndarray
+    """風見安定の係数(断面積 * CN_alpha * 重心と風圧中心の距離 / (2 * ピッチの慣性モーメント))"""
+    launcher_length: np.ndarray
+    """ランチャーの長さ"""
+    rail_axis: np.ndarray
+    """レールの向き(N, 3)"""
+    wind_direction: np.ndarray
+    """風の吹く向きの単位ベクトル(N, 3)"""
+    wind_speed: np.ndarray
+    """基準高度での風速"""
+    wind_reference_height: np.ndarray
+    """風の基準高度"""
+    wind_power: np.ndarray
+    """べき法則の指数(べき定数の逆数)"""
+    parachute_terminal_velocity: np.ndarray
+    """パラシュートの終端速度"""
+    parachute_delay_time: np.ndarray
+    """最高高度到達からパラシュート展開までの時間"""
+    atmosphere: AtmosphereTable
+    """大気(全ての設定で共通)"""
+    dt: float
+    """上昇中の時間刻み(全ての設定のdtの最小値)"""
+
+    @classmethod
+    def from_configs(cls, configs: list[Config]) -> "PointMassBatch":
+        """コンフィグのリストから作成する
+
+        Args:
+            configs (list[Config]): コンフィグのリスト。推力と質量の表の時刻の格子と大気は共通とする
+
+        Returns:
+            PointMassBatch: まとめた設定
+
+        Raises:
+            ValueError: 風の分布か空力係数の表が設定されている場合や、推力と質量の表の時刻の格子が一致しない場合
+        """
+        if any(config.wind_profile is not None for config in configs):
+            err_msg = "質点モデルは風のべき法則にのみ対応しています"
+            raise ValueError(err_msg)
+        if any(config.aerodynamic_table is not None for config in configs):
+            # 抗力をconfig.CAで求めるため、表を用いる6自由度のモデルと異なる抗力になる
+            err_msg = "質点モデルは空力係数の表に対応していません"
+            raise ValueError(err_msg)
+        thrust_time, thrust = _stack_tables([config.thrust for config in configs], "推力")
+        mass_time, mass = _stack_tables([config.mass for config in configs], "質量")
+        theta = np.deg2rad([config.wind.wind_direction for config in configs])
+        rail_axis = np.array(
+            [
+                quaternion_util.body_to_inertial(
+                    quaternion_util.from_euler_angle(config.first_elevation, config.first_azimuth, config.first_roll),
+                    np.array([1.0, 0.0, 0.0]),
+                )
+                for config in configs
+            ],
+        )
+        return cls(
+            thrust_time=thrust_time,
+            thrust=thrust,
+            mass_time=mass_time,
+            mass=mass,
+            CA=np.array([config.CA for config in configs]),
+            body_area=np.array([config.body_area for config in configs]),
+            weathercock_coefficient=np.array(
+                [
+                    config.body_area
+                    * config.CN_alpha
+                    * abs(0.5 * (config.first_gravity_center[0] + config.end_gravity_center[0]) - config.wind_center[0])
+                    / (2 * config.inertia_tensor_yy)
+                    for config in configs
+                ],
+            ),
+            launcher_length=np.array([config.launcher_length for config in configs]),
+            rail_axis=rail_axis,
+            wind_direction=np.stack([-np.cos(theta), -np.sin(theta), np.zeros_like(theta)], axis=-1),
+            wind_speed=np.array([config.wind.wind_speed for config in configs]),
+            wind_reference_height=np.array([config.wind.reference_height for config in configs]),
+            wind_power=1 / np.array([config.wind.exponent for config in configs]),
+            parachute_terminal_velocity=np.array([config.parachute_terminal_velocity for config in configs]),
+            parachute_delay_time=np.array([config.parachute_delay_time for config in configs]),
+            atmosphere=SimulationContext(configs[0]).atmosphere,
+            dt=min(config.dt for config in configs),
+        )
+
+    def wind(self, altitude: np.ndarray) -> np.ndarray:
+        """各設定の高度での風速ベクトル(N, 3)"""
+        speed = np.where(
+            altitude < 0,
+            0.0,
+            self.wind_speed * (np.maximum(altitude, 0) / self.wind_reference_height) ** self.wind_power,
+        )
+        return speed[:, np.newaxis] * self.wind_direction
+
+    def derivative(
+        self,
+        phase: np.ndarray,
+        *,
+        parachute_on: bool = False,
+    ) -> typing.Callable[[float | np.ndarray, np.ndarray], np.ndarray]:
+        """(位置, 速度, 機軸の向き)を並べた状態(N, 9)の時間微分を計算する関数を生成する
+
+        Args:
+            phase (np.ndarray): 各設定の区間(_DONEの設定は状態を変えない)
+            parachute_on (bool): パラシュートが開いているか否か
+
+        Returns:
+            typing.Callable[[float | np.ndarray, np.ndarray], np.ndarray]: 時刻(全ての設定で共通、
+                または設定ごとの配列(N,))と状態から時間微分を計算する関数
+        """
+
+        def derivative(t: float | np.ndarray, state: np.ndarray) -> np.ndarray:
+            position, velocity, heading = state[:, :3], state[:, 3:6], state[:, 6:]
+            altitude = -position[:, 2]
+            velocity_air = velocity - self.wind(altitude)
+            airspeed = np.linalg.norm(velocity_air, axis=1)
+            mass = _interpolate_rows(self.mass_time, self.mass, t)
+            heading_rate = np.zeros_like(heading)
+            if parachute_on:
+                # パラシュートの抗力は終端速度から求める(6自由度のモデルと同じ)
+                drag = (
+                    air_force.GRAVITATIONAL_ACCELERATION
+                    * _interpolate_rows(self.mass_time, self.mass, 100)
+                    / self.parachute_terminal_velocity**2
+                    * airspeed
+                    / mass
+                )
+                acceleration = -drag[:, np.newaxis] * velocity_air + Gravitational_acceleration
+            else:
+                density = self.atmosphere.density_batch(altitude)
+                thrust = _interpolate_rows(self.thrust_time, self.thrust, t) / mass
+                drag = 0.5 * density * airspeed * self.body_area * self.CA / mass
+                acceleration = (
+                    thrust[:, np.newaxis] * heading - drag[:, np.newaxis] * velocity_air + Gravitational_acceleration
+                )
+                on_rail = phase == _RAIL
+                rail_acceleration = np.maximum(
+                    0.0, thrust - drag * airspeed + self.rail_axis @ Gravitational_acceleration
+                )
+                acceleration[on_rail] = rail_acceleration[on_rail, np.newaxis] * self.rail_axis[on_rail]
+                # ランチクリアから開傘までの機軸は風見安定の固有角振動数で対気速度の方向へ向きを変える
+                # (下降中は推力がなく機軸の向きは軌道に影響しないため、刻みを制限しないよう固定する)
+                direction = velocity_air / np.where(airspeed == 0, 1.0, airspeed)[:, np.newaxis]
+                rate = np.where(
+                    on_rail | (phase == _DESCENT), 0.0, np.sqrt(density * self.weathercock_coefficient) * airspeed
+                )
+                heading_rate = rate[:, np.newaxis] * (
+                    direction - np.einsum("ij,ij->i", direction, heading)[:, np.newaxis] * heading
+                )
+            derivative = np.concatenate([velocity, acceleration, heading_rate], axis=1)
+            derivative[phase == _DONE] = 0
+            return derivative
+
+        return derivative
+
+    def descent_time_step(self, state: np.ndarray, active: np.ndarray, max_dt: float, *, parachute_on: bool) -> float:
+        """下降中の全ての設定を安定に解ける時間刻みを求める
+
+        抗力が対気速度の2乗に比例する場合の速度の変化の時定数の最小値とmax_dtの小さい方とする。
+        """
+        altitude = -state[:, 2]
+        airspeed = np.linalg.norm(state[:, 3:6] - self.wind(altitude), axis=1)[active]
+        altitude = altitude[active]
+        if parachute_on:
+            drag_coefficient = air_force.GRAVITATIONAL_ACCELERATION / self.parachute_terminal_velocity[active] ** 2
+        else:
+            mass = self.mass[active, -1]
+            drag_coefficient = (
+                0.5 * self.atmosphere.density_batch(altitude) * self.body_area[active] * self.CA[active] / mass
+            )
+        rate = float((2 * drag_coefficient * airspeed).max(initial=0.0))
+        return max_dt if rate * max_dt <= 1 else max(1 / rate, self.dt)
+
+
+def simulate_landing_batch(
+    configs: list[Config],
+    *,
+    descent_dt: float = 1.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """3自由度の質点モデルで複数の設定の着地点をまとめて求める
+
+    6自由度のモデルより大幅に安く、着地点の分布の傾向をよく再現するため、
+    多数のサンプルでの分散の推定などに用いる。上昇中は全ての設定のdtの最小値、
+    下降中は最大descent_dtで安定に解ける刻みで全ての設定を同時に進め、
+    着地点はステップ間で線形補間する。
+
+    Args:
+        configs (list[Config]): コンフィグのリスト。推力と質量の表の時刻の格子と大気は共通とする
+        descent_dt (float): 下降中の最大の時間刻み[s]
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: [パラシュートが開かなかった場合, パラシュートが開いた場合]の着地点(N, 3)
+    """
+    batch, deploy_time, state, _, _ = _ascend(configs)
+    return (
+        _descend(batch, deploy_time, state.copy(), descent_dt, parachute_on=False)[0],
+        _descend(batch, deploy_time, state.copy(), descent_dt, parachute_on=True)[0],
+    )
+
+
+def simulate_summary_batch(
+    configs: list[Config],
+    *,
+    descent_dt: float = 1.0,
+) -> tuple[list[FlightSummary], list[FlightSummary]]:
+    """simulate_landing_batchと同じ計算で、着地時刻と最高高度も含む要約を求める
+
+    Args:
+        configs (list[Config]): コンフィグのリスト。推力と質量の表の時刻の格子と大気は共通とする
+        descent_dt (float): 下降中の最大の時間刻み[s]
+
+    Returns:
+        tuple[list[FlightSummary], list[FlightSummary]]: [パラシュートが開かなかった場合, パラシュートが開いた場合]の
+            各設定の要約(最高高度は超えたことを検出したステップの値)
+    """
+    batch, deploy_time, state, apogee_time, apogee_position = _ascend(configs)
+    summaries = []
+    for parachute_on in (False, True):
+        landing, landing_time = _descend(batch, deploy_time, state.copy(), descent_dt, parachute_on=parachute_on)
+        summaries.append(
+            [
+                FlightSummary(float(landing_time[i]), landing[i], float(apogee_time[i]), apogee_position[i])
+                for i in range(len(configs))
+            ],
+        )
+    return summaries[0], summaries[1]
+
+
+def _ascend(configs: list[Config]) -> tuple[PointMassBatch, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """打ち上げから全ての設定の開傘時刻まで進め、設定ごとの開傘時刻と状態、最高高度に達した時刻と位置を求める
+
+    開傘した設定は全ての設定が開傘するまで開傘時の状態のまま止めておく。
+    """
+    batch = PointMassBatch.from_configs(configs)
+    n = len(configs)
+    phase = np.full(n, _RAIL)
+    apogee_time = np.full(n, np.inf)
+    apogee_position = np.zeros((n, 3))
+    deploy_time = np.zeros(n)
+    state = np.concatenate([np.zeros((n, 6)), batch.rail_axis], axis=1)
+    t = 0.0
+    derivative = batch.derivative(phase)
+    while (phase != _DONE).any():
+        state = ode_solver.runge_kutta4_step(derivative, t, state, batch.dt)
+        t += batch.dt
+        # 区間の終了条件はsimple_simulationと同じ
+        rail_distance = np.einsum("ij,ij->i", state[:, :3], batch.rail_axis)
+        phase[(phase == _RAIL) & (rail_distance > batch.launcher_length)] = _FLIGHT
+        fall_start = (phase == _FLIGHT) & (state[:, 5] > 0)
+        phase[fall_start] = _DELAY
+        apogee_time[fall_start] = t
+        apogee_position[fall_start] = state[fall_start, :3]
+        deployed = (phase == _DELAY) & (t > apogee_time + batch.parachute_delay_time)
+        phase[deployed] = _DONE
+        deploy_time[deployed] = t
+    return batch, deploy_time, state, apogee_time, apogee_position
+
+
+def _descend(
+    batch: PointMassBatch,
+    deploy_time: np.ndarray,
+    state: np.ndarray,
+    max_dt: float,
+    *,
+    parachute_on: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    """開傘時刻の状態から着地まで解き、ステップ間で補間した着地点と着地時刻を求める
+
+    時間刻みは全ての設定で共通とし、時刻は設定ごとの開傘時刻から数える
+    (着地時刻が同時に計算する他の設定の開傘時刻によらないようにする)。
+    """
+    phase = np.where(state[:, 2] > 0, _DONE, _DESCENT)
+    landing = state[:, :3].copy()
+    landing_time = deploy_time.copy()
+    derivative = batch.derivative(phase, parachute_on=parachute_on)
+    t = deploy_time.copy()
+    while (active := phase != _DONE).any():
+        dt = batch.descent_time_step(state, active, max_dt, parachute_on=parachute_on)
+        previous = state
+        state = ode_solver.runge_kutta4_step(derivative, t, state, dt)
+        landed = active & (state[:, 2] > 0)
+        fraction = previous[landed, 2] / (previous[landed, 2] - state[landed, 2])
+        landing[landed] = previous[landed, :3] + fraction[:, np.newaxis] * (state[landed, :3] - previous[landed, :3])
+        landing_time[landed] = t[landed] + fraction * dt
+        t += dt
+        phase[landed] = _DONE
+    return landing, landing_time
@@ -142,3 +142,197 @@ def sum_vector_body_frame(
         posture,
         vectors_inertial_frame_sum,
     )
+
+
+def cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """3次元ベクトル同士の外積を計算する
+
+    np.crossは軸の正規化などの前処理が重く、1ステップに何度も呼ぶと無視できないため
+    要素ごとに計算する。
+
+    Args:
+        a (np.ndarray): ベクトル
+        b (np.ndarray): ベクトル
+
+    Returns:
+        np.ndarray: aとbの外積
+    """
+    a0, a1, a2 = a.tolist()
+    b0, b1, b2 = b.tolist()
+    return np.array([a1 * b2 - a2 * b1, a2 * b0 - a0 * b2, a0 * b1 - a1 * b0])
+
+
+def _cross_batch(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, 3)のベクトル同士の外積を計算する"""
+    return np.stack(
+        [
+            a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+            a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+            a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0],
+        ],
+        axis=-1,
+    )
+
+
+def square_norm_batch(q: np.ndarray) -> np.ndarray:
+    """(N, 4)のクォータニオン配列のノルムの二乗を計算する
+
+    Args:
+        q (np.ndarray): (w, x, y, z)の順に並べたクォータニオンの配列(N, 4)
+
+    Returns:
+        np.ndarray: ノルムの二乗(N,)
+    """
+    return np.einsum("...i,...i->...", q, q)
+
+
+def multiply_batch(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """(N, 4)のクォータニオン配列同士の積p*qを計算する
+
+    Args:
+        p (np.ndarray): 左側のクォータニオンの配列(N, 4)
+        q (np.ndarray): 右側のクォータニオンの配列(N, 4)
+
+    Returns:
+        np.ndarray: 積の配列(N, 4)
+    """
+    p_w, p_v = p[..., 0], p[..., 1:]
+    q_w, q_v = q[..., 0], q[..., 1:]
+    w = p_w * q_w - np.einsum("...i,...i->...", p_v, q_v)
+    v = p_w[..., np.newaxis] * q_v + q_w[..., np.newaxis] * p_v + _cross_batch(p_v, q_v)
+    return np.concatenate([w[..., np.newaxis], v], axis=-1)
+
+
+def _rotate_batch(q: np.ndarray, v: np.ndarray, sign: float) -> np.ndarray:
+    """sign=1でq*v*q.conj()、sign=-1でq.conj()*v*qを計算し、クォータニオンの大きさで正規化する"""
+    w = q[..., 0:1]
+    u = q[..., 1:] * sign
+    u_dot_v = np.einsum("...i,...i->...", u, v)[..., np.newaxis]
+    u_dot_u = np.einsum("...i,...i->...", u, u)[..., np.newaxis]
+    rotated = (w**2 - u_dot_u) * v + 2 * u_dot_v * u + 2 * w * _cross_batch(u, v)
+    return rotated / (w**2 + u_dot_u)
+
+
+def inertial_to_body_batch(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """慣性系から剛体系への座標変換をまとめて行う
+
+    Args:
+        q (np.ndarray): (w, x, y, z)の順に並べたクォータニオンの配列(N, 4)
+        v (np.ndarray): 慣性系でのベクトルの配列(N, 3)
+
+    Returns:
+        np.ndarray: 剛体系でのベクトルの配列(N, 3)
+    """
+    return _rotate_batch(q, v, -1.0)
+
+
+def body_to_inertial_batch(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """剛体系から慣性系への座標変換をまとめて行う
+
+    Args:
+        q (np.ndarray): (w, x, y, z)の順に並べたクォータニオンの配列(N, 4)
+        v (np.ndarray): 剛体系でのベクトルの配列(N, 3)
+
+    Returns:
+        np.ndarray: 慣性系でのベクトルの配列(N, 3)
+    """
+    return _rotate_batch(q, v, 1.0)
+
+
+def quaternion_derivative_batch(q: np.ndarray, angular_velocity: np.ndarray) -> np.ndarray:
+    """クォータニオンの時間微分をまとめて計算する
+
+    Args:
+        q (np.ndarray): (w, x, y, z)の順に並べたクォータニオンの配列(N, 4)
+        angular_velocity (np.ndarray): 剛体系での角速度の配列(N, 3)
+
+    Returns:
+        np.ndarray: クォータニオンの時間微分の配列(N, 4)
+    """
+    w = q[..., 0]
+    u = q[..., 1:]
+    dw = -0.5 * np.einsum("...i,...i->...", u, angular_velocity)
+    du = 0.5 * (w[..., np.newaxis] * angular_velocity + _cross_batch(u, angular_velocity))
+    return np.concatenate([dw[..., np.newaxis], du], axis=-1)
+
+
+def from_euler_angle_batch(
+    elevation: np.ndarray,
+    azimuth: np.ndarray,
+    roll: np.ndarray,
+) -> np.ndarray:
+    """オイラー角の配列からクォータニオンの配列を生成する
+
+    Args:
+        elevation (np.ndarray): 仰角[deg]の配列(N,)
+        azimuth (np.ndarray): 方位角[deg]の配列(N,)
+        roll (np.ndarray): ロール角[deg]の配列(N,)
+
+    Returns:
+        np.ndarray: (w, x, y, z)の順に並べたクォータニオンの配列(N, 4)
+    """
+    elevation, azimuth, roll = np.broadcast_arrays(
+        np.asarray(elevation, dtype=float),
+        np.asarray(azimuth, dtype=float),
+        np.asarray(roll, dtype=float),
+    )
+    max_elevation = 90
+    max_azimuth = 360
+    max_roll = 360
+    if not np.all((elevation >= 0) & (elevation <= max_elevation)):
+        err_msg = f"仰角は0から{max_elevation}の範囲内である必要があります"
+        raise ValueError(err_msg)
+    if not np.all((azimuth >= 0) & (azimuth <= max_azimuth)):
+        err_msg = f"方位角は0から{max_azimuth}の範囲内である必要があります"
+        raise ValueError(err_msg)
+    if not np.all((roll >= 0) & (roll <= max_roll)):
+        err_msg = f"ロール角は0から{max_roll}の範囲内である必要があります"
+        raise ValueError(err_msg)
+    zeros = np.zeros_like(elevation)
+    half_elevation = np.deg2rad(elevation) / 2
+    half_azimuth = np.deg2rad(azimuth) / 2
+    half_roll = np.deg2rad(roll) / 2
+    azimuth_rotate = np.stack([np.cos(half_azimuth), zeros, zeros, np.sin(half_azimuth)], axis=-1)
+    elevation_rotate = np.stack([np.cos(half_elevation), zeros, np.sin(half_elevation), zeros], axis=-1)
+    roll_rotate = np.stack([np.cos(half_roll), np.sin(half_roll), zeros, zeros], axis=-1)
+    return multiply_batch(multiply_batch(azimuth_rotate, elevation_rotate), roll_rotate)
+
+
+def sum_vector_inertial_frame_batch(
+    vectors_body_frame: list[np.ndarray],
+    vectors_inertial_frame: list[np.ndarray],
+    posture: np.ndarray,
+) -> np.ndarray:
+    """剛体座標系でのベクトルと慣性座標系でのベクトルの配列を合成して慣性座標系でのベクトルの配列を返す
+
+    Args:
+        vectors_body_frame (list[np.ndarray]): 機体座標系でのベクトルの配列(N, 3)のリスト
+        vectors_inertial_frame (list[np.ndarray]): 慣性系でのベクトルの配列(N, 3)のリスト
+        posture (np.ndarray): 機体の姿勢の配列(N, 4)
+
+    Returns:
+        np.ndarray: 慣性系でのベクトルの和の配列(N, 3)
+    """
+    vectors_body_frame_sum = np.sum(vectors_body_frame, axis=0)
+    vectors_inertial_frame_sum = np.sum(vectors_inertial_frame, axis=0)
+    return vectors_inertial_frame_sum + body_to_inertial_batch(posture, vectors_body_frame_sum)
+
+
+def sum_vector_body_frame_batch(
+    vectors_body_frame: list[np.ndarray],
+    vectors_inertial_frame: list[np.ndarray],
+    posture: np.ndarray,
+) -> np.ndarray:
+    """慣性座標系でのベクトルと機体座標系でのベクトルの配列を合成して機体座標系でのベクトルの配列を返す
+
+    Args:
+        vectors_body_frame (list[np.ndarray]): 機体座標系でのベクトルの配列(N, 3)のリスト
+        vectors_inertial_frame (list[np.ndarray]): 慣性系でのベクトルの配列(N, 3)のリスト
+        posture (np.ndarray): 機体の姿勢の配列(N, 4)
+
+    Returns:
+        np.ndarray: 機体座標系でのベクトルの和の配列(N, 3)
+    """
+    vectors_body_frame_sum = np.sum(vectors_body_frame, axis=0)
+    vectors_inertial_frame_sum = np.sum(vectors_inertial_frame, axis=0)
+    return vectors_body_frame_sum + inertial_to_body_batch(posture, vectors_inertial_frame_sum)
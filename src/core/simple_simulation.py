@@ -1,13 +1,20 @@
+import copy
 import typing
+from collections.abc import Collection
 
 import numpy as np
+import quaternion
 
-from . import air_force, equation_of_motion, ode_solver, quaternion_util, simulation_result
+from . import air_force, equation_of_motion, flight_event, ode_solver, quaternion_util, simulation_result
 from .config import Config
+from .flight_summary import SUMMARY_OUTPUTS, FlightSummary
 from .rocket_state import RocketState
 from .simulation_context import SimulationContext
 
-Gravitational_acceleration = np.array([0, 0, 9.8])
+Gravitational_acceleration = np.array([0, 0, air_force.GRAVITATIONAL_ACCELERATION])
+
+TimeStep = float | typing.Callable[[float, RocketState], float]
+"""固定の時間刻み、または時刻と状態から次のステップの時間刻みを求める関数"""
 
 
 def to_simulation_result_row(
@@ -30,21 +37,98 @@ def to_simulation_result_row(
     )
 
 
+def to_simulation_result(
+    rows: list[tuple[float, RocketState]],
+    context: SimulationContext,
+    *,
+    parachute_on: bool,
+    on_launcher: bool,
+) -> simulation_result.SimulationResult:
+    """積分結果の全ての行について記録する値を配列演算でまとめて計算する
+
+    Args:
+        rows (list[tuple[float, RocketState]]): 時刻と状態のリスト
+        context (SimulationContext): ロケットの設定
+        parachute_on (bool): パラシュートが開いているか否か
+        on_launcher (bool): ランチャー上にあるかどうか
+
+    Returns:
+        simulation_result.SimulationResult: シミュレーション結果
+    """
+    time = np.array([t for t, _ in rows])
+    states = [state for _, state in rows]
+    position = np.array([state.position for state in states])
+    velocity = np.array([state.velocity for state in states])
+    posture = quaternion.as_float_array([state.posture for state in states])
+    air_force_result = air_force.calculate_batch(position, velocity, posture, context, parachute_on=parachute_on)
+    thrust = context.thrust_batch(time)
+    force = air_force_result.force.copy()
+    force[:, 0] += thrust
+    gravity_body_frame = quaternion_util.inertial_to_body_batch(
+        posture,
+        np.broadcast_to(Gravitational_acceleration, position.shape),
+    )
+    acceleration_body_frame = force / context.mass_batch(time)[:, np.newaxis] + gravity_body_frame
+    if on_launcher:
+        # ランチャー上ではレール方向にしか加速しない
+        acceleration_body_frame[:, 0] = np.maximum(0, acceleration_body_frame[:, 0])
+        acceleration_body_frame[:, 1:] = 0
+    result = simulation_result.SimulationResult.from_batch(
+        time,
+        states,
+        thrust,
+        acceleration_body_frame,
+        air_force_result,
+        on_launcher=on_launcher,
+    )
+    burning = thrust > simulation_result.THRUST_THRESHOLD
+    burnout = np.flatnonzero(burning[:-1] & ~burning[1:])
+    if len(burnout) > 0:
+        i = burnout[0]
+        result.events.append(
+            flight_event.find_event(
+                flight_event.BURNOUT,
+                rows[i],
+                rows[i + 1],
+                flight_event.burnout_function(context.thrust, simulation_result.THRUST_THRESHOLD),
+            ),
+        )
+    return result
+
+
+def end_event(
+    name: str,
+    rows: list[tuple[float, RocketState]],
+    function: typing.Callable[[float, RocketState], float],
+) -> flight_event.FlightEvent:
+    """終了条件を満たした最後のステップとその前のステップの間でイベントの時刻を求める
+
+    Args:
+        name (str): イベント名
+        rows (list[tuple[float, RocketState]]): 時刻と状態のリスト
+        function (typing.Callable[[float, RocketState], float]): イベント後に正となる関数
+
+    Returns:
+        flight_event.FlightEvent: イベント
+    """
+    if len(rows) < 2:  # noqa: PLR2004
+        return flight_event.FlightEvent(name, *rows[-1])
+    return flight_event.find_event(name, rows[-2], rows[-1], function)
+
+
 def acceleration_inertial_frame(
     t: float,
     state: RocketState,
     context: SimulationContext,
     *,
     parachute_on: bool,
+    air_force_result: air_force.AirForceResult | None = None,
 ) -> np.ndarray:
-    air_force_result = air_force.calculate(state, context, t, parachute_on=parachute_on)
-    thrust = np.array([context.thrust(t), 0, 0])
-    force = quaternion_util.sum_vector_inertial_frame(
-        [air_force_result.force, thrust],
-        [np.zeros(3)],
-        state.posture,
-    )
-    return force / context.mass(t) + Gravitational_acceleration
+    if air_force_result is None:
+        air_force_result = air_force.calculate(state, context, t, parachute_on=parachute_on)
+    force = air_force_result.force.copy()
+    force[0] += context.thrust(t)
+    return quaternion_util.body_to_inertial(state.posture, force) / context.mass(t) + Gravitational_acceleration
 
 
 def angular_acceleration(
@@ -59,63 +143,360 @@ def angular_acceleration(
     )
 
 
-def simulate_launcher(
-    first_state: RocketState,
-    context: SimulationContext,
-    first_time: float,
-) -> simulation_result.SimulationResult:
-    """ランチャー上でのシミュレーションを行う
+def launcher_derivative(context: SimulationContext) -> typing.Callable[[float, RocketState], RocketState]:
+    """ランチャー上での状態の時間微分を計算する関数を生成する
 
     Args:
-        first_state (RocketState): 打ち上げ前のロケットの状態
         context (SimulationContext): ロケットの設定
-        first_time (float): 初期時刻
 
     Returns:
-        simulation_result.SimulationResult: シミュレーション結果
+        typing.Callable[[float, RocketState], RocketState]: 時刻と状態から時間微分を計算する関数
     """
 
-    def acceleration_body_frame(t: float, state: RocketState) -> np.ndarray:
+    def derivative(t: float, state: RocketState) -> RocketState:
         acceleration_body_frame_no_constraints = quaternion_util.inertial_to_body(
             state.posture,
             acceleration_inertial_frame(t, state, context, parachute_on=False),
         )
-        return np.array([max(0, acceleration_body_frame_no_constraints[0]), 0, 0])
-
-    def derivative(t: float, state: RocketState) -> RocketState:
+        # ランチャー上ではレール方向にしか加速しない
+        acceleration_body_frame = np.array([max(0, acceleration_body_frame_no_constraints[0]), 0, 0])
         actual_acceleration_inertial = quaternion_util.body_to_inertial(
             state.posture,
-            acceleration_body_frame(t, state),
+            acceleration_body_frame,
         )
         return RocketState.derivative(state, actual_acceleration_inertial, np.zeros(3))
 
-    def end_condition(_: float, state: RocketState) -> bool:
-        return np.linalg.norm(state.position, ord=2) > context.launcher_length
+    return derivative
+
+
+def rail_axis(posture: quaternion.quaternion) -> np.ndarray:
+    """ランチャーのレールの向き(慣性系での機軸方向の単位ベクトル)を求める"""
+    return quaternion_util.body_to_inertial(posture, np.array([1.0, 0.0, 0.0]))
+
+
+def rail_derivative(
+    context: SimulationContext,
+    posture: quaternion.quaternion,
+) -> typing.Callable[[float, np.ndarray], np.ndarray]:
+    """ランチャー上での(レールに沿った距離, 速さ)の時間微分を計算する関数を生成する
+
+    ランチャー上では姿勢が変わらず、レール方向にしか加速しないため、
+    推力、軸力、重力のレール方向の成分だけから1次元の運動を解く。
+
+    Args:
+        context (SimulationContext): ロケットの設定
+        posture (quaternion.quaternion): ランチャー上での姿勢
+
+    Returns:
+        typing.Callable[[float, np.ndarray], np.ndarray]: 時刻と(距離, 速さ)から時間微分を計算する関数
+    """
+    axis = rail_axis(posture)
+    gravity_along_rail = float(axis @ Gravitational_acceleration)
+
+    def derivative(t: float, rail_state: np.ndarray) -> np.ndarray:
+        distance, speed = rail_state.tolist()
+        altitude = -distance * float(axis[2])
+        velocity_air_body_frame = quaternion_util.inertial_to_body(posture, speed * axis - context.wind(altitude))
+        ca, _ = air_force.aerodynamic_coefficients(
+            velocity_air_body_frame,
+            air_force.angle_of_attack(velocity_air_body_frame),
+            altitude,
+            context,
+        )
+        axial = -air_force.dynamic_pressure(velocity_air_body_frame, context.atmosphere.density(altitude)) * (
+            context.body_area * ca
+        )
+        acceleration = (axial + context.thrust(t)) / context.mass(t) + gravity_along_rail
+        return np.array([speed, max(0.0, acceleration)])
+
+    return derivative
+
+
+def rail_to_rocket_state(rail_state: np.ndarray, axis: np.ndarray, posture: quaternion.quaternion) -> RocketState:
+    """(レールに沿った距離, 速さ)から6自由度の状態を復元する
+
+    Args:
+        rail_state (np.ndarray): (レールに沿った距離, 速さ)
+        axis (np.ndarray): レールの向き
+        posture (quaternion.quaternion): ランチャー上での姿勢
+
+    Returns:
+        RocketState: ロケットの状態
+    """
+    distance, speed = rail_state.tolist()
+    return RocketState(distance * axis, speed * axis, posture, np.zeros(3))
+
+
+def integrate_rail(
+    first_state: RocketState,
+    context: SimulationContext,
+    first_time: float,
+    *,
+    record: bool = True,
+    observer: typing.Callable[[float, RocketState], None] | None = None,
+) -> list[tuple[float, np.ndarray]]:
+    """ランチャー上の運動をレールに沿った1次元の運動として解く
+
+    Args:
+        first_state (RocketState): ランチャー上のロケットの状態
+        context (SimulationContext): ロケットの設定
+        first_time (float): 初期時刻
+        record (bool): 全ステップを返すか(Falseの場合は最後のステップだけを返す)
+        observer (typing.Callable[[float, RocketState], None] | None): record=Falseの場合に
+            各ステップの時刻と状態を受け取る関数
+
+    Returns:
+        list[tuple[float, np.ndarray]]: 時刻と(距離, 速さ)のリスト
+    """
+    posture = first_state.posture
+    axis = rail_axis(posture)
+    rail_state = np.array([float(first_state.position @ axis), float(first_state.velocity @ axis)])
+
+    def end_condition(_: float, state: np.ndarray) -> bool:
+        return state[0] > context.launcher_length
+
+    derivative = rail_derivative(context, posture)
+    if record:
+        return ode_solver.runge_kutta4(derivative, rail_state, first_time, context.launcher_dt, end_condition)
+    rail_observer = None
+    if observer is not None:
+
+        def rail_observer(t: float, state: np.ndarray) -> None:
+            observer(t, rail_to_rocket_state(state, axis, posture))
+
+    return [
+        ode_solver.runge_kutta4_last(
+            derivative,
+            rail_state,
+            first_time,
+            context.launcher_dt,
+            end_condition,
+            observer=rail_observer,
+        ),
+    ]
+
+
+def flight_derivative(
+    context: SimulationContext,
+    *,
+    parachute_on: bool,
+) -> typing.Callable[[float, RocketState], RocketState]:
+    """飛行中の状態の時間微分を計算する関数を生成する
+
+    Args:
+        context (SimulationContext): ロケットの設定
+        parachute_on (bool): パラシュートが開いているか否か
+
+    Returns:
+        typing.Callable[[float, RocketState], RocketState]: 時刻と状態から時間微分を計算する関数
+    """
+
+    def derivative(t: float, state: RocketState) -> RocketState:
+        # 空気力の計算
+        air_force_result = air_force.calculate(state, context, t, parachute_on=parachute_on)
+        # 加速度の計算
+        acceleration_ = acceleration_inertial_frame(
+            t,
+            state,
+            context,
+            parachute_on=parachute_on,
+            air_force_result=air_force_result,
+        )
+        angular_acceleration_ = angular_acceleration(
+            air_force_result,
+            context,
+            state,
+        )
+        return RocketState.derivative(state, acceleration_, angular_acceleration_)
+
+    return derivative
+
+
+def point_mass_derivative(context: SimulationContext) -> typing.Callable[[float, RocketState], RocketState]:
+    """パラシュート下降中の3自由度の質点モデルでの状態の時間微分を計算する関数を生成する
+
+    パラシュート下降中は姿勢の運動が着地点にほとんど影響しないため、
+    機体の空気力とモーメントを無視し、パラシュートの抗力(終端速度から求める)と重力だけで並進運動を解く。
+    姿勢と角速度は開傘時の値のまま変化させない。
+
+    Args:
+        context (SimulationContext): ロケットの設定
+
+    Returns:
+        typing.Callable[[float, RocketState], RocketState]: 時刻と状態から時間微分を計算する関数
+    """
+    no_rotation = quaternion.quaternion(0, 0, 0, 0)
+    no_angular_acceleration = np.zeros(3)
+
+    def derivative(t: float, state: RocketState) -> RocketState:
+        velocity_air = state.velocity - context.wind(-state.position[2])
+        # 抗力は対気速度と逆向きで座標系によらないため慣性系で計算する
+        drag = air_force.parachute_force(velocity_air, context.parachute_terminal_velocity, context.mass(100))
+        return RocketState(
+            state.velocity,
+            drag / context.mass(t) + Gravitational_acceleration,
+            no_rotation,
+            no_angular_acceleration,
+        )
+
+    return derivative
+
+
+def point_mass_time_step(context: SimulationContext) -> typing.Callable[[float, RocketState], float]:
+    """質点モデルで安定に解ける時間刻みを求める関数を生成する
+
+    抗力は対気速度の2乗に比例するため、対気速度が大きい開傘直後ほど速度の変化の時定数
+    終端速度^2 / (2 * 重力加速度 * 対気速度)が短くなる。
+    時間刻みはparachute_descent_dtとこの時定数の小さい方とする。
+
+    Args:
+        context (SimulationContext): ロケットの設定
+
+    Returns:
+        typing.Callable[[float, RocketState], float]: 時刻と状態から時間刻みを求める関数
+    """
+    max_dt = typing.cast("float", context.parachute_descent_dt)
+    scale = context.parachute_terminal_velocity**2 / (2 * air_force.GRAVITATIONAL_ACCELERATION)
+
+    def time_step(_: float, state: RocketState) -> float:
+        airspeed = float(np.linalg.norm(state.velocity - context.wind(-state.position[2]), ord=2))
+        if airspeed * max_dt <= scale:
+            return max_dt
+        return max(scale / airspeed, context.dt)
+
+    return time_step
+
+
+def rise_time_step(context: SimulationContext) -> TimeStep:
+    """上昇中の時間刻みを求める
 
-    result = ode_solver.runge_kutta4(
-        derivative,
+    燃焼中はburn_dt、燃焼終了後はcoast_dtとする。刻みが等しい場合は固定の刻みとする。
+    """
+    if context.burn_dt == context.coast_dt:
+        return context.burn_dt
+
+    def time_step(t: float, _: RocketState) -> float:
+        return context.burn_dt if t < context.burnout_time else context.coast_dt
+
+    return time_step
+
+
+def integrate_fall(
+    context: SimulationContext,
+    first_state: RocketState,
+    first_time: float,
+    end_condition: typing.Callable[[float, RocketState], bool],
+    *,
+    parachute_on: bool,
+    time_step: TimeStep | None = None,
+) -> list[tuple[float, RocketState]]:
+    """飛行中の区間を解く
+
+    パラシュートが開いていてparachute_descent_dtが設定されている場合は質点モデルを用い、
+    それ以外は6自由度のモデルをtime_stepの刻みで解く。
+
+    Args:
+        context (SimulationContext): ロケットの設定
+        first_state (RocketState): 初期状態
+        first_time (float): 初期時刻
+        end_condition (typing.Callable[[float, RocketState], bool]): 終了条件
+        parachute_on (bool): パラシュートが開いているか否か
+        time_step (TimeStep | None): 6自由度のモデルの時間刻み(Noneの場合はdescent_dt)
+
+    Returns:
+        list[tuple[float, RocketState]]: 時刻と状態のリスト
+    """
+    if parachute_on and context.parachute_descent_dt is not None:
+        return ode_solver.runge_kutta4_variable(
+            point_mass_derivative(context),
+            first_state,
+            first_time,
+            point_mass_time_step(context),
+            end_condition,
+        )
+    time_step = context.descent_dt if time_step is None else time_step
+    if callable(time_step):
+        return ode_solver.runge_kutta4_variable(
+            flight_derivative(context, parachute_on=parachute_on),
+            first_state,
+            first_time,
+            time_step,
+            end_condition,
+        )
+    return ode_solver.runge_kutta4(
+        flight_derivative(context, parachute_on=parachute_on),
         first_state,
         first_time,
-        context.dt,
+        time_step,
         end_condition,
     )
 
-    result = (
-        to_simulation_result_row(
-            *row,
-            context,
-            acceleration_body_frame(*row),
-            on_launcher=True,
-        )
-        for row in result
+
+def launcher_end_condition(context: SimulationContext) -> typing.Callable[[float, RocketState], bool]:
+    """ランチャーを離れたら終了する条件を生成する"""
+
+    def end_condition(_: float, state: RocketState) -> bool:
+        return np.linalg.norm(state.position, ord=2) > context.launcher_length
+
+    return end_condition
+
+
+def rise_end_condition(_: float, state: RocketState) -> bool:
+    """下降を始めたら終了する条件"""
+    return state.velocity[2] > 0
+
+
+def parachute_delay_end_condition(
+    time_fall_start: float,
+    delay_time: float,
+) -> typing.Callable[[float, RocketState], bool]:
+    """最高高度到達から開傘までの時間が経過したら終了する条件を生成する"""
+
+    def end_condition(t: float, _: RocketState) -> bool:
+        return t > time_fall_start + delay_time
+
+    return end_condition
+
+
+def fall_end_condition(_: float, state: RocketState) -> bool:
+    """着地したら終了する条件"""
+    return state.position[2] > 0
+
+
+def simulate_launcher(
+    first_state: RocketState,
+    context: SimulationContext,
+    first_time: float,
+) -> simulation_result.SimulationResult:
+    """ランチャー上でのシミュレーションを行う
+
+    Args:
+        first_state (RocketState): 打ち上げ前のロケットの状態
+        context (SimulationContext): ロケットの設定
+        first_time (float): 初期時刻
+
+    Returns:
+        simulation_result.SimulationResult: シミュレーション結果
+    """
+    axis = rail_axis(first_state.posture)
+    # 6自由度の状態は記録する行だけ復元する
+    result = [
+        (t, rail_to_rocket_state(rail_state, axis, first_state.posture))
+        for t, rail_state in integrate_rail(first_state, context, first_time)
+    ]
+    launcher_result = to_simulation_result(result, context, parachute_on=False, on_launcher=True)
+    launcher_result.events.append(
+        end_event(flight_event.LAUNCH_CLEAR, result, flight_event.launch_clear_function(context.launcher_length)),
     )
-    return simulation_result.SimulationResult(list(result))
+    return launcher_result
 
 
 def simulate_flight(
     end_condition: typing.Callable[[float, RocketState], bool],
     *,
     parachute_on: bool,
+    time_step: typing.Callable[[SimulationContext], TimeStep],
+    event: tuple[str, typing.Callable[[float, RocketState], float]] | None = None,
 ) -> typing.Callable[
     [RocketState, SimulationContext, float],
     simulation_result.SimulationResult,
@@ -125,6 +506,9 @@ def simulate_flight(
     Args:
         end_condition (typing.Callable[[float, RocketState], bool]): 終了条件
         parachute_on (bool): パラシュートが開いているか否か
+        time_step (typing.Callable[[SimulationContext], TimeStep]): コンテキストからこの区間の時間刻みを求める関数
+        event (tuple[str, typing.Callable[[float, RocketState], float]] | None):
+            終了時に記録するイベント名と、イベント後に正となる関数
 
     Returns:
         typing.Callable[[RocketState, SimulationContext, float], simulation_result.SimulationResult]:
@@ -136,43 +520,34 @@ def simulate_flight(
         context: SimulationContext,
         first_time: float,
     ) -> simulation_result.SimulationResult:
-        def derivative(t: float, state: RocketState) -> RocketState:
-            # 空気力の計算
-            air_force_result = air_force.calculate(state, context, t, parachute_on=parachute_on)
-            # 加速度の計算
-            acceleration_ = acceleration_inertial_frame(t, state, context, parachute_on=parachute_on)
-            angular_acceleration_ = angular_acceleration(
-                air_force_result,
-                context,
-                state,
-            )
-            return RocketState.derivative(state, acceleration_, angular_acceleration_)
-
-        result = ode_solver.runge_kutta4(
-            derivative,
+        result = integrate_fall(
+            context,
             first_state,
             first_time,
-            context.dt,
             end_condition,
+            parachute_on=parachute_on,
+            time_step=time_step(context),
         )
-        result = (
-            to_simulation_result_row(
-                *row,
-                context,
-                quaternion_util.inertial_to_body(
-                    row[1].posture,
-                    acceleration_inertial_frame(row[0], row[1], context, parachute_on=parachute_on),
-                ),
-                on_launcher=False,
+        phase_result = to_simulation_result(result, context, parachute_on=parachute_on, on_launcher=False)
+        if parachute_on:
+            # パラシュートはこの区間の開始時に開く
+            phase_result.events.insert(
+                0,
+                flight_event.FlightEvent(flight_event.PARACHUTE_DEPLOY, first_time, first_state),
             )
-            for row in result
-        )
-        return simulation_result.SimulationResult(list(result))
+        if event is not None:
+            phase_result.events.append(end_event(event[0], result, event[1]))
+        return phase_result
 
     return body
 
 
-simulate_on_rise = simulate_flight(lambda _, state: state.velocity[2] > 0, parachute_on=False)
+simulate_on_rise = simulate_flight(
+    rise_end_condition,
+    parachute_on=False,
+    time_step=rise_time_step,
+    event=(flight_event.APOGEE, flight_event.apogee_function),
+)
 
 
 def simulate_waiting_parachute_delay(
@@ -182,10 +557,11 @@ def simulate_waiting_parachute_delay(
     [RocketState, SimulationContext, float],
     simulation_result.SimulationResult,
 ]:
-    def end_condition(t: float, _: RocketState) -> bool:
-        return t > time_fall_start + delay_time
-
-    return simulate_flight(end_condition, parachute_on=False)
+    return simulate_flight(
+        parachute_delay_end_condition(time_fall_start, delay_time),
+        parachute_on=False,
+        time_step=lambda context: context.parachute_delay_dt,
+    )
 
 
 def simulate_fall(
@@ -195,10 +571,29 @@ def simulate_fall(
     [RocketState, SimulationContext, float],
     simulation_result.SimulationResult,
 ]:
-    def end_condition(_: float, state: RocketState) -> bool:
-        return state.position[2] > 0
+    return simulate_flight(
+        fall_end_condition,
+        parachute_on=parachute_on,
+        time_step=lambda context: context.descent_dt,
+        event=(flight_event.LANDING, flight_event.landing_function),
+    )
+
 
-    return simulate_flight(end_condition, parachute_on=parachute_on)
+def initial_state(context: SimulationContext) -> RocketState:
+    """打ち上げ前のロケットの状態を作成する
+
+    Args:
+        context (SimulationContext): ロケットの設定
+
+    Returns:
+        RocketState: 打ち上げ前のロケットの状態
+    """
+    first_posture = quaternion_util.from_euler_angle(
+        context.first_elevation,
+        context.first_azimuth,
+        context.first_roll,
+    )
+    return RocketState(np.zeros(3), np.zeros(3), first_posture, np.zeros(3))
 
 
 def simulate(
@@ -214,13 +609,24 @@ def simulate(
         tuple[simulation_result.SimulationResult, simulation_result.SimulationResult]:
             [パラシュートが開かなかった場合, パラシュートが開いた場合]
     """
-    context = SimulationContext(config)
-    first_posture = quaternion_util.from_euler_angle(
-        context.first_elevation,
-        context.first_azimuth,
-        context.first_roll,
-    )
-    first_state = RocketState(np.zeros(3), np.zeros(3), first_posture, np.zeros(3))
+    return simulate_context(SimulationContext(config))
+
+
+def simulate_context(
+    context: SimulationContext,
+) -> tuple[simulation_result.SimulationResult, simulation_result.SimulationResult]:
+    """作成済みのSimulationContextで全体のシミュレーションを行う
+
+    表をDataFrameから読み込み直さないため、並列計算のワーカーなどpandasを読み込まない環境でも計算できる。
+
+    Args:
+        context (SimulationContext): ロケットの設定
+
+    Returns:
+        tuple[simulation_result.SimulationResult, simulation_result.SimulationResult]:
+            [パラシュートが開かなかった場合, パラシュートが開いた場合]
+    """
+    first_state = initial_state(context)
     result_launcher = simulate_launcher(first_state, context, 0)
     last = result_launcher.last()
     first_state = last.to_rocket_state()
@@ -242,3 +648,227 @@ def simulate(
     result_parachute_on = result_common.deepcopy().join(result_fall_parachute_on)
     result_parachute_off = result_common.join(result_fall_parachute_off)
     return result_parachute_off, result_parachute_on
+
+
+class _SummaryRecorder:
+    """各ステップの状態から最大動圧と最高高度だけを記録する"""
+
+    def __init__(self, context: SimulationContext, outputs: Collection[str]) -> None:
+        self.context = context
+        self.record_dynamic_pressure = "max_dynamic_pressure" in outputs
+        self.record_apogee = "apogee" in outputs
+        self.max_dynamic_pressure = 0.0
+        self.apogee_time: float | None = None
+        self.apogee_position: np.ndarray | None = None
+
+    def observe(self, t: float, state: RocketState) -> None:
+        if self.record_dynamic_pressure:
+            # 動圧は座標系によらないため慣性系の対気速度から計算する
+            altitude = -state.position[2]
+            velocity_air = state.velocity - self.context.wind(altitude)
+            self.max_dynamic_pressure = max(
+                self.max_dynamic_pressure,
+                air_force.dynamic_pressure(velocity_air, self.context.atmosphere.density(altitude)),
+            )
+        if self.record_apogee and (self.apogee_position is None or state.position[2] < self.apogee_position[2]):
+            self.apogee_time = t
+            self.apogee_position = state.position
+
+    def observer(self) -> typing.Callable[[float, RocketState], None] | None:
+        if self.record_dynamic_pressure or self.record_apogee:
+            return self.observe
+        return None
+
+    def summary(self, landing_time: float, landing_state: RocketState) -> FlightSummary:
+        return FlightSummary(
+            landing_time=landing_time,
+            landing_position=landing_state.position,
+            apogee_time=self.apogee_time,
+            apogee_position=self.apogee_position,
+            max_dynamic_pressure=float(self.max_dynamic_pressure) if self.record_dynamic_pressure else None,
+        )
+
+
+def simulate_landing(
+    config: Config,
+    outputs: Collection[str] = SUMMARY_OUTPUTS,
+) -> tuple[FlightSummary, FlightSummary]:
+    """軌道を記録せずに着地点などの要約だけを求める
+
+    simulateと同じ計算を行うが、各ステップの状態は保存しないため
+    使用するメモリは飛行時間によらない。
+
+    Args:
+        config (Config): ロケットの設定
+        outputs (Collection[str]): 記録する量(SUMMARY_OUTPUTSの部分集合)
+
+    Returns:
+        tuple[FlightSummary, FlightSummary]: [パラシュートが開かなかった場合, パラシュートが開いた場合]
+
+    Raises:
+        ValueError: 記録できない量が指定された場合
+    """
+    context = SimulationContext(config)
+    return predict_landing(context, 0, initial_state(context), outputs=outputs, fast=False)
+
+
+def _fall_last(
+    context: SimulationContext,
+    time: float,
+    state: RocketState,
+    *,
+    parachute_on: bool,
+    observer: typing.Callable[[float, RocketState], None] | None,
+) -> tuple[float, RocketState]:
+    """軌道を記録せずに着地まで解き、着地の時刻と状態を求める"""
+    if not parachute_on or context.parachute_descent_dt is None:
+        return ode_solver.runge_kutta4_last(
+            flight_derivative(context, parachute_on=parachute_on),
+            state,
+            time,
+            context.descent_dt,
+            fall_end_condition,
+            observer=observer,
+        )
+    # 時間刻みが大きいため最後のステップではなくステップ間で補間した着地の時刻と状態を用いる
+    rows = integrate_fall(context, state, time, fall_end_condition, parachute_on=parachute_on)
+    if observer is not None:
+        for row in rows:
+            observer(*row)
+    landing = end_event(flight_event.LANDING, rows, flight_event.landing_function)
+    return landing.time, landing.state
+
+
+FAST_STEP_SCALE = 5
+"""predict_landingのfastで燃焼終了後の6自由度のモデルの時間刻みをdtの何倍以上にするか"""
+FAST_PARACHUTE_DESCENT_DT = 1.0
+"""predict_landingのfastでparachute_descent_dtが未設定の場合のパラシュート下降の質点モデルの最大の時間刻み[s]"""
+
+
+def fast_context(context: SimulationContext) -> SimulationContext:
+    """着地点の予測を速くするために燃焼終了後の時間刻みを粗くしたコンテキストを作成する
+
+    燃焼終了後の6自由度のモデルの時間刻みをdtのFAST_STEP_SCALE倍以上とし、
+    パラシュート下降は質点モデル(parachute_descent_dtが未設定の場合はFAST_PARACHUTE_DESCENT_DT)で解く。
+    燃焼中とランチャー上の時間刻みは変えない。
+
+    Args:
+        context (SimulationContext): ロケットの設定(書き換えない)
+
+    Returns:
+        SimulationContext: 時間刻みを粗くしたコピー
+    """
+    fast = copy.copy(context)
+    min_dt = FAST_STEP_SCALE * context.dt
+    fast.coast_dt = max(context.coast_dt, min_dt)
+    fast.parachute_delay_dt = max(context.parachute_delay_dt, min_dt)
+    fast.descent_dt = max(context.descent_dt, min_dt)
+    if fast.parachute_descent_dt is None:
+        fast.parachute_descent_dt = FAST_PARACHUTE_DESCENT_DT
+    return fast
+
+
+def estimate_apogee_time(time: float, state: RocketState) -> float:
+    """下降中の状態から最高高度に達した時刻を推定する
+
+    最高高度からの下降は空気抵抗を無視した自由落下とみなす。
+
+    Args:
+        time (float): 時刻
+        state (RocketState): 下降中のロケットの状態
+
+    Returns:
+        float: 最高高度に達した時刻
+    """
+    return time - max(float(state.velocity[2]), 0.0) / air_force.GRAVITATIONAL_ACCELERATION
+
+
+def predict_landing(
+    context: SimulationContext,
+    time: float,
+    state: RocketState,
+    *,
+    apogee_time: float | None = None,
+    outputs: Collection[str] = SUMMARY_OUTPUTS,
+    fast: bool = True,
+) -> tuple[FlightSummary, FlightSummary]:
+    """任意の時刻と状態から飛行を続けて着地点などの要約を求める
+
+    状態からランチャー上、上昇中(燃焼中と慣性飛行は推力の時刻で区別される)、
+    最高高度到達後の開傘待ち、下降中のどの区間にあるかを判定し、その区間から計算を続ける。
+    SimulationContextを使い回せるため、テレメトリを受信するたびに着地点を予測し直すことができる。
+    fastの場合はfast_contextの粗い時間刻みで解く。サンプルの設定では1回の予測が燃焼終了後の時刻から
+    50ms以下(fastでない場合の10分の1以下)となり、着地点の差は2m程度となる。
+    fastでない場合にsimulateの途中のステップの時刻と状態を与えると、simulate_landingと同じ結果となる。
+
+    Args:
+        context (SimulationContext): ロケットの設定
+        time (float): 時刻
+        state (RocketState): ロケットの状態
+        apogee_time (float | None): 下降中の場合の最高高度に達した時刻
+            (Noneの場合はestimate_apogee_timeで推定する。上昇中の場合は用いない)
+        outputs (Collection[str]): 記録する量(SUMMARY_OUTPUTSの部分集合)。
+            ランチクリア時の量はランチャー上から、最高高度は上昇中から始めた場合のみ記録する
+        fast (bool): 時間刻みを粗くして速く予測するか
+
+    Returns:
+        tuple[FlightSummary, FlightSummary]: [パラシュートが開かなかった場合, パラシュートが開いた場合]
+
+    Raises:
+        ValueError: 記録できない量が指定された場合
+    """
+    unknown = set(outputs) - set(SUMMARY_OUTPUTS)
+    if unknown:
+        err_msg = f"記録できない量が指定されました: {sorted(unknown)}"
+        raise ValueError(err_msg)
+    if fast:
+        context = fast_context(context)
+    rising = state.velocity[2] <= 0
+    if not rising:
+        # 最高高度は開始時点より前にあるため記録しない
+        outputs = set(outputs) - {"apogee"}
+    recorder = _SummaryRecorder(context, outputs)
+    observer = recorder.observer()
+    t = time
+    launch_clear_velocity = None
+    launch_clear_angle_of_attack = None
+    if rising and np.linalg.norm(state.position, ord=2) <= context.launcher_length:
+        [(t, rail_state)] = integrate_rail(state, context, t, record=False, observer=observer)
+        state = rail_to_rocket_state(rail_state, rail_axis(state.posture), state.posture)
+        if "launch_clear_velocity" in outputs:
+            launch_clear_velocity = float(np.linalg.norm(state.velocity, ord=2))
+        if "launch_clear_angle_of_attack" in outputs:
+            air_force_result = air_force.calculate(state, context, t, parachute_on=False)
+            launch_clear_angle_of_attack = float(air_force.angle_of_attack(air_force_result.velocity_air_body_frame))
+    if rising:
+        t, state = ode_solver.runge_kutta4_last(
+            flight_derivative(context, parachute_on=False),
+            state,
+            t,
+            rise_time_step(context),
+            rise_end_condition,
+            observer=observer,
+        )
+        apogee_time = t
+    elif apogee_time is None:
+        apogee_time = estimate_apogee_time(t, state)
+    # 開傘時刻を過ぎている場合はこの区間は0ステップで終わる
+    t, state = ode_solver.runge_kutta4_last(
+        flight_derivative(context, parachute_on=False),
+        state,
+        t,
+        context.parachute_delay_dt,
+        parachute_delay_end_condition(apogee_time, context.parachute_delay_time),
+        observer=observer,
+    )
+    summaries = []
+    for parachute_on in [False, True]:
+        branch = copy.copy(recorder)
+        landing_time, landing_state = _fall_last(
+            context, t, state, parachute_on=parachute_on, observer=branch.observer()
+        )
+        summary = branch.summary(landing_time, landing_state)
+        summary.launch_clear_velocity = launch_clear_velocity
+        summary.launch_clear_angle_of_attack = launch_clear_angle_of_attack
+        summaries.append(summary)
+    return summaries[0], summaries[1]
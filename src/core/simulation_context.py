@@ -3,23 +3,39 @@ import typing
 import numpy as np
 
 from . import gravity_center, interpolation, wind
-from .config import Config
+from .aerodynamic_table import AerodynamicTable
+from .atmosphere import AtmosphereTable
+from .config import Config, WindPowerLow
 from .inertia_tensor import InertiaTensor
+from .simulation_result import THRUST_THRESHOLD
+from .wind_profile import WindProfile
 
 
 class SimulationContext:
     mass: typing.Callable[[float], float]
     """時間->質量"""
+    mass_batch: typing.Callable[[np.ndarray], np.ndarray]
+    """時間の配列->質量の配列"""
     wind: typing.Callable[[float], np.ndarray]
     """高度->風速ベクトル"""
+    wind_power: WindPowerLow
+    """べき法則の風の設定(wind_profileを用いる場合も保持する)"""
+    wind_batch: typing.Callable[[np.ndarray], np.ndarray]
+    """高度の配列->風速ベクトルの配列"""
     thrust: typing.Callable[[float], float]
     """時間->推力"""
+    thrust_batch: typing.Callable[[np.ndarray], np.ndarray]
+    """時間の配列->推力の配列"""
     gravity_center: typing.Callable[[float], np.ndarray]
     """時間->重心位置"""
+    atmosphere: AtmosphereTable
+    """高度->気温、気圧、空気密度、音速"""
     CA: float
     """軸力係数"""
     CN_alpha: float
     """単位なす角あたりの法線力係数"""
+    aerodynamic_table: AerodynamicTable | None
+    """マッハ数と迎角->CA, CN(Noneの場合はCAとCN_alphaを用いる)"""
     body_area: float
     """断面積"""
     wind_center: np.ndarray
@@ -40,26 +56,78 @@ class SimulationContext:
     """パラシュートの終端速度"""
     parachute_delay_time: float
     """最高高度到達からパラシュート展開までの時間"""
+    launcher_dt: float
+    """ランチャー上の時間刻み"""
+    burn_dt: float
+    """燃焼中の時間刻み"""
+    coast_dt: float
+    """燃焼終了から最高高度までの時間刻み"""
+    parachute_delay_dt: float
+    """最高高度から開傘までの時間刻み"""
+    descent_dt: float
+    """開傘から着地までの6自由度のモデルの時間刻み"""
+    burnout_time: float
+    """推力の表で推力がTHRUST_THRESHOLD以下になる時刻"""
+    parachute_descent_dt: float | None
+    """パラシュート下降を質点モデルで計算する場合の時間刻み(Noneの場合は6自由度のモデルで計算する)"""
 
     def __init__(self, config: Config) -> None:
         self.mass = interpolation.df_to_function_1d(config.mass)
-        self.wind = wind.wind_velocity_power(
-            config.wind.reference_height,
-            config.wind.wind_speed,
-            config.wind.exponent,
-            config.wind.wind_direction,
-        )
+        self.mass_batch = interpolation.df_to_function_1d_batch(config.mass)
+        self.wind_power = config.wind
+        if config.wind_profile is None:
+            self.wind = wind.wind_velocity_power(
+                config.wind.reference_height,
+                config.wind.wind_speed,
+                config.wind.exponent,
+                config.wind.wind_direction,
+            )
+            self.wind_batch = wind.wind_velocity_power_batch(
+                config.wind.reference_height,
+                config.wind.wind_speed,
+                config.wind.exponent,
+                config.wind.wind_direction,
+            )
+        else:
+            profile = WindProfile.from_df(config.wind_profile).at_time(config.wind_profile_time)
+            self.wind = profile
+            self.wind_batch = profile.batch
         self.thrust = interpolation.df_to_function_1d(config.thrust)
+        self.thrust_batch = interpolation.df_to_function_1d_batch(config.thrust)
         self.gravity_center = gravity_center.create_gravity_center_function_from_dataframe(
             config.first_gravity_center,
             config.end_gravity_center,
             config.thrust,
         )
+        self.atmosphere = (
+            AtmosphereTable.standard()
+            if config.atmosphere is None
+            else AtmosphereTable.from_sounding(config.atmosphere)
+        )
         self.CA = config.CA
         self.CN_alpha = config.CN_alpha
+        self.aerodynamic_table = (
+            None if config.aerodynamic_table is None else AerodynamicTable.from_df(config.aerodynamic_table)
+        )
         self.body_area = config.body_area
         self.wind_center = config.wind_center
         self.dt = config.dt
+        schedule = config.dt_schedule
+        after_burnout_dt = (
+            config.dt if schedule.after_burnout_scale is None else config.dt * schedule.after_burnout_scale
+        )
+        self.launcher_dt = config.dt if schedule.launcher is None else schedule.launcher
+        self.burn_dt = config.dt if schedule.burn is None else schedule.burn
+        self.coast_dt = after_burnout_dt if schedule.coast is None else schedule.coast
+        self.parachute_delay_dt = after_burnout_dt if schedule.parachute_delay is None else schedule.parachute_delay
+        self.descent_dt = after_burnout_dt if schedule.descent is None else schedule.descent
+        thrust_time = config.thrust.index.to_numpy(dtype=float)
+        burning = np.flatnonzero(config.thrust.iloc[:, 0].to_numpy(dtype=float) > THRUST_THRESHOLD)
+        self.burnout_time = (
+            float(thrust_time[min(burning[-1] + 1, len(thrust_time) - 1)])
+            if len(burning) > 0
+            else float(thrust_time[0])
+        )
         self.launcher_length = config.launcher_length
         self.inertia_tensor = InertiaTensor(
             config.inertia_tensor_xx,
@@ -75,3 +143,4 @@ class SimulationContext:
 
         self.parachute_terminal_velocity = config.parachute_terminal_velocity
         self.parachute_delay_time = config.parachute_delay_time
+        self.parachute_descent_dt = config.parachute_descent_dt
@@ -1,16 +1,24 @@
 import copy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
 import quaternion
 
+from .flight_metrics import FlightMetrics
+from .phase_index import PhaseIndex
+
 if TYPE_CHECKING:
-    from .air_force import AirForceResult
+    import pandas as pd
+
+    from .air_force import AirForceBatchResult, AirForceResult
+    from .flight_event import FlightEvent
     from .rocket_state import RocketState
     from .simulation_context import SimulationContext
 
+THRUST_THRESHOLD = 1e-10
+"""この値より推力が大きいときに燃焼中とみなす"""
+
 
 @dataclass
 class SimulationResultRow:
@@ -51,7 +59,6 @@ class SimulationResultRow:
         Returns:
             SimulationResultRow: シミュレーション結果の行
         """
-        thrust_threshold = 1e-10
         return cls(
             time=time,
             position=state.position,
@@ -59,7 +66,7 @@ class SimulationResultRow:
             posture=state.posture,
             rotation=state.rotation,
             dynamic_pressure=air_force_result.dynamic_pressure,
-            burning=context.thrust(time) > thrust_threshold,
+            burning=context.thrust(time) > THRUST_THRESHOLD,
             on_launcher=on_launcher,
             velocity_air_body_frame=air_force_result.velocity_air_body_frame,
             acceleration_body_frame=acceleration_body_frame,
@@ -109,6 +116,60 @@ class SimulationResult:
 
     result: list[SimulationResultRow]
     """シミュレーションの結果"""
+    metrics: FlightMetrics = field(default_factory=FlightMetrics)
+    """行の追加と同時に更新するレポート用の飛行指標"""
+    events: list["FlightEvent"] = field(default_factory=list)
+    """時刻順に並んだ飛行中のイベント"""
+
+    def __post_init__(self) -> None:
+        if self.metrics.last is None:
+            for row in self.result:
+                self.metrics.update(row)
+
+    @classmethod
+    def from_batch(
+        cls,
+        time: np.ndarray,
+        states: list["RocketState"],
+        thrust: np.ndarray,
+        acceleration_body_frame: np.ndarray,
+        air_force_result: "AirForceBatchResult",
+        *,
+        on_launcher: bool,
+    ) -> "SimulationResult":
+        """配列演算でまとめて計算した値からシミュレーション結果を作成する
+
+        Args:
+            time (np.ndarray): 時刻(N,)
+            states (list[RocketState]): ロケットの状態のリスト
+            thrust (np.ndarray): 推力(N,)
+            acceleration_body_frame (np.ndarray): ボディフレーム座標系での加速度(N, 3)
+            air_force_result (AirForceBatchResult): 空気力の計算結果
+            on_launcher (bool): ランチャー上にあるかどうか
+
+        Returns:
+            SimulationResult: シミュレーション結果
+        """
+        times = np.asarray(time).tolist()
+        burning = (thrust > THRUST_THRESHOLD).tolist()
+        dynamic_pressure = air_force_result.dynamic_pressure.tolist()
+        result = cls.init_empty()
+        for i, state in enumerate(states):
+            result.append(
+                SimulationResultRow(
+                    time=times[i],
+                    position=state.position,
+                    velocity=state.velocity,
+                    posture=state.posture,
+                    rotation=state.rotation,
+                    dynamic_pressure=dynamic_pressure[i],
+                    burning=burning[i],
+                    on_launcher=on_launcher,
+                    velocity_air_body_frame=air_force_result.velocity_air_body_frame[i],
+                    acceleration_body_frame=acceleration_body_frame[i],
+                ),
+            )
+        return result
 
     @classmethod
     def init_empty(cls) -> "SimulationResult":
@@ -122,6 +183,7 @@ class SimulationResult:
             row (SimulationResultRow): 追加する列
         """
         self.result.append(row)
+        self.metrics.update(row)
 
     def join(
         self,
@@ -141,7 +203,11 @@ class SimulationResult:
         if self.result[-1].time != other.result[0].time:
             err_msg = "selfの最後の時刻とotherの最初の時刻が一致しません"
             raise ValueError(err_msg)
-        return SimulationResult(self.result[:-1] + other.result)
+        return SimulationResult(
+            self.result[:-1] + other.result,
+            self.metrics.merge(other.metrics),
+            self.events + other.events,
+        )
 
     def deepcopy(self) -> "SimulationResult":
         """シミュレーション結果をディープコピーする
@@ -159,12 +225,24 @@ class SimulationResult:
         """
         return self.result[-1]
 
-    def to_df(self) -> pd.DataFrame:
+    def phase_index(self) -> PhaseIndex:
+        """イベントから飛行の各段階に対応する行の範囲を求める
+
+        to_dfで作成したDataFrameの行にもそのまま対応する。
+
+        Returns:
+            PhaseIndex: 各段階の行の範囲
+        """
+        return PhaseIndex.from_events(np.array([row.time for row in self.result]), self.events)
+
+    def to_df(self) -> "pd.DataFrame":
         """DataFrameに変換する
 
         Returns:
             pd.DataFrame: DataFrame
         """
+        import pandas as pd  # noqa: PLC0415
+
         body = pd.DataFrame([row.to_df_row() for row in self.result])
         body.columns = [
             "time",
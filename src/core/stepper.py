@@ -0,0 +1,220 @@
+import copy
+import time as time_module
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import ode_solver, simple_simulation
+from .rocket_state import RocketState
+from .simulation_context import SimulationContext
+
+LAUNCHER = "launcher"
+"""ランチャー上"""
+RISING = "rising"
+"""ランチクリアから最高高度まで"""
+PARACHUTE_DELAY = "parachute_delay"
+"""最高高度から開傘まで"""
+FALLING = "falling"
+"""開傘から着地まで(パラシュートが開かない場合も含む)"""
+LANDED = "landed"
+"""着地後(stepを呼んでも進まない)"""
+
+_NEXT_PHASE = {LAUNCHER: RISING, RISING: PARACHUTE_DELAY, PARACHUTE_DELAY: FALLING, FALLING: LANDED}
+
+
+@dataclass(frozen=True)
+class StepperSnapshot:
+    """Stepperのある時点の状態のコピー"""
+
+    time: float
+    """時刻"""
+    state: RocketState
+    """ロケットの状態"""
+    phase: str
+    """飛行の区間"""
+    apogee_time: float | None
+    """最高高度に達した時刻(到達前はNone)"""
+
+
+class Stepper:
+    """シミュレーションを1ステップずつ進める
+
+    地上局やHILSで実時間と同期して進めるため、ode_solver.runge_kutta4のように
+    終了まで解いて結果のリストを返すのではなく、stepを呼ぶたびに1ステップだけ進める。
+    状態は常に最新の1つだけを保持し、ステップごとに伸びるリストなどは持たない。
+    区間の判定と微分の計算はsimple_simulationと同じものを用いる。
+    """
+
+    time: float
+    """現在の時刻"""
+    state: RocketState
+    """現在のロケットの状態"""
+    phase: str
+    """現在の飛行の区間"""
+    apogee_time: float | None
+    """最高高度に達した時刻"""
+    steps: int
+    """進めたステップ数"""
+
+    def __init__(
+        self,
+        context: SimulationContext,
+        time: float = 0.0,
+        state: RocketState | None = None,
+        *,
+        parachute_on: bool = True,
+        apogee_time: float | None = None,
+        latency_history: int = 1000,
+    ) -> None:
+        """開始時刻と状態から区間を判定して準備する
+
+        Args:
+            context (SimulationContext): ロケットの設定(inject_windで書き換えるためコピーして保持する)
+            time (float): 開始時刻
+            state (RocketState | None): 開始時の状態(Noneの場合は打ち上げ前の状態)
+            parachute_on (bool): 開傘時刻を過ぎたらパラシュートを開くか
+            apogee_time (float | None): 下降中から始める場合の最高高度に達した時刻
+                (Noneの場合はsimple_simulation.estimate_apogee_timeで推定する)
+            latency_history (int): 記録する直近のステップの処理時間の数
+        """
+        self.context = copy.copy(context)
+        self.time = time
+        self.state = simple_simulation.initial_state(context) if state is None else state
+        self.steps = 0
+        self._derivatives = {
+            LAUNCHER: simple_simulation.launcher_derivative(self.context),
+            RISING: simple_simulation.flight_derivative(self.context, parachute_on=False),
+            PARACHUTE_DELAY: simple_simulation.flight_derivative(self.context, parachute_on=False),
+            FALLING: simple_simulation.flight_derivative(self.context, parachute_on=parachute_on),
+        }
+        self._latencies = np.zeros(latency_history)
+        self._max_latency = 0.0
+        rising = self.state.velocity[2] <= 0
+        if rising and np.linalg.norm(self.state.position, ord=2) <= self.context.launcher_length:
+            self.phase = LAUNCHER
+            self.apogee_time = None
+        elif rising:
+            self.phase = RISING
+            self.apogee_time = None
+        else:
+            self.phase = PARACHUTE_DELAY
+            self.apogee_time = (
+                simple_simulation.estimate_apogee_time(self.time, self.state) if apogee_time is None else apogee_time
+            )
+        self._advance_phase()
+
+    def _phase_ended(self) -> bool:
+        """現在の区間の終了条件を満たすか(simple_simulationの各区間の終了条件と同じ)"""
+        if self.phase == LAUNCHER:
+            return np.linalg.norm(self.state.position, ord=2) > self.context.launcher_length
+        if self.phase == RISING:
+            return simple_simulation.rise_end_condition(self.time, self.state)
+        if self.phase == PARACHUTE_DELAY:
+            return self.time > typing.cast("float", self.apogee_time) + self.context.parachute_delay_time
+        if self.phase == FALLING:
+            return simple_simulation.fall_end_condition(self.time, self.state)
+        return False
+
+    def _advance_phase(self) -> None:
+        """終了条件を満たした区間を次の区間に進める"""
+        while self.phase != LANDED and self._phase_ended():
+            if self.phase == RISING:
+                self.apogee_time = self.time
+            self.phase = _NEXT_PHASE[self.phase]
+
+    def time_step(self) -> float:
+        """現在の区間の時間刻み(SimulationContextの区間ごとの時間刻みに従う)"""
+        if self.phase == LAUNCHER:
+            return self.context.launcher_dt
+        if self.phase == RISING:
+            return self.context.burn_dt if self.time < self.context.burnout_time else self.context.coast_dt
+        if self.phase == PARACHUTE_DELAY:
+            return self.context.parachute_delay_dt
+        return self.context.descent_dt
+
+    def step(self) -> bool:
+        """1ステップ進める
+
+        Returns:
+            bool: 進めた場合True(着地後はFalse)
+        """
+        if self.phase == LANDED:
+            return False
+        start = time_module.perf_counter()
+        dt = self.time_step()
+        self.state = ode_solver.runge_kutta4_step(self._derivatives[self.phase], self.time, self.state, dt)
+        self.time += dt
+        self._advance_phase()
+        latency = time_module.perf_counter() - start
+        self._latencies[self.steps % len(self._latencies)] = latency
+        self._max_latency = max(self._max_latency, latency)
+        self.steps += 1
+        return True
+
+    def advance_to(self, time: float) -> int:
+        """時刻timeを超えない範囲でステップを進める
+
+        実時間に同期する場合は経過時間を渡して繰り返し呼ぶ。
+
+        Args:
+            time (float): 目標の時刻
+
+        Returns:
+            int: 進めたステップ数
+        """
+        count = 0
+        # 時刻の足し合わせの丸め誤差で最後のステップを取りこぼさないように刻み幅を僅かに小さく見積もる
+        while self.time + self.time_step() * (1 - 1e-9) <= time and self.step():
+            count += 1
+        return count
+
+    def inject_wind(self, wind: np.ndarray | typing.Callable[[float], np.ndarray]) -> None:
+        """以降のステップで用いる風を差し替える
+
+        Args:
+            wind (np.ndarray | typing.Callable[[float], np.ndarray]): 高度によらない風速ベクトル(北, 東, 下)[m/s]、
+                または高度から風速ベクトルを求める関数
+        """
+        if callable(wind):
+            self.context.wind = wind
+            return
+        constant = np.array(wind, dtype=float)
+        self.context.wind = lambda _: constant
+
+    def snapshot(self) -> StepperSnapshot:
+        """現在の状態のコピーを作成する
+
+        Returns:
+            StepperSnapshot: 現在の状態のコピー
+        """
+        return StepperSnapshot(
+            time=self.time,
+            state=RocketState(
+                self.state.position.copy(),
+                self.state.velocity.copy(),
+                copy.copy(self.state.posture),
+                self.state.rotation.copy(),
+            ),
+            phase=self.phase,
+            apogee_time=self.apogee_time,
+        )
+
+    @property
+    def latencies(self) -> np.ndarray:
+        """直近のステップの処理時間[s](古い順)"""
+        if self.steps < len(self._latencies):
+            return self._latencies[: self.steps].copy()
+        return np.roll(self._latencies, -(self.steps % len(self._latencies)))
+
+    @property
+    def last_latency(self) -> float:
+        """最後のステップの処理時間[s]"""
+        if self.steps == 0:
+            return 0.0
+        return float(self._latencies[(self.steps - 1) % len(self._latencies)])
+
+    @property
+    def max_latency(self) -> float:
+        """全ステップでの最大の処理時間[s]"""
+        return self._max_latency
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_CHUNKSIZE = 1_000_000
+"""推力のCSVを分割して読み込む際の1回あたりの行数"""
+
+
+@dataclass(frozen=True)
+class ThrustCompression:
+    """推力の表を間引いた結果"""
+
+    original_rows: int
+    """元の行数"""
+    compressed_rows: int
+    """間引いた後の行数"""
+    tolerance: float
+    """許容した推力の誤差[N]"""
+    max_error: float
+    """元の各時刻での推力の誤差の最大値[N]"""
+    total_impulse: float
+    """元の表の全力積[N s]"""
+    impulse_error: float
+    """間引いた表の全力積から元の表の全力積を引いたもの[N s]"""
+
+    @property
+    def relative_impulse_error(self) -> float:
+        """全力積の相対誤差"""
+        return self.impulse_error / self.total_impulse if self.total_impulse != 0 else 0.0
+
+
+def simplify(time: np.ndarray, thrust: np.ndarray, tolerance: float) -> tuple[np.ndarray, float]:
+    """折れ線で近似した推力の誤差がtolerance以下となるように残す点を選ぶ
+
+    Douglas-Peucker法で、両端の点を結ぶ線分からの推力方向の誤差が最大の点を残して区間を分割することを
+    全ての区間の誤差がtolerance以下になるまで繰り返す。残した点を線形補間した推力と元の推力の差は
+    元の全ての時刻でtolerance以下となる。同じ時刻に2つの点がある推力の段差はそのまま残す。
+
+    Args:
+        time (np.ndarray): 時刻(単調増加)
+        thrust (np.ndarray): 推力
+        tolerance (float): 許容する推力の誤差[N]
+
+    Returns:
+        tuple[np.ndarray, float]: 残す点の添字(昇順、両端を含む)と誤差の最大値
+    """
+    n = len(time)
+    if n <= 2:  # noqa: PLR2004
+        return np.arange(n), 0.0
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    max_error = 0.0
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:  # noqa: PLR2004
+            continue
+        t = time[start + 1 : end]
+        span = time[end] - time[start]
+        # 時刻が重なる区間は始点の値との差を誤差とする
+        s = (t - time[start]) / span if span > 0 else np.zeros_like(t)
+        error = np.abs(thrust[start + 1 : end] - (thrust[start] + s * (thrust[end] - thrust[start])))
+        i = int(np.argmax(error))
+        if error[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.extend([(start, split), (split, end)])
+        else:
+            max_error = max(max_error, float(error[i]))
+    return np.flatnonzero(keep), max_error
+
+
+def _impulse(time: np.ndarray, thrust: np.ndarray) -> float:
+    """台形則で求めた力積"""
+    return float(np.sum((thrust[1:] + thrust[:-1]) * np.diff(time)) / 2)
+
+
+def compress_thrust(df: "pd.DataFrame", tolerance: float) -> "tuple[pd.DataFrame, ThrustCompression]":
+    """推力の表を間引く
+
+    Args:
+        df (pd.DataFrame): 時刻をindexとし、1番目のカラムを推力とする表(他のカラムは残した行の値を用いる)
+        tolerance (float): 許容する推力の誤差[N]
+
+    Returns:
+        tuple[pd.DataFrame, ThrustCompression]: 間引いた表と誤差
+    """
+    time = df.index.to_numpy(dtype=float)
+    thrust = df.iloc[:, 0].to_numpy(dtype=float)
+    keep, max_error = simplify(time, thrust, tolerance)
+    total_impulse = _impulse(time, thrust)
+    return df.iloc[keep], ThrustCompression(
+        original_rows=len(df),
+        compressed_rows=len(keep),
+        tolerance=tolerance,
+        max_error=max_error,
+        total_impulse=total_impulse,
+        impulse_error=_impulse(time[keep], thrust[keep]) - total_impulse,
+    )
+
+
+def read_thrust_csv(
+    path: Path,
+    relative_tolerance: float,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> "tuple[pd.DataFrame, ThrustCompression]":
+    """推力のCSVを分割して読み込みながら間引く
+
+    最大推力を求めるために1度読み、2度目に分割した区間ごとに間引く。
+    区間の両端の点は残すため、誤差の上限は表全体を1度に間引いた場合と同じとなる。
+    メモリには分割した1区間と間引いた点だけを保持するため、数百万行の燃焼試験のログも読み込める。
+
+    Args:
+        path (Path): 1列目を時刻、2列目を推力とするCSV(thrust.csvと同じ形式)
+        relative_tolerance (float): 最大推力に対する許容する推力の誤差の比
+        chunksize (int): 1度に読み込む行数
+
+    Returns:
+        tuple[pd.DataFrame, ThrustCompression]: 間引いた表と誤差
+    """
+    import pandas as pd  # noqa: PLC0415
+
+    peak = 0.0
+    with pd.read_csv(path, index_col=0, chunksize=chunksize) as reader:
+        for chunk in reader:
+            peak = max(peak, float(chunk.iloc[:, 0].abs().max()))
+    tolerance = relative_tolerance * peak
+
+    parts = []
+    rows = 0
+    max_error = 0.0
+    total_impulse = 0.0
+    previous: tuple[float, float] | None = None
+    with pd.read_csv(path, index_col=0, chunksize=chunksize) as reader:
+        for chunk in reader:
+            part, compression = compress_thrust(chunk, tolerance)
+            parts.append(part)
+            rows += compression.original_rows
+            max_error = max(max_error, compression.max_error)
+            total_impulse += compression.total_impulse
+            first = (float(chunk.index[0]), float(chunk.iloc[0, 0]))
+            if previous is not None:
+                # 区間の境目の線分は元の表と同じ
+                total_impulse += (previous[1] + first[1]) * (first[0] - previous[0]) / 2
+            previous = (float(chunk.index[-1]), float(chunk.iloc[-1, 0]))
+    df = pd.concat(parts)
+    return df, ThrustCompression(
+        original_rows=rows,
+        compressed_rows=len(df),
+        tolerance=tolerance,
+        max_error=max_error,
+        total_impulse=total_impulse,
+        impulse_error=_impulse(df.index.to_numpy(dtype=float), df.iloc[:, 0].to_numpy(dtype=float)) - total_impulse,
+    )
@@ -1,3 +1,4 @@
+import functools
 import typing as t
 
 import numpy as np
@@ -20,21 +21,82 @@ def wind_velocity_power(
     Returns:
         t.Callable[[float],np.ndarray]: 高度から風速への関数
     """
+    # 風向は変わらないため方向ベクトルは一度だけ計算する
+    theta = np.deg2rad(wind_direction)
+    direction = np.array([-np.cos(theta), -np.sin(theta), 0])
+    # 並列計算のワーカーに送れるように、クロージャではなくpickleできるpartialとする
+    return functools.partial(_wind_velocity_power, reference_height, wind_speed, 1 / exponent, direction)
 
-    def f(height: float) -> np.ndarray:
-        """高度から風速を計算する
 
-        Args:
-            height (float): 高度
+def _wind_velocity_power(
+    reference_height: float,
+    wind_speed: float,
+    power: float,
+    direction: np.ndarray,
+    height: float,
+) -> np.ndarray:
+    """高度から風速を計算する
+
+    Args:
+        reference_height (float): 基準高度
+        wind_speed (float): 基準高度での風速
+        power (float): べき定数の逆数
+        direction (np.ndarray): 風下に向かう単位ベクトル
+        height (float): 高度
+
+    Returns:
+        np.ndarray: 風速
+    """
+    if height < 0:
+        return np.zeros(3)
+    return wind_speed * (height / reference_height) ** power * direction
 
-        Returns:
-            np.ndarray: 風速
-        """
-        theta = np.deg2rad(wind_direction)
-        if height < 0:
-            return np.zeros(3)
-        return (
-            wind_speed * (height / reference_height) ** (1 / exponent) * np.array([-np.cos(theta), -np.sin(theta), 0])
-        )
 
-    return f
+def wind_velocity_power_batch(
+    reference_height: float,
+    wind_speed: float,
+    exponent: float,
+    wind_direction: float,
+) -> t.Callable[[np.ndarray], np.ndarray]:
+    """複数の高度での風速をまとめて計算する関数を生成する
+
+    Args:
+        reference_height (float): 基準高度
+        wind_speed (float): 基準高度での風速
+        exponent (float): べき定数
+        wind_direction (float): 風上の方位角[deg]
+
+    Returns:
+        t.Callable[[np.ndarray], np.ndarray]: 高度の配列(N,)から風速の配列(N, 3)への関数
+    """
+    theta = np.deg2rad(wind_direction)
+    direction = np.array([-np.cos(theta), -np.sin(theta), 0])
+    return functools.partial(_wind_velocity_power_batch, reference_height, wind_speed, exponent, direction)
+
+
+def _wind_velocity_power_batch(
+    reference_height: float,
+    wind_speed: float,
+    exponent: float,
+    direction: np.ndarray,
+    height: np.ndarray,
+) -> np.ndarray:
+    """高度の配列から風速の配列を計算する
+
+    Args:
+        reference_height (float): 基準高度
+        wind_speed (float): 基準高度での風速
+        exponent (float): べき定数
+        direction (np.ndarray): 風下に向かう単位ベクトル
+        height (np.ndarray): 高度の配列
+
+    Returns:
+        np.ndarray: 風速の配列
+    """
+    height = np.asarray(height, dtype=float)
+    speed = np.where(
+        height < 0,
+        0.0,
+        wind_speed * (np.maximum(height, 0) / reference_height) ** (1 / exponent),
+    )
+    return speed[..., np.newaxis] * direction
@@ -0,0 +1,189 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .interpolation import locate, locate_weight
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class WindProfile:
+    """高層気象観測や数値予報による高度(と時刻)ごとの風の分布
+
+    風は北向きと東向きの成分に分けて保持し、高度と時刻について線形補間する。
+    風向を直接補間すると北風付近で値が不連続になるため成分で補間する。
+    直前に参照した高度の位置を保持し、軌道に沿った参照では探索を省く。
+    範囲外の高度や時刻では端の値を用いる。
+    """
+
+    altitude: np.ndarray
+    """高度の格子[m](昇順)"""
+    time: np.ndarray
+    """時刻の格子(昇順、時間変化しない場合は1点)"""
+    wind_north: np.ndarray
+    """各格子点での風速の北向き成分[m/s](時刻, 高度)"""
+    wind_east: np.ndarray
+    """各格子点での風速の東向き成分[m/s](時刻, 高度)"""
+
+    def __init__(
+        self,
+        altitude: np.ndarray,
+        wind_north: np.ndarray,
+        wind_east: np.ndarray,
+        time: np.ndarray | None = None,
+    ) -> None:
+        """分布を作成する
+
+        Args:
+            altitude (np.ndarray): 高度の格子[m](昇順)
+            wind_north (np.ndarray): 風速の北向き成分[m/s](時刻, 高度)または(高度,)
+            wind_east (np.ndarray): 風速の東向き成分[m/s](時刻, 高度)または(高度,)
+            time (np.ndarray | None): 時刻の格子(昇順)。Noneの場合は時間変化しない
+
+        Raises:
+            ValueError: 格子が昇順でない場合や風速の形が格子と一致しない場合
+        """
+        self.altitude = np.asarray(altitude, dtype=float)
+        self.time = np.zeros(1) if time is None else np.asarray(time, dtype=float)
+        if len(self.altitude) < 2 or np.any(np.diff(self.altitude) <= 0):  # noqa: PLR2004
+            err_msg = "高度の格子は2点以上の昇順である必要があります"
+            raise ValueError(err_msg, self.altitude)
+        if len(self.time) < 1 or np.any(np.diff(self.time) <= 0):
+            err_msg = "時刻の格子は昇順である必要があります"
+            raise ValueError(err_msg, self.time)
+        shape = (len(self.time), len(self.altitude))
+        self.wind_north = np.asarray(wind_north, dtype=float).reshape(-1, len(self.altitude))
+        self.wind_east = np.asarray(wind_east, dtype=float).reshape(-1, len(self.altitude))
+        if self.wind_north.shape != shape or self.wind_east.shape != shape:
+            err_msg = "風速の表の形が格子と一致しません"
+            raise ValueError(err_msg, shape)
+        # スカラーの補間ではnumpyのスカラーよりPythonのリストの方が速い
+        self._altitude = self.altitude.tolist()
+        self._north = self.wind_north[0].tolist()
+        self._east = self.wind_east[0].tolist()
+        self._hint = 0
+
+    @classmethod
+    def from_df(cls, df: "pd.DataFrame") -> "WindProfile":
+        """観測値や予報値の表から作成する
+
+        時刻ごとに高度が異なる場合は、全ての時刻の高度を合わせた格子に補間する。
+
+        Args:
+            df (pd.DataFrame): altitude[m]、wind_speed[m/s]、wind_direction(風上の方位角)[deg]のカラムを持つ表。
+                timeのカラムがある場合は時刻ごとの分布とみなす
+
+        Returns:
+            WindProfile: 風の分布
+        """
+        theta = np.deg2rad(df["wind_direction"].to_numpy(dtype=float))
+        speed = df["wind_speed"].to_numpy(dtype=float)
+        times = df["time"].to_numpy(dtype=float) if "time" in df.columns else np.zeros(len(speed))
+        levels = df["altitude"].to_numpy(dtype=float)
+        # 時刻、高度の順に並べ替える
+        order = np.lexsort((levels, times))
+        times, levels = times[order], levels[order]
+        # 風上の方位角から吹いてくるため、風速ベクトルは逆向きとなる
+        north = (-speed * np.cos(theta))[order]
+        east = (-speed * np.sin(theta))[order]
+        altitude = np.unique(levels)
+        time, starts = np.unique(times, return_index=True)
+        ends = [*starts[1:].tolist(), len(times)]
+        wind_north = np.empty((len(time), len(altitude)))
+        wind_east = np.empty((len(time), len(altitude)))
+        for i, (start, end) in enumerate(zip(starts.tolist(), ends, strict=True)):
+            wind_north[i] = np.interp(altitude, levels[start:end], north[start:end])
+            wind_east[i] = np.interp(altitude, levels[start:end], east[start:end])
+        return cls(altitude, wind_north, wind_east, time if "time" in df.columns else None)
+
+    def to_df(self) -> "pd.DataFrame":
+        """from_dfで読み込める表に変換する
+
+        Returns:
+            pd.DataFrame: altitude、wind_speed、wind_directionのカラム(時間変化する場合はtimeも)を持つ表
+        """
+        import pandas as pd  # noqa: PLC0415
+
+        df = pd.DataFrame(
+            {
+                "time": np.repeat(self.time, len(self.altitude)),
+                "altitude": np.tile(self.altitude, len(self.time)),
+                "wind_speed": np.hypot(self.wind_north, self.wind_east).ravel(),
+                "wind_direction": np.rad2deg(np.arctan2(-self.wind_east, -self.wind_north)).ravel() % 360,
+            },
+        )
+        return df if self.time_dependent else df.drop(columns="time")
+
+    @property
+    def time_dependent(self) -> bool:
+        """時刻によって変化するか"""
+        return len(self.time) > 1
+
+    def at_time(self, time: float) -> "WindProfile":
+        """ある時刻での分布を求める
+
+        Args:
+            time (float): 時刻
+
+        Returns:
+            WindProfile: 時間変化しない分布
+        """
+        if not self.time_dependent:
+            return self
+        i = locate(self.time.tolist(), time, 0)
+        s = locate_weight(self.time.tolist(), i, time)
+        return WindProfile(
+            self.altitude,
+            (1 - s) * self.wind_north[i] + s * self.wind_north[i + 1],
+            (1 - s) * self.wind_east[i] + s * self.wind_east[i + 1],
+        )
+
+    def __call__(self, altitude: float) -> np.ndarray:
+        """高度から風速ベクトルを求める
+
+        Args:
+            altitude (float): 高度[m]
+
+        Returns:
+            np.ndarray: 風速ベクトル(NED座標系)
+
+        Raises:
+            ValueError: 時間変化する分布の場合
+        """
+        if self.time_dependent:
+            err_msg = "時間変化する分布はat_timeで時刻を指定してください"
+            raise ValueError(err_msg)
+        i = locate(self._altitude, altitude, self._hint)
+        self._hint = i
+        s = locate_weight(self._altitude, i, altitude)
+        north = self._north
+        east = self._east
+        return np.array(
+            [
+                north[i] + (north[i + 1] - north[i]) * s,
+                east[i] + (east[i + 1] - east[i]) * s,
+                0.0,
+            ]
+        )
+
+    def batch(self, altitude: np.ndarray) -> np.ndarray:
+        """複数の高度での風速ベクトルをまとめて求める
+
+        Args:
+            altitude (np.ndarray): 高度[m](N,)
+
+        Returns:
+            np.ndarray: 風速ベクトル(N, 3)
+
+        Raises:
+            ValueError: 時間変化する分布の場合
+        """
+        if self.time_dependent:
+            err_msg = "時間変化する分布はat_timeで時刻を指定してください"
+            raise ValueError(err_msg)
+        altitude = np.asarray(altitude, dtype=float)
+        result = np.zeros((*altitude.shape, 3))
+        result[..., 0] = np.interp(altitude, self.altitude, self.wind_north[0])
+        result[..., 1] = np.interp(altitude, self.altitude, self.wind_east[0])
+        return result
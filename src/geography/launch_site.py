@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+import numpy as np
+
 from src.geography.geography import Point
 
 
@@ -37,3 +39,66 @@ class LaunchSite:
 
     def points_east(self) -> list[float]:
         return [point.east for point in self.allowed_area]
+
+    def _edges(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """落下可能域の各辺の始点と終点の(北, 東)"""
+        north = np.array(self.points_north())
+        east = np.array(self.points_east())
+        return north, east, np.roll(north, -1), np.roll(east, -1)
+
+    def contains(self, north: np.ndarray, east: np.ndarray) -> np.ndarray:
+        """点が落下可能域の内側にあるか判定する
+
+        Args:
+            north (np.ndarray): 北方向の位置[m](N,)
+            east (np.ndarray): 東方向の位置[m](N,)
+
+        Returns:
+            np.ndarray: 内側にあるか(N,)
+        """
+        north = np.asarray(north, dtype=float)[..., np.newaxis]
+        east = np.asarray(east, dtype=float)[..., np.newaxis]
+        n0, e0, n1, e1 = self._edges()
+        # 点から東向きに伸ばした半直線と交わる辺の数の偶奇で判定する
+        crosses = (n0 > north) != (n1 > north)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            east_cross = e0 + (north - n0) * (e1 - e0) / (n1 - n0)
+        return np.count_nonzero(crosses & (east < east_cross), axis=-1) % 2 == 1
+
+    def distance_to_boundary(self, north: np.ndarray, east: np.ndarray) -> np.ndarray:
+        """点から落下可能域の境界までの距離を求める
+
+        Args:
+            north (np.ndarray): 北方向の位置[m](N,)
+            east (np.ndarray): 東方向の位置[m](N,)
+
+        Returns:
+            np.ndarray: 境界までの距離[m](N,)
+        """
+        north = np.asarray(north, dtype=float)[..., np.newaxis]
+        east = np.asarray(east, dtype=float)[..., np.newaxis]
+        n0, e0, n1, e1 = self._edges()
+        dn = n1 - n0
+        de = e1 - e0
+        length_squared = dn**2 + de**2
+        # 長さ0の辺(閉じた座標列の重複点)は始点までの距離とする
+        s = np.where(
+            length_squared > 0,
+            ((north - n0) * dn + (east - e0) * de) / np.where(length_squared > 0, length_squared, 1),
+            0,
+        )
+        s = np.clip(s, 0, 1)
+        return np.hypot(north - (n0 + s * dn), east - (e0 + s * de)).min(axis=-1)
+
+    def margin(self, north: np.ndarray, east: np.ndarray) -> np.ndarray:
+        """落下可能域の境界までの余裕を求める
+
+        Args:
+            north (np.ndarray): 北方向の位置[m](N,)
+            east (np.ndarray): 東方向の位置[m](N,)
+
+        Returns:
+            np.ndarray: 内側では境界までの距離、外側では境界までの距離に負号を付けた値[m](N,)
+        """
+        distance = self.distance_to_boundary(north, east)
+        return np.where(self.contains(north, east), distance, -distance)
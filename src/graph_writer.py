@@ -1,11 +1,10 @@
 from pathlib import Path
 
-from matplotlib import pyplot as plt
-
-from .make_report.make_graph import Graphs
+from .make_report.make_graph import Graphs, pyplot
 
 
 def write(path: Path, graphs: Graphs) -> None:
+    plt = pyplot()
     graphs.ideal_dynamic_pressure.savefig(
         path / "ideal_dynamic_pressure.png",
     )
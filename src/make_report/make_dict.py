@@ -3,73 +3,77 @@ import math
 import numpy as np
 import pandas as pd
 
+from src.core import flight_event
 from src.core.config import Config
+from src.core.flight_metrics import FlightMetrics
 from src.geography.geography import Point
 from src.geography.launch_site import LaunchSite
 
-from .result_for_report import ResultForReport, SimulationContext
+from .result_for_report import ResultForReport
 
+_EVENT_LABELS = {
+    flight_event.LAUNCH_CLEAR: "ランチクリア",
+    flight_event.BURNOUT: "燃焼終了",
+    flight_event.APOGEE: "頂点到達",
+    flight_event.PARACHUTE_DEPLOY: "開傘",
+    flight_event.LANDING: "着地",
+}
 
-def burning_coasting_division(data: pd.DataFrame) -> pd.DataFrame:
-    burning = data[data["burning"]]
-    coasting = data[~data["burning"]]
-    return burning, coasting
 
-def launch_clear(data: pd.DataFrame, context: SimulationContext) -> dict:
-    """ランチクリア時の情報"""
-    launch_clear = data[~data["on_launcher"]].iloc[0]
-    v = np.sqrt(launch_clear.velocity_n**2 + launch_clear.velocity_e**2 + launch_clear.velocity_d**2)
-    theta = np.deg2rad(context.first_elevation)
-    alpha = np.deg2rad(21)
-    beta = np.deg2rad(20)
-    w_alpha = v * np.tan(alpha) / (np.sin(theta) + np.cos(theta) * np.tan(alpha))
-    w_beta = v * np.tan(beta)
+def launch_clear(metrics: FlightMetrics, wind_limit: pd.DataFrame | None) -> dict:
+    """ランチクリア時の情報
+
+    Args:
+        metrics (FlightMetrics): 飛行指標
+        wind_limit (pd.DataFrame | None): wind_limit.search_wind_limitで求めた風向ごとの風速制限
+            (Noneの場合は風速制限を含めない)
+    """
+    launch_clear = metrics.launch_clear
+    v = np.linalg.norm(launch_clear.velocity, ord=2)
+    if wind_limit is None:
+        return {
+            "時刻/s": round(launch_clear.time, 2),
+            "速度/(m/s)": round(v, 2),
+        }
+    limiting = wind_limit["wind_speed_limit"].idxmin()
     return {
         "時刻/s": round(launch_clear.time, 2),
         "速度/(m/s)": round(v, 2),
-        "順風迎角21degの時の風速/(m/s)": round(w_alpha, 2),
-        "側風迎角20degの時の風速/(m/s)": round(w_beta, 2),
-        "風速制限/(m/s)": round(min(w_alpha, w_beta), 2),
+        "風速制限/(m/s)": round(wind_limit.loc[limiting, "wind_speed_limit"], 2),
+        "風速制限となる風向/deg": limiting,
+        "風速制限の要因": wind_limit.loc[limiting, "limited_by"],
     }
 
-def dynamic_pressure(data: pd.DataFrame, *, through_all_time: bool) -> dict:
-    burning = data[data["burning"]]
-    if through_all_time:
-        pressure_max = data.loc[data["dynamic_pressure"].idxmax()]
-    else:
-        pressure_max = burning.loc[burning["dynamic_pressure"].idxmax()]
-    air_velocity_norm = np.sqrt(
-        pressure_max.velocity_air_body_frame_x**2
-        + pressure_max.velocity_air_body_frame_y**2
-        + pressure_max.velocity_air_body_frame_z**2)
+def dynamic_pressure(metrics: FlightMetrics, *, through_all_time: bool) -> dict:
+    pressure_max = metrics.max_dynamic_pressure if through_all_time else metrics.max_dynamic_pressure_burning
+    air_velocity_norm = np.linalg.norm(pressure_max.velocity_air_body_frame, ord=2)
     return {
         "時刻/s": round(pressure_max.time, 2),
-        "高度/m": round(-(pressure_max.position_d), 2),
+        "高度/m": round(-(pressure_max.position[2]), 2),
         "動圧/kPa": round(pressure_max.dynamic_pressure / 1000, 2),
         "対気速度/(m/s)": round(air_velocity_norm, 2),
     }
 
-def max_altitude(data: pd.DataFrame) -> dict:
-    max_altitude = data.loc[data["position_d"].idxmin()]
-    velocity_air = np.sqrt(max_altitude.velocity_n**2
-                          + max_altitude.velocity_e**2
-                          + max_altitude.velocity_d**2)
+def max_altitude(metrics: FlightMetrics) -> dict:
+    max_altitude = metrics.max_altitude
+    velocity_air = np.linalg.norm(max_altitude.velocity, ord=2)
     return {
         "時刻/s": round(max_altitude.time, 2),
-        "高度/m": round(-(max_altitude.position_d), 2),
+        "高度/m": round(-(max_altitude.position[2]), 2),
         "対気速度/(m/s)": round(velocity_air, 2),
     }
 
-def landing(data: pd.DataFrame, site: LaunchSite) -> dict:
-    landing = data.iloc[-1]
-    landing_position = Point.from_north_east(landing.position_n, landing.position_e,
+def landing(metrics: FlightMetrics, site: LaunchSite) -> dict:
+    landing = metrics.landing
+    position_n, position_e, _ = landing.position
+    landing_position = Point.from_north_east(position_n, position_e,
                               site.launch_point.latitude, site.launch_point.longitude)
     return {
         "時刻/s": round(landing.time, 2),
         "着地点緯度": landing_position.latitude,
         "着地点経度": landing_position.longitude,
         "ダウンレンジ/m": round(
-            math.sqrt(landing.position_n**2 + landing.position_e**2),
+            math.sqrt(position_n**2 + position_e**2),
             2,
         ),
     }
@@ -91,30 +95,54 @@ def stability(config: Config) ->dict:
         "最大値/%": round(max(first_stability, end_stability), 2),
     }
 
-def acceleration(data: pd.DataFrame) ->dict:
-    acc_norm = np.sqrt(data["acceleration_body_frame_x"]**2
-                + data["acceleration_body_frame_y"]**2
-                + data["acceleration_body_frame_z"]**2)
-    max_idx = acc_norm.idxmax()    #acc_normが最大のインデックス
-    max_acc = data.loc[max_idx]  #acc_normが最大の行のデータを取得
+
+def thrust_compression(config: Config) -> dict | None:
+    """読み込み時に間引いた推力の表の誤差(間引いていない場合はNone)"""
+    compression = config.thrust_compression
+    if compression is None:
+        return None
+    return {
+        "元の行数": compression.original_rows,
+        "間引いた後の行数": compression.compressed_rows,
+        "推力の最大誤差/N": round(compression.max_error, 3),
+        "全力積/(N s)": round(compression.total_impulse, 2),
+        "全力積の誤差/%": round(compression.relative_impulse_error * 100, 4),
+    }
+
+
+def acceleration(metrics: FlightMetrics) ->dict:
+    max_acc = metrics.max_acceleration  #加速度の大きさが最大の行
     return {
         "時刻/s": round(max_acc.time, 2),
-        "最大加速度/(m/s^2)": round(acc_norm[max_idx], 2),
-        "高度/m": round(-(max_acc.position_d), 2),
+        "最大加速度/(m/s^2)": round(np.linalg.norm(max_acc.acceleration_body_frame, ord=2), 2),
+        "高度/m": round(-(max_acc.position[2]), 2),
+    }
+
+def timeline(events: list[flight_event.FlightEvent]) -> dict:
+    """ステップ間で補間したイベントの時刻と状態"""
+    return {
+        _EVENT_LABELS[event.name]: {
+            "時刻/s": round(event.time, 2),
+            "高度/m": round(-(event.state.position[2]), 2),
+            "速度/(m/s)": round(np.linalg.norm(event.state.velocity, ord=2), 2),
+        }
+        for event in events
     }
 
-def make_dict(result: ResultForReport, site: LaunchSite, config: Config) -> dict:
-    ideal_launch_clear = launch_clear(result.result_ideal_parachute_off, result.context_nominal)
-    ideal_dynamic_pressure = dynamic_pressure(result.result_ideal_parachute_off, through_all_time=False)
-    ideal_max_altitude = max_altitude(result.result_ideal_parachute_off)
-    ideal_landing = landing(result.result_ideal_parachute_off, site)
-    ideal_acceleration = acceleration(result.result_ideal_parachute_off)
-    nominal_launch_clear = launch_clear(result.result_nominal_parachute_off, result.context_nominal)
-    nominal_dynamic_pressure = dynamic_pressure(result.result_nominal_parachute_off, through_all_time=False)
-    nominal_max_altitude = max_altitude(result.result_nominal_parachute_off)
-    nominal_landing = landing(result.result_nominal_parachute_off, site)
+def make_dict(result: ResultForReport, site: LaunchSite, config: Config, wind_limit: pd.DataFrame | None) -> dict:
+    ideal_launch_clear = launch_clear(result.metrics_ideal_parachute_off, wind_limit)
+    ideal_dynamic_pressure = dynamic_pressure(result.metrics_ideal_parachute_off, through_all_time=False)
+    ideal_max_altitude = max_altitude(result.metrics_ideal_parachute_off)
+    ideal_landing = landing(result.metrics_ideal_parachute_off, site)
+    ideal_acceleration = acceleration(result.metrics_ideal_parachute_off)
+    nominal_launch_clear = launch_clear(result.metrics_nominal_parachute_off, wind_limit)
+    nominal_dynamic_pressure = dynamic_pressure(result.metrics_nominal_parachute_off, through_all_time=False)
+    nominal_max_altitude = max_altitude(result.metrics_nominal_parachute_off)
+    nominal_landing = landing(result.metrics_nominal_parachute_off, site)
     nominal_stability = stability(config)
-    nominal_acceleration = acceleration(result.result_nominal_parachute_off)
+    nominal_acceleration = acceleration(result.metrics_nominal_parachute_off)
+    ideal_timeline = timeline(result.events_ideal_parachute_on)
+    nominal_timeline = timeline(result.events_nominal_parachute_on)
 
     return {
     "ideal_launch_clear": ideal_launch_clear,
@@ -128,4 +156,7 @@ def make_dict(result: ResultForReport, site: LaunchSite, config: Config) -> dict
     "nominal_landing": nominal_landing,
     "nominal_stability": nominal_stability,
     "nominal_acceleration": nominal_acceleration,
+    "ideal_timeline": ideal_timeline,
+    "nominal_timeline": nominal_timeline,
+    "thrust_compression": thrust_compression(config),
     }
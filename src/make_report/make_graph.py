@@ -1,15 +1,37 @@
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import japanize_matplotlib  # noqa: F401
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-from matplotlib.figure import Figure
 
+from src.core.phase_index import PhaseIndex
 from src.geography.launch_site import LaunchSite
 
 from .result_for_report import ResultByLauncherElevation, ResultByWindSpeed, ResultForReport, SimulationContext
 
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from matplotlib.figure import Figure
+
+
+def pyplot() -> "ModuleType":
+    """描画に用いるmatplotlib.pyplotを読み込む
+
+    シミュレーションだけを行うプロセスが描画のライブラリを読み込まないように、初めて描画する際に読み込む。
+    画面のない環境でも同じように描画できるようにAggバックエンドを用いる。
+
+    Returns:
+        ModuleType: matplotlib.pyplot
+    """
+    import matplotlib as mpl  # noqa: PLC0415
+
+    mpl.use("Agg")
+    import japanize_matplotlib  # noqa: F401, PLC0415
+    from matplotlib import pyplot as plt  # noqa: PLC0415
+
+    return plt
+
 
 def to_cycle(x: list[float]) -> list[float]:
     return [*x, x[0]]
@@ -17,36 +39,34 @@ def to_cycle(x: list[float]) -> list[float]:
 
 @dataclass
 class Graphs:
-    ideal_dynamic_pressure: Figure
-    ideal_air_velocity_figure: Figure
-    ideal_altitude_downrange_figure: Figure
-    ideal_time_altitude_figure: Figure
-    ideal_landing_figure: Figure
-    ideal_stability_figure: Figure
-    ideal_acceleration_figure: Figure
-    ideal_rotation_figure: Figure
-    nominal_dynamic_pressure: Figure
-    nominal_air_velocity_figure: Figure
-    nominal_altitude_downrange_figure: Figure
-    nominal_time_altitude_figure: Figure
-    nominal_landing_figure: Figure
-    nominal_acceleration_figure: Figure
-    nominal_rotation_figure: Figure
-    nominal_wind_figure: Figure
-    fall_dispersion_figure_parachute_off: dict[float, Figure]
-    fall_dispersion_figure_parachute_on: dict[float, Figure]
-
-
-def burning_coasting_division(data: pd.DataFrame) -> pd.DataFrame:
-    burning = data[data["burning"]]
-    coasting = data[~data["burning"]]
-    return burning, coasting
-
-
-def dynamic_pressure_figure(data: pd.DataFrame) -> Figure:
-    fig, ax = plt.subplots()
-    burning, coasting = burning_coasting_division(data)
-    fig, ax = plt.subplots()
+    ideal_dynamic_pressure: "Figure"
+    ideal_air_velocity_figure: "Figure"
+    ideal_altitude_downrange_figure: "Figure"
+    ideal_time_altitude_figure: "Figure"
+    ideal_landing_figure: "Figure"
+    ideal_stability_figure: "Figure"
+    ideal_acceleration_figure: "Figure"
+    ideal_rotation_figure: "Figure"
+    nominal_dynamic_pressure: "Figure"
+    nominal_air_velocity_figure: "Figure"
+    nominal_altitude_downrange_figure: "Figure"
+    nominal_time_altitude_figure: "Figure"
+    nominal_landing_figure: "Figure"
+    nominal_acceleration_figure: "Figure"
+    nominal_rotation_figure: "Figure"
+    nominal_wind_figure: "Figure"
+    fall_dispersion_figure_parachute_off: "dict[float, Figure]"
+    fall_dispersion_figure_parachute_on: "dict[float, Figure]"
+
+
+def burning_coasting_division(data: pd.DataFrame, phases: PhaseIndex) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """燃焼中と燃焼終了後の行をコピーせずに取り出す"""
+    return data.iloc[phases.burn], data.iloc[phases.after_burnout]
+
+
+def dynamic_pressure_figure(data: pd.DataFrame, phases: PhaseIndex) -> "Figure":
+    burning, coasting = burning_coasting_division(data, phases)
+    fig, ax = pyplot().subplots()
     ax.plot(burning["time"], burning["dynamic_pressure"], label="burning")
     ax.plot(coasting["time"], coasting["dynamic_pressure"], label="coasting")
     ax.legend()
@@ -56,9 +76,9 @@ def dynamic_pressure_figure(data: pd.DataFrame) -> Figure:
     return fig
 
 
-def air_velocity_figure(data: pd.DataFrame) -> Figure:
-    burning, coasting = burning_coasting_division(data)
-    fig, ax = plt.subplots()
+def air_velocity_figure(data: pd.DataFrame, phases: PhaseIndex) -> "Figure":
+    burning, coasting = burning_coasting_division(data, phases)
+    fig, ax = pyplot().subplots()
     ax.plot(burning["time"], burning["velocity_air_body_frame_x"], label="x burning")
     ax.plot(burning["time"], burning["velocity_air_body_frame_y"], label="y burning")
     ax.plot(burning["time"], burning["velocity_air_body_frame_z"], label="z burning")
@@ -72,9 +92,9 @@ def air_velocity_figure(data: pd.DataFrame) -> Figure:
     return fig
 
 
-def time_altitude_figure(data: pd.DataFrame) -> Figure:
-    burning, coasting = burning_coasting_division(data)
-    fig, ax = plt.subplots()
+def time_altitude_figure(data: pd.DataFrame, phases: PhaseIndex) -> "Figure":
+    burning, coasting = burning_coasting_division(data, phases)
+    fig, ax = pyplot().subplots()
     ax.plot(burning["time"], -burning["position_d"], label="burning")
     ax.plot(coasting["time"], -coasting["position_d"], label="coasting")
     ax.set_xlabel("時刻/s")
@@ -84,8 +104,8 @@ def time_altitude_figure(data: pd.DataFrame) -> Figure:
     return fig
 
 
-def altitude_downrange_figure(data: pd.DataFrame) -> Figure:
-    burning, coasting = burning_coasting_division(data)
+def altitude_downrange_figure(data: pd.DataFrame, phases: PhaseIndex) -> "Figure":
+    burning, coasting = burning_coasting_division(data, phases)
 
     def downrange(row: pd.Series) -> float:
         return (row["position_n"] ** 2 + row["position_e"] ** 2) ** 0.5
@@ -93,7 +113,7 @@ def altitude_downrange_figure(data: pd.DataFrame) -> Figure:
     def altitude(row: pd.Series) -> float:
         return -row["position_d"]
 
-    fig, ax = plt.subplots()
+    fig, ax = pyplot().subplots()
     ax.plot(burning.apply(downrange, axis=1), burning.apply(altitude, axis=1), label="burning")
     ax.plot(coasting.apply(downrange, axis=1), coasting.apply(altitude, axis=1), label="coasting")
     ax.legend()
@@ -103,8 +123,8 @@ def altitude_downrange_figure(data: pd.DataFrame) -> Figure:
     return fig
 
 
-def landing_figure(data: pd.DataFrame, site: LaunchSite) -> Figure:
-    fig, ax = plt.subplots()
+def landing_figure(data: pd.DataFrame, site: LaunchSite) -> "Figure":
+    fig, ax = pyplot().subplots()
     ax.scatter(0, 0, label="射点")
     ax.plot(to_cycle(site.points_east()), to_cycle(site.points_north()), label="落下可能域")
     landing = data.iloc[-1]
@@ -116,9 +136,9 @@ def landing_figure(data: pd.DataFrame, site: LaunchSite) -> Figure:
     return fig
 
 
-def stability_figure(result: ResultForReport, data: pd.DataFrame) -> Figure:
-    fig, ax = plt.subplots()
-    burning, coasting = burning_coasting_division(data)
+def stability_figure(result: ResultForReport, data: pd.DataFrame, phases: PhaseIndex) -> "Figure":
+    fig, ax = pyplot().subplots()
+    burning, coasting = burning_coasting_division(data, phases)
     times_burning = burning["time"]
     times_coasting = coasting["time"]
     # 各時刻における重心位置を取得
@@ -138,11 +158,11 @@ def stability_figure(result: ResultForReport, data: pd.DataFrame) -> Figure:
     return fig
 
 
-def wind_figure(context: SimulationContext) -> Figure:
+def wind_figure(context: SimulationContext) -> "Figure":
     altitude = np.arange(0, 500, 1)
     # 各高度における風速ベクトルの絶対値（速さ）を計算
-    wind_speed = np.array([np.linalg.norm(context.wind(alt)) for alt in altitude])
-    fig, ax = plt.subplots()
+    wind_speed = np.linalg.norm(context.wind_batch(altitude), axis=1)
+    fig, ax = pyplot().subplots()
     ax.plot(wind_speed, altitude)
     ax.set_ylabel("高度/m")
     ax.set_xlabel("風速/(m/s)")
@@ -150,9 +170,9 @@ def wind_figure(context: SimulationContext) -> Figure:
     return fig
 
 
-def acceleration_figure(data: pd.DataFrame) -> Figure:
-    burning, coasting = burning_coasting_division(data)
-    fig, ax = plt.subplots()
+def acceleration_figure(data: pd.DataFrame, phases: PhaseIndex) -> "Figure":
+    burning, coasting = burning_coasting_division(data, phases)
+    fig, ax = pyplot().subplots()
     ax.plot(burning["time"], burning["acceleration_body_frame_x"], label="x burning")
     ax.plot(burning["time"], burning["acceleration_body_frame_y"], label="y burning")
     ax.plot(burning["time"], burning["acceleration_body_frame_z"], label="z burning")
@@ -166,9 +186,9 @@ def acceleration_figure(data: pd.DataFrame) -> Figure:
     return fig
 
 
-def rotation_figure(data: pd.DataFrame) -> Figure:
-    burning, coasting = burning_coasting_division(data)
-    fig, ax = plt.subplots()
+def rotation_figure(data: pd.DataFrame, phases: PhaseIndex) -> "Figure":
+    burning, coasting = burning_coasting_division(data, phases)
+    fig, ax = pyplot().subplots()
     ax.plot(burning["time"], burning["rotation_n"], label="n burning")
     ax.plot(burning["time"], burning["rotation_e"], label="e burning")
     ax.plot(burning["time"], burning["rotation_d"], label="d burning")
@@ -187,8 +207,8 @@ def fall_dispersion_figure(
     site: LaunchSite,
     *,
     parachute: bool,
-) -> Figure:
-    fig, ax = plt.subplots()
+) -> "Figure":
+    fig, ax = pyplot().subplots()
     ax.scatter(0, 0, label="射点")
     ax.plot(
         to_cycle(site.points_east()),
@@ -226,8 +246,8 @@ def generate_all_fall_dispersion_figures(
     site: LaunchSite,
     *,
     parachute: bool,
-) -> dict[float, Figure]:
-    def figure(result_by_elevation: ResultByLauncherElevation) -> Figure:
+) -> "dict[float, Figure]":
+    def figure(result_by_elevation: ResultByLauncherElevation) -> "Figure":
         wind_results = result_by_elevation.result
         return fall_dispersion_figure(
             result_by_wind_speed=wind_results,
@@ -242,22 +262,24 @@ def generate_all_fall_dispersion_figures(
 
 
 def make_graph(result: ResultForReport, site: LaunchSite) -> Graphs:
+    ideal = (result.result_ideal_parachute_off, result.phases_ideal_parachute_off)
+    nominal = (result.result_nominal_parachute_off, result.phases_nominal_parachute_off)
     return Graphs(
-        ideal_dynamic_pressure=dynamic_pressure_figure(result.result_ideal_parachute_off),
-        ideal_air_velocity_figure=air_velocity_figure(result.result_ideal_parachute_off),
-        ideal_altitude_downrange_figure=altitude_downrange_figure(result.result_ideal_parachute_off),
-        ideal_time_altitude_figure=time_altitude_figure(result.result_ideal_parachute_off),
+        ideal_dynamic_pressure=dynamic_pressure_figure(*ideal),
+        ideal_air_velocity_figure=air_velocity_figure(*ideal),
+        ideal_altitude_downrange_figure=altitude_downrange_figure(*ideal),
+        ideal_time_altitude_figure=time_altitude_figure(*ideal),
         ideal_landing_figure=landing_figure(result.result_ideal_parachute_off, site),
-        ideal_stability_figure=stability_figure(result, result.result_ideal_parachute_off),
-        ideal_acceleration_figure=acceleration_figure(result.result_ideal_parachute_off),
-        ideal_rotation_figure=rotation_figure(result.result_ideal_parachute_off),
-        nominal_dynamic_pressure=dynamic_pressure_figure(result.result_nominal_parachute_off),
-        nominal_air_velocity_figure=air_velocity_figure(result.result_nominal_parachute_off),
-        nominal_altitude_downrange_figure=altitude_downrange_figure(result.result_nominal_parachute_off),
-        nominal_time_altitude_figure=time_altitude_figure(result.result_nominal_parachute_off),
+        ideal_stability_figure=stability_figure(result, *ideal),
+        ideal_acceleration_figure=acceleration_figure(*ideal),
+        ideal_rotation_figure=rotation_figure(*ideal),
+        nominal_dynamic_pressure=dynamic_pressure_figure(*nominal),
+        nominal_air_velocity_figure=air_velocity_figure(*nominal),
+        nominal_altitude_downrange_figure=altitude_downrange_figure(*nominal),
+        nominal_time_altitude_figure=time_altitude_figure(*nominal),
         nominal_landing_figure=landing_figure(result.result_nominal_parachute_off, site),
-        nominal_acceleration_figure=acceleration_figure(result.result_nominal_parachute_off),
-        nominal_rotation_figure=rotation_figure(result.result_nominal_parachute_off),
+        nominal_acceleration_figure=acceleration_figure(*nominal),
+        nominal_rotation_figure=rotation_figure(*nominal),
         nominal_wind_figure=wind_figure(result.context_nominal),
         fall_dispersion_figure_parachute_off=generate_all_fall_dispersion_figures(result, site, parachute=False),
         fall_dispersion_figure_parachute_on=generate_all_fall_dispersion_figures(result, site, parachute=True),
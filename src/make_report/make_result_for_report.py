@@ -1,14 +1,18 @@
-import copy
 import itertools
-from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
-import pandas as pd
-
-from src.core import simple_simulation
 from src.core.config import Config
+from src.core.phase_index import PhaseIndex
 from src.core.simulation_context import SimulationContext
 from src.make_report.result_for_report import ResultForReport
+from src.make_report.simulation_worker import (
+    Backend,
+    RunResult,
+    Setting,
+    changed_config,
+    run_concurrent_timed,
+    simulate_many,
+)
 
 
 @dataclass
@@ -19,45 +23,39 @@ class ReportConfig:
     wind_speed_list: list[float]
     wind_direction_list: list[float]
     launcher_elevation_list: list[float]
-
-
-@dataclass
-class Setting:
-    launcher_elevation: float
-    wind_speed: float
-    wind_direction: float
-
-
-def changed_config(original: Config, setting: Setting) -> Config:
-    config = copy.deepcopy(original)
-    config.first_elevation = setting.launcher_elevation
-    config.wind.wind_speed = setting.wind_speed
-    config.wind.wind_direction = setting.wind_direction
-    return config
-
-
-def run(config: Config, setting: Setting) -> tuple[pd.DataFrame, pd.DataFrame]:
-    config = changed_config(config, setting)
-    results = simple_simulation.simulate(config)
-    return (results[0].to_df(), results[1].to_df())
+    dispersion_landing_only: bool = False
+    """風速と風向の組み合わせごとの計算で着地点などの要約だけを求めるか"""
+    wind_limit_search: bool = True
+    """風向ごとの風速制限を探索するか"""
+    wind_limit_angle_of_attack: float = 20.0
+    """風速制限を決めるランチクリア時の迎角の上限[deg]"""
+    wind_limit_dynamic_pressure: float | None = None
+    """風速制限を決める最大動圧の上限[Pa](Noneの場合は制約しない)"""
+    wind_limit_landing_margin: float = 0.0
+    """風速制限を決める落下可能域の境界から必要な距離[m]"""
+    wind_limit_max_speed: float = 20.0
+    """風速制限を探索する最大の風速[m/s]"""
 
 
 def run_concurrent(
     config: Config,
     settings: list[Setting],
-) -> list[tuple[pd.DataFrame, pd.DataFrame]]:
+    backend: Backend = "process",
+    max_workers: int | None = None,
+) -> list[RunResult]:
     """シミュレーションを並列で実行する
 
     Args:
         config (Config): コンフィグ
         settings (list[Setting]): シミュレーションの設定リスト
+        backend (Backend): 実行方法(simulate_manyを参照)
+        max_workers (int | None): 並列に実行する数(Noneの場合はCPU数)
 
     Returns:
-        list[Wind]: シミュレーション結果のリスト。
+        list[RunResult]: シミュレーション結果のリスト。
             wind_speed_direction_pairsの順番に対応している。
     """
-    with ProcessPoolExecutor() as executor:
-        return list(executor.map(run, [config] * len(settings), settings))
+    return simulate_many(settings, config=config, backend=backend, max_workers=max_workers)
 
 
 def make_result_for_report(
@@ -87,11 +85,12 @@ def make_result_for_report(
             launcher_elevation=launcher_elevation,
             wind_speed=wind_speed,
             wind_direction=wind_direction,
+            landing_only=report_config.dispersion_landing_only,
         )
         for launcher_elevation, wind_speed, wind_direction in settings_list
     ]
     settings = [setting_ideal, setting_nominal, *settings_wind]
-    results = run_concurrent(config, settings)
+    results, pool_timing = run_concurrent_timed(config, settings)
     result_ideal = results[0]
     result_nominal = results[1]
 
@@ -101,18 +100,33 @@ def make_result_for_report(
     body = ResultForReport(
         config_nominal=config_nominal,
         context_nominal=context_nominal,
-        result_ideal_parachute_off=result_ideal[0],
-        result_ideal_parachute_on=result_ideal[1],
-        result_nominal_parachute_off=result_nominal[0],
-        result_nominal_parachute_on=result_nominal[1],
+        result_ideal_parachute_off=result_ideal.result_parachute_off,
+        result_ideal_parachute_on=result_ideal.result_parachute_on,
+        result_nominal_parachute_off=result_nominal.result_parachute_off,
+        result_nominal_parachute_on=result_nominal.result_parachute_on,
         result_by_launcher_elevation=[],
+        metrics_ideal_parachute_off=result_ideal.metrics_parachute_off,
+        metrics_nominal_parachute_off=result_nominal.metrics_parachute_off,
+        events_ideal_parachute_off=result_ideal.events_parachute_off,
+        events_ideal_parachute_on=result_ideal.events_parachute_on,
+        events_nominal_parachute_off=result_nominal.events_parachute_off,
+        events_nominal_parachute_on=result_nominal.events_parachute_on,
+        phases_ideal_parachute_off=PhaseIndex.from_events(
+            result_ideal.result_parachute_off["time"].to_numpy(),
+            result_ideal.events_parachute_off,
+        ),
+        phases_nominal_parachute_off=PhaseIndex.from_events(
+            result_nominal.result_parachute_off["time"].to_numpy(),
+            result_nominal.events_parachute_off,
+        ),
+        pool_timing=pool_timing,
     )
     for setting, result in zip(settings[2:], results[2:], strict=False):
         body.append(
             wind_speed=setting.wind_speed,
             wind_direction=setting.wind_direction,
             launcher_elevation=setting.launcher_elevation,
-            result_parachute_off=result[0],
-            result_parachute_on=result[1],
+            result_parachute_off=result.result_parachute_off,
+            result_parachute_on=result.result_parachute_on,
         )
     return body
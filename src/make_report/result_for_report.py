@@ -3,7 +3,11 @@ from dataclasses import dataclass
 import pandas as pd
 
 from src.core.config import Config
+from src.core.flight_event import FlightEvent
+from src.core.flight_metrics import FlightMetrics
+from src.core.phase_index import PhaseIndex
 from src.core.simulation_context import SimulationContext
+from src.make_report.simulation_worker import PoolTiming
 
 
 @dataclass
@@ -70,6 +74,16 @@ class ResultForReport:
     result_nominal_parachute_off: pd.DataFrame
     result_nominal_parachute_on: pd.DataFrame
     result_by_launcher_elevation: list[ResultByLauncherElevation]
+    metrics_ideal_parachute_off: FlightMetrics
+    metrics_nominal_parachute_off: FlightMetrics
+    events_ideal_parachute_off: list[FlightEvent]
+    events_ideal_parachute_on: list[FlightEvent]
+    events_nominal_parachute_off: list[FlightEvent]
+    events_nominal_parachute_on: list[FlightEvent]
+    phases_ideal_parachute_off: PhaseIndex
+    phases_nominal_parachute_off: PhaseIndex
+    pool_timing: PoolTiming | None = None
+    """風速と風向の組み合わせごとの並列計算の所要時間"""
 
     def append(
         self,
@@ -0,0 +1,380 @@
+import contextlib
+import copy
+import functools
+import multiprocessing
+import os
+import time
+import typing
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from src.core import point_mass, simple_simulation, wind
+from src.core.config import Config
+from src.core.flight_event import FlightEvent
+from src.core.flight_metrics import FlightMetrics
+from src.core.flight_summary import FlightSummary
+from src.core.simulation_context import SimulationContext
+from src.core.simulation_result import SimulationResult
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
+
+# 並列計算のワーカーはこのモジュールだけを読み込むため、src.core以外(描画やレポートの作成)に依存しない。
+# ワーカーにはDataFrameを持つConfigではなく配列だけを持つSimulationContextを送り、結果も配列のまま返して
+# 親のプロセスでDataFrameに変換するため、ワーカーはpandasを読み込まない
+
+
+@dataclass
+class Setting:
+    launcher_elevation: float
+    wind_speed: float
+    wind_direction: float
+    landing_only: bool = False
+    """軌道を記録せずに着地点などの要約だけを求めるか"""
+
+
+def changed_config(original: Config, setting: Setting) -> Config:
+    config = copy.deepcopy(original)
+    config.first_elevation = setting.launcher_elevation
+    config.wind.wind_speed = setting.wind_speed
+    config.wind.wind_direction = setting.wind_direction
+    # 風速と風向の組み合わせごとの計算はべき法則の風で行う
+    config.wind_profile = None
+    return config
+
+
+def changed_context(original: SimulationContext, setting: Setting) -> SimulationContext:
+    """changed_configと同じ変更を作成済みのSimulationContextに行う
+
+    表を読み込み直さないため、ワーカーではコンフィグではなくこちらを用いる。
+
+    Args:
+        original (SimulationContext): 変更前のコンテキスト(書き換えない)
+        setting (Setting): 設定
+
+    Returns:
+        SimulationContext: 変更したコピー
+    """
+    context = copy.copy(original)
+    context.first_elevation = setting.launcher_elevation
+    power = original.wind_power
+    context.wind = wind.wind_velocity_power(
+        power.reference_height,
+        setting.wind_speed,
+        power.exponent,
+        setting.wind_direction,
+    )
+    context.wind_batch = wind.wind_velocity_power_batch(
+        power.reference_height,
+        setting.wind_speed,
+        power.exponent,
+        setting.wind_direction,
+    )
+    return context
+
+
+@dataclass
+class RunResult:
+    result_parachute_off: "pd.DataFrame"
+    result_parachute_on: "pd.DataFrame"
+    metrics_parachute_off: FlightMetrics | None = None
+    """レポート用の飛行指標(landing_onlyの場合はNone)"""
+    metrics_parachute_on: FlightMetrics | None = None
+    """レポート用の飛行指標(landing_onlyの場合はNone)"""
+    events_parachute_off: list[FlightEvent] = field(default_factory=list)
+    """飛行中のイベント(landing_onlyの場合は空)"""
+    events_parachute_on: list[FlightEvent] = field(default_factory=list)
+    """飛行中のイベント(landing_onlyの場合は空)"""
+
+
+_RawResult = tuple[SimulationResult, SimulationResult] | tuple[FlightSummary, FlightSummary]
+"""ワーカーから返すDataFrameに変換する前の結果"""
+
+
+def _simulate_context(context: SimulationContext, *, landing_only: bool) -> _RawResult:
+    if landing_only:
+        return simple_simulation.predict_landing(context, 0, simple_simulation.initial_state(context), fast=False)
+    return simple_simulation.simulate_context(context)
+
+
+def _to_run_result(results: _RawResult) -> RunResult:
+    """ワーカーの結果をDataFrameに変換する(親のプロセスで呼ぶ)"""
+    parachute_off, parachute_on = results
+    if isinstance(parachute_off, FlightSummary):
+        return RunResult(parachute_off.to_df(), parachute_on.to_df())
+    parachute_off = typing.cast("SimulationResult", parachute_off)
+    parachute_on = typing.cast("SimulationResult", parachute_on)
+    return RunResult(
+        parachute_off.to_df(),
+        parachute_on.to_df(),
+        parachute_off.metrics,
+        parachute_on.metrics,
+        parachute_off.events,
+        parachute_on.events,
+    )
+
+
+def simulate_config(config: Config, *, landing_only: bool = False) -> RunResult:
+    """コンフィグをそのまま用いてシミュレーションする
+
+    Args:
+        config (Config): コンフィグ
+        landing_only (bool): 軌道を記録せずに着地点などの要約だけを求めるか
+
+    Returns:
+        RunResult: シミュレーション結果
+    """
+    return _to_run_result(_simulate_context(SimulationContext(config), landing_only=landing_only))
+
+
+def run(config: Config, setting: Setting) -> RunResult:
+    return simulate_config(changed_config(config, setting), landing_only=setting.landing_only)
+
+
+Backend = typing.Literal["serial", "thread", "process", "batched"]
+"""simulate_manyの実行方法"""
+BACKENDS: tuple[str, ...] = typing.get_args(Backend)
+
+ProgressCallback = typing.Callable[[int, int], None]
+"""完了した数と全体の数を受け取る関数"""
+
+BLAS_THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
+"""BLASのスレッド数を決める環境変数"""
+
+
+@dataclass
+class PoolTiming:
+    """並列計算の所要時間"""
+
+    startup: float = 0.0
+    """プールの作成から全てのワーカーがコンフィグを受け取るまでの時間[s]"""
+    total: float = 0.0
+    """プールの作成から全ての結果が揃うまでの時間[s]"""
+    workers: int = 0
+    """計算を行ったワーカーの数"""
+    tasks: int = 0
+    """計算した設定の数"""
+
+
+@dataclass
+class _WorkerState:
+    """ワーカーのプロセスごとに1度だけ受け取るコンテキスト"""
+
+    context: SimulationContext | None = None
+    ready: float = 0.0
+    """コンテキストを受け取った時刻"""
+
+
+_worker = _WorkerState()
+
+
+def _initialize(context: SimulationContext | None) -> None:
+    """ワーカーの起動時にコンテキストを受け取る(設定ごとにコンテキストを送らないようにする)"""
+    _worker.context = context
+    _worker.ready = time.time()
+
+
+def _evaluate(
+    context: SimulationContext | None,
+    task: Config | SimulationContext | Setting,
+    *,
+    landing_only: bool,
+) -> _RawResult:
+    """Settingはcontextを変更して、ConfigとSimulationContextはそのまま計算する"""
+    if isinstance(task, Setting):
+        return _simulate_context(
+            changed_context(typing.cast("SimulationContext", context), task),
+            landing_only=task.landing_only,
+        )
+    if isinstance(task, Config):
+        task = SimulationContext(task)
+    return _simulate_context(task, landing_only=landing_only)
+
+
+def _evaluate_in_worker(task: SimulationContext | Setting, *, landing_only: bool) -> tuple[_RawResult, float]:
+    """ワーカーが受け取ったコンテキストで計算し、結果とワーカーの準備が終わった時刻を返す"""
+    return _evaluate(_worker.context, task, landing_only=landing_only), _worker.ready
+
+
+@contextlib.contextmanager
+def _blas_threads(threads: int | None) -> Iterator[None]:
+    """この間に起動した子プロセスのBLASのスレッド数を制限する"""
+    if threads is None:
+        yield
+        return
+    saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+    os.environ.update(dict.fromkeys(BLAS_THREAD_VARIABLES, str(threads)))
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _collect(results: typing.Iterable[typing.Any], total: int, progress: ProgressCallback | None) -> list[typing.Any]:
+    """順に結果を受け取り、1つ受け取るごとにprogressを呼ぶ"""
+    collected = []
+    for result in results:
+        collected.append(result)
+        if progress is not None:
+            progress(len(collected), total)
+    return collected
+
+
+def _run_processes(
+    config: Config | None,
+    tasks: Sequence[Config | Setting],
+    *,
+    landing_only: bool,
+    max_workers: int | None,
+    progress: ProgressCallback | None,
+    blas_threads: int | None,
+) -> tuple[list[RunResult], PoolTiming]:
+    """プロセスのプールで計算し、所要時間を計測する"""
+    # ワーカーがpandasを読み込まないように、コンフィグは親のプロセスでSimulationContextに変換してから送る
+    context = None if config is None else SimulationContext(config)
+    prepared = [task if isinstance(task, Setting) else SimulationContext(task) for task in tasks]
+    # 起動済みのBLASのスレッド数は環境変数では変わらないため、制限する場合は新しいインタプリタでワーカーを起動する
+    mp_context = None if blas_threads is None else multiprocessing.get_context("spawn")
+    start = time.time()
+    with (
+        ProcessPoolExecutor(
+            max_workers, mp_context=mp_context, initializer=_initialize, initargs=(context,)
+        ) as executor,
+        _blas_threads(blas_threads),
+    ):
+        # mapは全てのタスクを投入してから返るため、環境変数を変えている間にワーカーが起動する
+        outputs = executor.map(functools.partial(_evaluate_in_worker, landing_only=landing_only), prepared)
+        outputs = _collect(outputs, len(tasks), progress)
+    ready = {worker_ready for _, worker_ready in outputs}
+    timing = PoolTiming(
+        startup=max(ready) - start if ready else 0.0,
+        total=time.time() - start,
+        workers=len(ready),
+        tasks=len(tasks),
+    )
+    return [_to_run_result(output) for output, _ in outputs], timing
+
+
+def _run_batched(
+    config: Config | None,
+    tasks: Sequence[Config | Setting],
+    *,
+    landing_only: bool,
+    progress: ProgressCallback | None,
+) -> list[RunResult]:
+    """3自由度の質点モデルで全ての設定をまとめて計算する"""
+    configs = [
+        changed_config(typing.cast("Config", config), task) if isinstance(task, Setting) else task for task in tasks
+    ]
+    if not all(task.landing_only if isinstance(task, Setting) else landing_only for task in tasks):
+        err_msg = "batchedは着地点などの要約だけを求める場合にのみ用いることができます"
+        raise ValueError(err_msg)
+    if not configs:
+        return []
+    parachute_off, parachute_on = point_mass.simulate_summary_batch(configs)
+    results = [RunResult(off.to_df(), on.to_df()) for off, on in zip(parachute_off, parachute_on, strict=True)]
+    if progress is not None:
+        progress(len(results), len(results))
+    return results
+
+
+def simulate_many(
+    tasks: Sequence[Config | Setting],
+    *,
+    config: Config | None = None,
+    backend: Backend = "process",
+    max_workers: int | None = None,
+    progress: ProgressCallback | None = None,
+    blas_threads: int | None = None,
+    landing_only: bool = False,
+) -> list[RunResult]:
+    """複数の設定のシミュレーションを指定した方法で実行する
+
+    どの方法でも結果はtasksの順に並び、計算中の例外はtasksの順で最初に失敗したものをそのまま送出する。
+    progressは結果をtasksの順に受け取るごとに呼ぶ(batchedは全て終わった時に1度だけ呼ぶ)。
+
+    - serial: このスレッドで順に計算する
+    - thread: スレッドのプールで計算する。GILのないPythonのビルドか、GILを解放するnumpyの計算が多い場合に速くなる
+    - process: プロセスのプールで計算する。configはSimulationContextに変換してワーカーごとに1度だけ送る。
+      ワーカーはpandasを読み込まず、結果は親のプロセスでDataFrameに変換する
+    - batched: 3自由度の質点モデル(point_mass)で全ての設定をまとめて計算する。
+      着地点などの要約だけを求める場合に限り、6自由度のモデルとは結果がわずかに異なる
+
+    Args:
+        tasks (Sequence[Config | Setting]): 計算するコンフィグ、またはconfigを変更する設定のリスト
+        config (Config | None): Settingを適用するコンフィグ(tasksがConfigだけの場合は不要)
+        backend (Backend): 実行方法
+        max_workers (int | None): threadとprocessで並列に実行する数(Noneの場合はCPU数)
+        progress (ProgressCallback | None): 完了した数と全体の数を受け取る関数
+        blas_threads (int | None): processのワーカーでのBLASのスレッド数(ワーカー数 x BLASのスレッド数が
+            CPU数を超えないように制限する。指定した場合はワーカーをspawnで起動する。Noneの場合は制限しない)。
+            読み込み済みのBLASのスレッド数は環境変数では変わらないため、process以外では指定できない
+        landing_only (bool): tasksのConfigを着地点などの要約だけ求めるか(Settingはそれぞれのlanding_onlyに従う)
+
+    Returns:
+        list[RunResult]: tasksの順の結果
+
+    Raises:
+        ValueError: 未知のbackendの場合、SettingがあるのにconfigがNoneの場合、process以外でblas_threadsを指定した場合、
+            batchedで軌道全体を求めようとした場合や、batchedで風の分布か空力係数の表を用いる場合
+    """
+    if backend not in BACKENDS:
+        err_msg = f"backendは{', '.join(BACKENDS)}のいずれかである必要があります"
+        raise ValueError(err_msg, backend)
+    if blas_threads is not None and backend != "process":
+        err_msg = "blas_threadsはprocessでのみ指定できます"
+        raise ValueError(err_msg, backend)
+    if config is None and any(isinstance(task, Setting) for task in tasks):
+        err_msg = "Settingを計算するにはconfigが必要です"
+        raise ValueError(err_msg)
+    if backend == "batched":
+        return _run_batched(config, tasks, landing_only=landing_only, progress=progress)
+    if backend == "process":
+        return _run_processes(
+            config,
+            tasks,
+            landing_only=landing_only,
+            max_workers=max_workers,
+            progress=progress,
+            blas_threads=blas_threads,
+        )[0]
+    context = None if config is None else SimulationContext(config)
+    evaluate = functools.partial(_evaluate, context, landing_only=landing_only)
+    if backend == "serial":
+        outputs = _collect(map(evaluate, tasks), len(tasks), progress)
+    else:
+        with ThreadPoolExecutor(max_workers or os.cpu_count()) as executor:
+            outputs = _collect(executor.map(evaluate, tasks), len(tasks), progress)
+    return [_to_run_result(output) for output in outputs]
+
+
+def run_concurrent_timed(
+    config: Config,
+    settings: list[Setting],
+    max_workers: int | None = None,
+) -> tuple[list[RunResult], PoolTiming]:
+    """シミュレーションをプロセスのプールで並列に実行し、所要時間を計測する
+
+    コンフィグはSimulationContextに変換してワーカーの起動時に1度だけ送り、各タスクでは設定だけを送る。
+
+    Args:
+        config (Config): コンフィグ
+        settings (list[Setting]): シミュレーションの設定リスト
+        max_workers (int | None): 並列に実行するプロセス数(Noneの場合はCPU数)
+
+    Returns:
+        tuple[list[RunResult], PoolTiming]: settingsの順の結果と所要時間
+    """
+    return _run_processes(
+        config,
+        settings,
+        landing_only=False,
+        max_workers=max_workers,
+        progress=None,
+        blas_threads=None,
+    )
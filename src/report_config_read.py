@@ -14,4 +14,10 @@ def read(folder_path: Path) -> ReportConfig:
         wind_speed_list=js["wind_speed_list"],
         wind_direction_list=js["wind_direction_list"],
         launcher_elevation_list=js["launcher_elevation_list"],
+        dispersion_landing_only=js.get("dispersion_landing_only", False),
+        wind_limit_search=js.get("wind_limit_search", True),
+        wind_limit_angle_of_attack=js.get("wind_limit_angle_of_attack", 20.0),
+        wind_limit_dynamic_pressure=js.get("wind_limit_dynamic_pressure"),
+        wind_limit_landing_margin=js.get("wind_limit_landing_margin", 0.0),
+        wind_limit_max_speed=js.get("wind_limit_max_speed", 20.0),
     )
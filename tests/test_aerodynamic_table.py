@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.aerodynamic_table import AerodynamicTable
+
+
+class TestAerodynamicTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.df = pd.DataFrame(
+            [
+                {"mach": mach, "alpha": alpha, "CA": 0.4 + 0.2 * mach, "CN": (1 + mach) * alpha / 10}
+                for mach in [0.0, 0.5, 1.5]
+                for alpha in [0.0, 5.0, 10.0, 20.0]
+            ],
+        )
+        self.table = AerodynamicTable.from_df(self.df)
+
+    def test_grid_points(self) -> None:
+        for _, row in self.df.iterrows():
+            ca, cn = self.table.coefficients(row["mach"], np.deg2rad(row["alpha"]))
+            self.assertAlmostEqual(ca, row["CA"])
+            self.assertAlmostEqual(cn, row["CN"])
+
+    def test_bilinear(self) -> None:
+        # 各軸について線形な値は双線形補間で正確に求まる
+        ca, cn = self.table.coefficients(1.0, np.deg2rad(7.5))
+        self.assertAlmostEqual(ca, 0.6)
+        self.assertAlmostEqual(cn, (1 + 1.0) * 7.5 / 10)
+
+    def test_locality(self) -> None:
+        # 前回の位置から離れた値や逆向きに動く値でも正しく求まる
+        rng = np.random.default_rng(0)
+        mach = rng.uniform(-0.5, 2.0, size=200)
+        alpha = np.deg2rad(rng.uniform(-5, 25, size=200))
+        ca_batch, cn_batch = self.table.coefficients_batch(mach, alpha)
+        for i in range(len(mach)):
+            ca, cn = self.table.coefficients(mach[i], alpha[i])
+            self.assertAlmostEqual(ca, ca_batch[i])
+            self.assertAlmostEqual(cn, cn_batch[i])
+
+    def test_out_of_range(self) -> None:
+        ca, cn = self.table.coefficients(3.0, np.deg2rad(30))
+        self.assertAlmostEqual(ca, 0.4 + 0.2 * 1.5)
+        self.assertAlmostEqual(cn, 2.5 * 2)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            AerodynamicTable.from_df(self.df.iloc[1:])
+        with self.assertRaises(ValueError):
+            AerodynamicTable(np.array([0.0]), np.array([0.0, 1.0]), np.zeros((1, 2)), np.zeros((1, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
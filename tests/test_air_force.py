@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 import numpy as np
@@ -252,6 +253,74 @@ class TestAirForce(unittest.TestCase):
         # 力が発生しているか確認
         self.assertTrue(np.linalg.norm(result.force) > 0)
 
+    def test_calculate_batch(self) -> None:
+        """calculate_batchがcalculateと一致することのテスト"""
+        rng = np.random.default_rng(0)
+        states = [
+            RocketState(
+                position=np.array([0.0, 0.0, -z]),
+                velocity=rng.normal(scale=20, size=3),
+                posture=qu.from_euler_angle(e, a, 0.0),
+                rotation=np.zeros(3),
+            )
+            for z, e, a in [(100.0, 5.0, 90.0), (0.0, 80.0, 10.0), (500.0, 45.0, 200.0), (-1.0, 90.0, 0.0)]
+        ]
+        # 横方向の対気速度がほぼ0の場合
+        states.append(
+            RocketState(
+                position=np.zeros(3),
+                velocity=qu.body_to_inertial(qu.from_euler_angle(60.0, 30.0, 0.0), np.array([10.0, 0, 0])),
+                posture=qu.from_euler_angle(60.0, 30.0, 0.0),
+                rotation=np.zeros(3),
+            ),
+        )
+        position = np.array([s.position for s in states])
+        velocity = np.array([s.velocity for s in states])
+        posture = np.array([[s.posture.w, s.posture.x, s.posture.y, s.posture.z] for s in states])
+        for parachute_on in [False, True]:
+            result = af.calculate_batch(position, velocity, posture, self.context, parachute_on=parachute_on)
+            for i, state in enumerate(states):
+                expected = af.calculate(state, self.context, 0.0, parachute_on=parachute_on)
+                np.testing.assert_array_almost_equal(result.force[i], expected.force)
+                self.assertAlmostEqual(result.dynamic_pressure[i], expected.dynamic_pressure)
+                np.testing.assert_array_almost_equal(
+                    result.velocity_air_body_frame[i],
+                    expected.velocity_air_body_frame,
+                )
+
+    def test_calculate_with_aerodynamic_table(self) -> None:
+        """CAが一定でCNが迎角に比例する表はスカラーの係数と一致することのテスト"""
+        alpha = np.arange(0, 181, 10)
+        table = pd.DataFrame(
+            [
+                {"mach": mach, "alpha": a, "CA": self.config.CA, "CN": self.config.CN_alpha * np.deg2rad(a)}
+                for mach in [0.0, 0.5, 2.0]
+                for a in alpha
+            ],
+        )
+        config = copy.deepcopy(self.config)
+        config.aerodynamic_table = table
+        context = SimulationContext(config)
+        rng = np.random.default_rng(1)
+        for _ in range(5):
+            state = RocketState(
+                position=np.array([0.0, 0.0, -100.0]),
+                velocity=rng.normal(scale=50, size=3),
+                posture=qu.from_euler_angle(45.0, 30.0, 0.0),
+                rotation=np.zeros(3),
+            )
+            expected = af.calculate(state, self.context, 0.0, parachute_on=False)
+            result = af.calculate(state, context, 0.0, parachute_on=False)
+            np.testing.assert_array_almost_equal(result.force, expected.force)
+            batch = af.calculate_batch(
+                state.position[np.newaxis],
+                state.velocity[np.newaxis],
+                np.array([[state.posture.w, state.posture.x, state.posture.y, state.posture.z]]),
+                context,
+                parachute_on=False,
+            )
+            np.testing.assert_array_almost_equal(batch.force[0], expected.force)
+
 
 if __name__ == "__main__":
     unittest.main()
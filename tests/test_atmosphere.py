@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.atmosphere import AtmosphereTable, standard_atmosphere
+
+
+class TestAtmosphere(unittest.TestCase):
+    def test_standard_atmosphere(self) -> None:
+        temperature, pressure = standard_atmosphere(np.array([0.0, 11000.0, 20000.0]))
+        np.testing.assert_array_almost_equal(temperature, [288.15, 216.65, 216.65])
+        np.testing.assert_allclose(pressure, [101325.0, 22632.06, 5474.89], rtol=1e-5)
+
+    def test_standard_table(self) -> None:
+        table = AtmosphereTable.standard()
+        self.assertAlmostEqual(table.density(0), 1.225, places=3)
+        self.assertAlmostEqual(table.speed_of_sound(0), 340.29, places=2)
+        # 表の間の値は直接計算した値とほぼ一致する
+        altitude = np.array([123.4, 5678.9, 15000.0])
+        temperature, pressure = standard_atmosphere(altitude)
+        np.testing.assert_allclose(table.temperature_batch(altitude), temperature, rtol=1e-6)
+        np.testing.assert_allclose(table.pressure_batch(altitude), pressure, rtol=1e-6)
+        for i, a in enumerate(altitude):
+            self.assertAlmostEqual(table.pressure(a), table.pressure_batch(altitude)[i])
+        # 範囲外は端の値
+        self.assertEqual(table.density(-10), table.density(0))
+        self.assertEqual(table.density_batch(np.array([1e6]))[0], table.density(1e6))
+
+    def test_from_sounding(self) -> None:
+        sounding = pd.DataFrame(
+            {"temperature": [290.0, 280.0], "pressure": [100000.0, 90000.0]},
+            index=pd.Index([0.0, 1000.0], name="altitude"),
+        )
+        table = AtmosphereTable.from_sounding(sounding)
+        self.assertAlmostEqual(table.temperature(500), 285.0)
+        self.assertAlmostEqual(table.pressure(1000), 90000.0)
+        self.assertAlmostEqual(table.density(0), 100000.0 / (287.05287 * 290.0))
+        with self.assertRaises(ValueError):
+            AtmosphereTable(0.0, 1.0, np.array([290.0]), np.array([100000.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import dataclasses
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import config_cache, config_read
+from src.core import simple_simulation
+from src.core.config import Config
+
+
+class TestConfigCache(unittest.TestCase):
+    def assert_config_equal(self, expected: Config, actual: Config) -> None:
+        for field in dataclasses.fields(Config):
+            left, right = getattr(expected, field.name), getattr(actual, field.name)
+            if isinstance(left, pd.DataFrame):
+                pd.testing.assert_frame_equal(left, right)
+            elif isinstance(left, np.ndarray):
+                np.testing.assert_array_equal(left, right)
+            else:
+                self.assertEqual(left, right, field.name)
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.folder = Path(self.directory.name) / "config"
+        shutil.copytree("config_sample", self.folder)
+        self.cache = self.folder / config_cache.CACHE_DIRECTORY
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_same_as_config_read(self) -> None:
+        expected = config_read.read(self.folder)
+        for _ in range(2):
+            config = config_cache.read(self.folder)
+            self.assert_config_equal(expected, config)
+        self.assertFalse(config.thrust["thrust"].to_numpy().flags.writeable)
+        self.assertIs(type(config.wind_center), np.ndarray)
+        # 読み込み直した設定と同じ結果となる
+        pd.testing.assert_frame_equal(
+            simple_simulation.simulate(expected)[1].to_df(),
+            simple_simulation.simulate(config)[1].to_df(),
+        )
+
+    def test_reuse(self) -> None:
+        config_cache.read(self.folder)
+        digest = config_cache.source_hash(self.folder)
+        written = (self.cache / digest / "config.json").stat().st_mtime_ns
+        config_cache.read(self.folder)
+        self.assertEqual((self.cache / digest / "config.json").stat().st_mtime_ns, written)
+
+    def test_regenerate(self) -> None:
+        config_cache.read(self.folder)
+        old = config_cache.source_hash(self.folder)
+        js = json.loads((self.folder / "config.json").read_text())
+        js["CA"] += 0.1
+        (self.folder / "config.json").write_text(json.dumps(js))
+        config = config_cache.read(self.folder)
+        self.assertAlmostEqual(config.CA, js["CA"])
+        # 古いキャッシュは削除する
+        self.assertFalse((self.cache / old).exists())
+        self.assertTrue((self.cache / config_cache.source_hash(self.folder)).is_dir())
+
+        # 省略可能なファイルの追加も検出する
+        atmosphere = pd.DataFrame(
+            {"temperature": [288.15, 281.65], "pressure": [101325.0, 89875.0]},
+            index=pd.Index([0.0, 1000.0], name="altitude"),
+        )
+        atmosphere.to_csv(self.folder / "atmosphere.csv")
+        self.assert_config_equal(config_read.read(self.folder), config_cache.read(self.folder))
+
+
+if __name__ == "__main__":
+    unittest.main()
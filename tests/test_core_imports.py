@@ -0,0 +1,48 @@
+import pkgutil
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import src.core
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_python(code: str) -> str:
+    """新しいプロセスでcodeを実行し、標準出力を返す"""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, cwd=ROOT, text=True)  # noqa: S603
+    return result.stdout
+
+
+def imported_modules(*modules: str) -> set[str]:
+    """新しいプロセスでmodulesをimportし、読み込まれた全てのモジュールを求める"""
+    return set(run_python(f"import sys, {', '.join(modules)}; print(' '.join(sys.modules))").split())
+
+
+class TestCoreImports(unittest.TestCase):
+    def test_core_without_pandas(self) -> None:
+        # 並列計算のワーカーがpandasのimport時間を払わないように、coreはnumpyだけでimportできる
+        loaded = imported_modules(*(f"src.core.{info.name}" for info in pkgutil.iter_modules(src.core.__path__)))
+        self.assertIn("src.core.simple_simulation", loaded)
+        self.assertNotIn("pandas", loaded)
+        self.assertNotIn("matplotlib", loaded)
+
+    def test_report_without_plotting(self) -> None:
+        # 並列計算のワーカーは描画のライブラリを読み込まない
+        loaded = imported_modules("src.make_report.simulation_worker")
+        self.assertNotIn("pandas", loaded)
+        self.assertNotIn("matplotlib", loaded)
+        # 描画のモジュールも初めて描画するまでmatplotlibを読み込まない
+        loaded = imported_modules(
+            "src.make_report.make_result_for_report",
+            "src.make_report.make_graph",
+            "src.graph_writer",
+        )
+        self.assertNotIn("matplotlib", loaded)
+        backend = run_python("from src.make_report import make_graph; print(make_graph.pyplot().get_backend())")
+        self.assertEqual(backend.strip().lower(), "agg")
+
+
+if __name__ == "__main__":
+    unittest.main()
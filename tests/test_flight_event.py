@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+import quaternion
+
+from src.core import flight_event
+from src.core.rocket_state import RocketState
+
+GRAVITY = np.array([0.0, 0.0, 9.8])
+
+
+def ballistic_state(t: float) -> RocketState:
+    """等加速度運動での状態"""
+    velocity0 = np.array([10.0, 5.0, -20.0])
+    return RocketState(
+        velocity0 * t + GRAVITY * t**2 / 2,
+        velocity0 + GRAVITY * t,
+        quaternion.quaternion(1, 0, 0, 0),
+        np.zeros(3),
+    )
+
+
+class TestFlightEvent(unittest.TestCase):
+    def test_interpolate_state(self) -> None:
+        # 等加速度運動は位置も速度も補間で正確に再現される
+        state = flight_event.interpolate_state(1.0, ballistic_state(1.0), 1.5, ballistic_state(1.5), 1.2)
+        expected = ballistic_state(1.2)
+        np.testing.assert_array_almost_equal(state.position, expected.position)
+        np.testing.assert_array_almost_equal(state.velocity, expected.velocity)
+
+    def test_find_event(self) -> None:
+        apogee_time = 20 / 9.8
+        start = (2.0, ballistic_state(2.0))
+        end = (2.1, ballistic_state(2.1))
+        event = flight_event.find_event(flight_event.APOGEE, start, end, flight_event.apogee_function)
+        self.assertEqual(event.name, flight_event.APOGEE)
+        self.assertAlmostEqual(event.time, apogee_time)
+        self.assertAlmostEqual(event.state.velocity[2], 0)
+        np.testing.assert_array_almost_equal(event.state.position, ballistic_state(apogee_time).position)
+
+    def test_find_event_at_start(self) -> None:
+        # 前のステップで既に条件を満たしている場合はその時刻となる
+        start = (3.0, ballistic_state(3.0))
+        end = (3.1, ballistic_state(3.1))
+        event = flight_event.find_event(flight_event.APOGEE, start, end, flight_event.apogee_function)
+        self.assertEqual(event.time, 3.0)
+
+    def test_burnout_function(self) -> None:
+        function = flight_event.burnout_function(lambda t: max(0.0, 10 - t * 4), 1e-10)
+        start = (2.0, ballistic_state(2.0))
+        end = (3.0, ballistic_state(3.0))
+        event = flight_event.find_event(flight_event.BURNOUT, start, end, function)
+        self.assertAlmostEqual(event.time, 2.5)
+
+    def test_events_to_df(self) -> None:
+        events = [
+            flight_event.FlightEvent(flight_event.APOGEE, 1.0, ballistic_state(1.0)),
+            flight_event.FlightEvent(flight_event.LANDING, 2.0, ballistic_state(2.0)),
+        ]
+        df = flight_event.events_to_df(events)
+        self.assertEqual(list(df["event"]), [flight_event.APOGEE, flight_event.LANDING])
+        self.assertAlmostEqual(df["position_d"].iloc[1], ballistic_state(2.0).position[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+import quaternion
+
+from src.core.flight_metrics import FlightMetrics
+from src.core.simulation_result import SimulationResult, SimulationResultRow
+
+
+def make_row(
+    time: float,
+    altitude: float,
+    dynamic_pressure: float,
+    acceleration: float,
+    *,
+    burning: bool,
+    on_launcher: bool,
+) -> SimulationResultRow:
+    return SimulationResultRow(
+        time=time,
+        position=np.array([time, 0.0, -altitude]),
+        velocity=np.array([1.0, 0.0, 0.0]),
+        posture=quaternion.quaternion(1, 0, 0, 0),
+        rotation=np.zeros(3),
+        dynamic_pressure=dynamic_pressure,
+        burning=burning,
+        on_launcher=on_launcher,
+        velocity_air_body_frame=np.array([1.0, 0.0, 0.0]),
+        acceleration_body_frame=np.array([acceleration, 0.0, 0.0]),
+    )
+
+
+class TestFlightMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rows = [
+            make_row(0.0, 0.0, 0.0, 30.0, burning=True, on_launcher=True),
+            make_row(1.0, 5.0, 50.0, 20.0, burning=True, on_launcher=False),
+            make_row(2.0, 20.0, 80.0, 10.0, burning=False, on_launcher=False),
+            make_row(3.0, 30.0, 40.0, 5.0, burning=False, on_launcher=False),
+            make_row(4.0, 30.0, 10.0, 5.0, burning=False, on_launcher=False),
+            make_row(5.0, 0.0, 20.0, 5.0, burning=False, on_launcher=False),
+        ]
+
+    def test_update(self) -> None:
+        metrics = FlightMetrics()
+        for row in self.rows:
+            metrics.update(row)
+        self.assertIs(metrics.launch_clear, self.rows[1])
+        self.assertIs(metrics.max_dynamic_pressure_burning, self.rows[1])
+        self.assertIs(metrics.max_dynamic_pressure, self.rows[2])
+        # 同じ値の場合は先の行が選ばれる
+        self.assertIs(metrics.max_altitude, self.rows[3])
+        self.assertIs(metrics.max_acceleration, self.rows[0])
+        self.assertIs(metrics.landing, self.rows[-1])
+
+    def test_merge(self) -> None:
+        # 区間の境界の行はjoinと同様に後の区間のものが使われる
+        boundary_launcher = make_row(1.0, 5.0, 50.0, 100.0, burning=True, on_launcher=True)
+        first = SimulationResult([*self.rows[:1], boundary_launcher])
+        second = SimulationResult(self.rows[1:])
+        joined = first.join(second)
+        self.assertIs(joined.metrics.launch_clear, self.rows[1])
+        self.assertIs(joined.metrics.max_acceleration, self.rows[0])
+        self.assertIs(joined.metrics.landing, self.rows[-1])
+
+    def test_empty(self) -> None:
+        metrics = FlightMetrics()
+        with self.assertRaises(ValueError):
+            _ = metrics.landing
+        metrics.update(self.rows[0])
+        with self.assertRaises(ValueError):
+            _ = metrics.launch_clear
+
+
+if __name__ == "__main__":
+    unittest.main()
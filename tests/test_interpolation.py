@@ -12,6 +12,13 @@ class TestInterpolation(unittest.TestCase):
         f = i.df_to_function_1d(data)
         np.testing.assert_array_almost_equal(f(1.5), np.array([2.5]))
 
+    def test_linear_interpolation_batch(self) -> None:
+        data = pd.DataFrame({"b": [2, 3, 4]}, index=[1, 2, 3])
+        f = i.df_to_function_1d(data)
+        f_batch = i.df_to_function_1d_batch(data)
+        x = np.array([0.5, 1, 1.5, 2.25, 3, 4])
+        np.testing.assert_array_almost_equal(f_batch(x), [f(v) for v in x])
+
     def test_linear_interpolation_array(self) -> None:
         # テスト用データフレーム(値がnp.ndarray)を作成
         data = pd.DataFrame(
@@ -0,0 +1,108 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.analysis.landing_surrogate import OUTPUT_NAMES, LandingSurrogate
+from src.make_report.make_result_for_report import Setting
+
+
+def linear_outputs(settings: list[Setting]) -> np.ndarray:
+    """発射角度と風速に線形で風向によらない出力"""
+    return np.array(
+        [
+            [
+                s.wind_speed * 10 + s.launcher_elevation,
+                s.wind_speed * 5,
+                s.launcher_elevation / 10,
+                s.wind_speed,
+                -s.wind_speed,
+                2 * s.launcher_elevation,
+                100,
+            ]
+            for s in settings
+        ],
+    )
+
+
+def curved_outputs(settings: list[Setting]) -> np.ndarray:
+    """風向に対して曲率を持つ出力"""
+    rows = []
+    for s in settings:
+        theta = np.deg2rad(s.wind_direction)
+        value = 50 * s.wind_speed * np.cos(theta)
+        rows.append([value] * len(OUTPUT_NAMES))
+    return np.array(rows)
+
+
+class TestLandingSurrogate(unittest.TestCase):
+    def test_linear_interpolation(self) -> None:
+        surrogate = LandingSurrogate.build(linear_outputs, [70, 80], [2, 4, 6], [0, 90, 180, 270])
+        prediction = surrogate.predict(75, 3, 45)
+        expected = linear_outputs([Setting(75, 3, 45)])[0]
+        np.testing.assert_array_almost_equal(
+            [prediction.outputs[name] for name in OUTPUT_NAMES],
+            expected,
+        )
+        # 線形な出力の推定誤差は0
+        self.assertAlmostEqual(prediction.error["landing_north_parachute_off"], 0)
+
+    def test_periodic_direction(self) -> None:
+        surrogate = LandingSurrogate.build(curved_outputs, [70], [4], [0, 90, 180, 270])
+        # 270degと360(=0)degの間は周期境界を越えて補間される
+        values, _ = surrogate.predict_array(70, 4, 315)
+        expected = (surrogate.outputs[0, 0, 3] + surrogate.outputs[0, 0, 0]) / 2
+        np.testing.assert_array_almost_equal(values, expected)
+        np.testing.assert_array_almost_equal(surrogate.predict_array(70, 4, -45)[0], values)
+
+    def test_out_of_range(self) -> None:
+        surrogate = LandingSurrogate.build(linear_outputs, [70, 80], [2, 4], [0, 180])
+        with self.assertRaises(ValueError):
+            surrogate.predict(60, 3, 0)
+        with self.assertRaises(ValueError):
+            surrogate.predict(75, 5, 0)
+
+    def test_refine(self) -> None:
+        surrogate = LandingSurrogate.build(curved_outputs, [70], [4], [0, 90, 180, 270])
+        name = "landing_north_parachute_off"
+        tolerance = {name: 1.0}
+        self.assertGreater(surrogate.max_error()[name], tolerance[name])
+
+        evaluated: list[Setting] = []
+
+        def evaluate(settings: list[Setting]) -> np.ndarray:
+            evaluated.extend(settings)
+            return curved_outputs(settings)
+
+        refined = surrogate.refine(evaluate, tolerance, max_iterations=5)
+        self.assertGreater(len(refined.wind_directions), 4)
+        # 既に計算済みの格子点は再計算しない
+        self.assertEqual(len(evaluated), len(refined.wind_directions) - 4)
+        self.assertLess(refined.max_error()[name], surrogate.max_error()[name])
+        # 推定誤差が実際の誤差を見積もれている
+        for direction in np.arange(0, 360, 7.5):
+            prediction = refined.predict(70, 4, direction)
+            actual = curved_outputs([Setting(70, 4, direction)])[0, 0]
+            error = abs(prediction.outputs[name] - actual)
+            self.assertLessEqual(error, 2 * prediction.error[name] + 1e-9)
+
+    def test_from_samples(self) -> None:
+        settings = [Setting(70, s, d) for s in [2, 4] for d in [0, 120, 240]]
+        surrogate = LandingSurrogate.from_samples(settings, linear_outputs(settings))
+        np.testing.assert_array_almost_equal(surrogate.wind_directions, [0, 120, 240])
+        with self.assertRaises(ValueError):
+            LandingSurrogate.from_samples(settings[:-1], linear_outputs(settings[:-1]))
+
+    def test_save_load(self) -> None:
+        surrogate = LandingSurrogate.build(linear_outputs, [70, 80], [2, 4], [0, 90, 180, 270])
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "surrogate.npz"
+            surrogate.save(path)
+            loaded = LandingSurrogate.load(path)
+        np.testing.assert_array_equal(loaded.outputs, surrogate.outputs)
+        np.testing.assert_array_equal(loaded.wind_directions, surrogate.wind_directions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 
-from src.geography.geography import from_lat_lon_to_north_east
+import numpy as np
+
+from src.geography.geography import Point, from_lat_lon_to_north_east
 from src.geography.launch_site import LaunchSite
 
 
@@ -72,6 +74,21 @@ class TestLaunchSite(unittest.TestCase):
             _, expected_east = from_lat_lon_to_north_east(lat, lon, launch_lat, launch_lon)
             self.assertAlmostEqual(east, expected_east, delta=self.tolerance)
 
+    def test_margin(self) -> None:
+        """落下可能域の内外判定と境界までの距離のテスト"""
+        # 北に200m、東に100mの長方形(KMLのように始点を終点に重ねる)
+        corners = [(0.0, 0.0), (200.0, 0.0), (200.0, 100.0), (0.0, 100.0), (0.0, 0.0)]
+        launch_site = LaunchSite(
+            Point(self.lat_0, self.lon_0, 0, 0),
+            [Point(self.lat_0, self.lon_0, north, east) for north, east in corners],
+        )
+        north = np.array([50.0, 100.0, -30.0, 240.0, 100.0])
+        east = np.array([20.0, 50.0, 50.0, 130.0, 100.0])
+        np.testing.assert_array_equal(launch_site.contains(north, east), [True, True, False, False, False])
+        np.testing.assert_array_almost_equal(launch_site.distance_to_boundary(north, east), [20, 50, 30, 50, 0])
+        np.testing.assert_array_almost_equal(launch_site.margin(north, east), [20, 50, -30, -50, 0])
+        self.assertTrue(launch_site.contains(50.0, 20.0))
+
 
 if __name__ == "__main__":
     unittest.main()
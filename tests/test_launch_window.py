@@ -0,0 +1,96 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.launch_window import (
+    LANDING_NAMES,
+    forecast_profiles,
+    landing_evaluator,
+    launch_window,
+    simulate_landings,
+)
+from src.core import simple_simulation
+from src.core.wind_profile import WindProfile
+from src.geography.geography import Point
+from src.geography.launch_site import LaunchSite
+from tests.test_simple_simulation import small_config
+
+
+def forecast() -> pd.DataFrame:
+    """2時刻、2メンバーの予報。メンバーbの0時はメンバーaと同じ"""
+    rows = []
+    for member, time, speed in [("a", 0.0, 2.0), ("a", 6.0, 4.0), ("b", 0.0, 2.0), ("b", 6.0, 8.0)]:
+        rows.extend(
+            {"member": member, "time": time, "altitude": altitude, "wind_speed": speed, "wind_direction": 90.0}
+            for altitude in [0.0, 500.0]
+        )
+    return pd.DataFrame(rows)
+
+
+def square_site() -> LaunchSite:
+    """発射地点を中心とする一辺200mの正方形の落下可能域"""
+    corners = [(-100.0, -100.0), (100.0, -100.0), (100.0, 100.0), (-100.0, 100.0)]
+    return LaunchSite(Point(36, 140, 0, 0), [Point(36, 140, north, east) for north, east in corners])
+
+
+class TestLaunchWindow(unittest.TestCase):
+    def test_forecast_profiles(self) -> None:
+        profiles = forecast_profiles(forecast(), times=[0.0, 3.0])
+        self.assertEqual(list(profiles), [(0.0, "a"), (3.0, "a"), (0.0, "b"), (3.0, "b")])
+        # 予報の時刻の間は補間する
+        np.testing.assert_array_almost_equal(profiles[3.0, "b"](100.0), [0.0, -5.0, 0.0])
+
+    def test_cache(self) -> None:
+        evaluated = []
+
+        def evaluate(profiles: list[WindProfile]) -> np.ndarray:
+            evaluated.extend(profiles)
+            return np.array([[p.wind_east[0, 0], 0.0, 0.0, 0.0] for p in profiles])
+
+        profiles = forecast_profiles(forecast())
+        cache = {}
+        landings = simulate_landings(evaluate, profiles, cache)
+        # 同じ分布は一度だけ計算する
+        self.assertEqual(len(evaluated), 3)
+        self.assertEqual(list(landings["member"]), ["a", "a", "b", "b"])
+        np.testing.assert_array_almost_equal(landings["landing_north_parachute_off"], [-2, -4, -2, -8])
+        simulate_landings(evaluate, profiles, cache)
+        self.assertEqual(len(evaluated), 3)
+
+    def test_launch_window(self) -> None:
+        landings = pd.DataFrame(
+            [[0.0, "a", 10, 0, 50, 0], [0.0, "b", -10, 0, 70, 0], [1.0, "a", 0, 0, 95, 0], [1.0, "b", 0, 0, 120, 0]],
+            columns=["time", "member", *LANDING_NAMES],
+        )
+        window = launch_window(landings, square_site(), margin=20)
+        self.assertEqual(list(window.index), [0.0, 1.0])
+        self.assertEqual(list(window["members"]), [2, 2])
+        self.assertAlmostEqual(window.loc[0.0, "landing_north_parachute_on"], 60)
+        self.assertAlmostEqual(window.loc[0.0, "spread_parachute_off"], 10)
+        np.testing.assert_array_almost_equal(window["min_margin"], [30, -20])
+        self.assertEqual(list(window["go"]), [True, False])
+
+    def test_landing_evaluator(self) -> None:
+        config = small_config()
+        profile = forecast_profiles(forecast())[6.0, "b"]
+        # プロセスのプールは評価の回数によらず1度だけ作成する
+        with (
+            mock.patch("src.analysis.launch_window.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool,
+            landing_evaluator(config, max_workers=1) as evaluate,
+        ):
+            landing = evaluate([profile])
+            np.testing.assert_array_equal(evaluate([profile, profile]), [landing[0], landing[0]])
+        pool.assert_called_once()
+        config.wind_profile = profile.to_df()
+        parachute_off, parachute_on = simple_simulation.simulate_landing(config, outputs=())
+        np.testing.assert_array_almost_equal(
+            landing[0],
+            [*parachute_off.landing_position[:2], *parachute_on.landing_position[:2]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
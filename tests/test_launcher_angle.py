@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from src.analysis.landing_surrogate import OUTPUT_NAMES, Evaluator, LandingSurrogate
+from src.analysis.launcher_angle import optimize_launcher_angle, predicted_landings, rotated_landings
+from src.core.config import Config
+from src.geography.geography import Point
+from src.geography.launch_site import LaunchSite
+from src.make_report.make_result_for_report import Setting
+from tests.test_simple_simulation import small_config
+
+
+def drift_evaluator(config: Config) -> Evaluator:
+    """発射方向に(90 - 発射角度) * 10[m]飛び、風下に風速の10倍(開傘時は20倍)流される着地点"""
+
+    def evaluate(settings: list[Setting]) -> np.ndarray:
+        rows = []
+        for s in settings:
+            azimuth = np.deg2rad(config.first_azimuth)
+            direction = np.deg2rad(s.wind_direction)
+            launch = (90 - s.launcher_elevation) * 10 * np.array([np.cos(azimuth), np.sin(azimuth)])
+            drift = -np.array([np.cos(direction), np.sin(direction)]) * s.wind_speed
+            off = launch + 10 * drift
+            on = launch + 20 * drift
+            rows.append([off[0], off[1], 0, on[0], on[1], 0, 100])
+        return np.array(rows)
+
+    return evaluate
+
+
+def square_site(center_north: float, center_east: float, half_width: float) -> LaunchSite:
+    corners = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+    return LaunchSite(
+        Point(36, 140, 0, 0),
+        [Point(36, 140, center_north + n * half_width, center_east + e * half_width) for n, e in corners],
+    )
+
+
+class TestLauncherAngle(unittest.TestCase):
+    def test_rotation_symmetry(self) -> None:
+        config = small_config()
+        config.first_azimuth = 0
+        surrogate = LandingSurrogate.build(drift_evaluator(config), [70, 80], [2, 4], np.arange(0, 360, 5))
+        winds = [(3.0, 10.0), (2.0, 200.0)]
+        predicted = predicted_landings(surrogate, 0, 75, 60, winds)
+        config.first_azimuth = 60
+        outputs = drift_evaluator(config)([Setting(75, speed, direction) for speed, direction in winds])
+        np.testing.assert_allclose(predicted, rotated_landings(outputs, 0), atol=1.0)
+        self.assertEqual(predicted.shape, (2, 2, 2))
+        self.assertEqual(len(OUTPUT_NAMES), outputs.shape[1])
+
+    def test_optimize(self) -> None:
+        config = small_config()
+        config.first_azimuth = 200
+        # 北東の落下可能域の中心に着地点の分布の中心が来るのは方位角45deg、発射角度75deg
+        site = square_site(150 / np.sqrt(2), 150 / np.sqrt(2), 200)
+        result = optimize_launcher_angle(
+            config,
+            site,
+            [2, 4, 6],
+            np.arange(0, 360, 45).tolist(),
+            (70, 85),
+            evaluator=drift_evaluator,
+        )
+        self.assertAlmostEqual(result.azimuth, 45, delta=2)
+        self.assertAlmostEqual(result.elevation, 75, delta=1)
+        self.assertGreater(result.margin, 0)
+        self.assertAlmostEqual(result.margin, result.predicted_margin, delta=5)
+        self.assertEqual(result.simulations, 3 * 3 * 12 + 3 * 8)
+        self.assertEqual(result.landings.shape, (24, 2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
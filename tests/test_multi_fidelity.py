@@ -0,0 +1,119 @@
+import dataclasses
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.launch_window import LANDING_NAMES
+from src.analysis.multi_fidelity import (
+    Dispersion,
+    control_variate,
+    high_fidelity_evaluator,
+    low_fidelity_evaluator,
+    multi_fidelity_dispersion,
+)
+from src.core import simple_simulation
+from src.core.config import Config
+from tests.test_simple_simulation import small_config
+
+
+def linear_landing(configs: list[Config]) -> np.ndarray:
+    """風速と軸力係数に比例する着地点"""
+    return np.array(
+        [[c.wind.wind_speed * 10, c.CA * 20, c.wind.wind_speed * 30, c.first_elevation] for c in configs],
+    )
+
+
+class TestMultiFidelity(unittest.TestCase):
+    def test_identical_models(self) -> None:
+        rng = np.random.default_rng(0)
+        low = rng.standard_normal((100, 2))
+        result = control_variate(low[:10], low[:10], low)
+        np.testing.assert_allclose(result.mean, low.mean(axis=0))
+        np.testing.assert_allclose(result.std, low.std(axis=0, ddof=1))
+        np.testing.assert_allclose(result.correlation, 1)
+        np.testing.assert_allclose(result.variance_reduction, 10)
+
+    def test_correlated_models(self) -> None:
+        rng = np.random.default_rng(1)
+        x = rng.standard_normal(20000)
+        low = x[:, np.newaxis]
+        high = (2 * x + 1 + 0.2 * rng.standard_normal(len(x)))[:, np.newaxis]
+        n = 200
+        result = control_variate(high[:n], low[:n], low)
+        rho = result.correlation[0]
+        self.assertGreater(rho, 0.99)
+        np.testing.assert_allclose(result.variance_reduction, 1 / (1 - rho**2 * (1 - n / len(x))))
+        self.assertLess(result.standard_error[0], result.plain_standard_error[0] / 5)
+        self.assertLess(abs(result.mean[0] - 1), 3 * result.standard_error[0])
+        self.assertAlmostEqual(result.std[0], np.sqrt(4.04), delta=0.1)
+
+    def test_invalid_samples(self) -> None:
+        values = np.zeros((5, 1))
+        with self.assertRaises(ValueError):
+            control_variate(values[:1], values[:1], values)
+        with self.assertRaises(ValueError):
+            control_variate(values, values[:3], values)
+
+    def test_sample(self) -> None:
+        config = small_config()
+        configs = Dispersion().sample(config, 3, np.random.default_rng(0))
+        again = Dispersion().sample(config, 3, np.random.default_rng(0))
+        self.assertEqual([c.CA for c in configs], [c.CA for c in again])
+        self.assertEqual(len({c.wind.wind_direction for c in configs}), 3)
+        unchanged = Dispersion(0, 0, 0, 0, 0).sample(config, 2, np.random.default_rng(0))
+        for c in unchanged:
+            self.assertEqual(c.CA, config.CA)
+            self.assertEqual(c.wind, config.wind)
+            np.testing.assert_array_equal(c.thrust["thrust"], config.thrust["thrust"])
+
+    def test_sample_aerodynamic_table(self) -> None:
+        # 空力係数の表を用いる場合、CAは軌道に影響しないため揺らがせない
+        config = dataclasses.replace(
+            small_config(),
+            aerodynamic_table=pd.DataFrame(
+                {"mach": [0.0, 0.0, 1.0, 1.0], "alpha": [0, 10, 0, 10], "CA": 0.6, "CN": 0.1}
+            ),
+        )
+        with self.assertRaises(ValueError):
+            Dispersion().sample(config, 2, np.random.default_rng(0))
+        configs = Dispersion(CA=0).sample(config, 2, np.random.default_rng(0))
+        self.assertEqual({c.CA for c in configs}, {config.CA})
+        self.assertEqual(len({float(c.thrust["thrust"].iloc[0]) for c in configs}), 2)
+        # 質点モデルも表を用いる設定は計算しない
+        with self.assertRaises(ValueError):
+            low_fidelity_evaluator()(configs)
+
+    def test_high_fidelity(self) -> None:
+        # 6自由度のモデルの着地点はsimulate_manyの結果から読み、直接計算した着地点と一致する
+        configs = Dispersion().sample(small_config(), 2, np.random.default_rng(0))
+        expected = [simple_simulation.simulate_landing(config, outputs=()) for config in configs]
+        np.testing.assert_array_equal(
+            high_fidelity_evaluator(max_workers=1)(configs),
+            [[*off.landing_position[:2], *on.landing_position[:2]] for off, on in expected],
+        )
+
+    def test_dispersion(self) -> None:
+        calls = []
+
+        def high_fidelity(configs: list[Config]) -> np.ndarray:
+            calls.append(len(configs))
+            return linear_landing(configs) + 1
+
+        result = multi_fidelity_dispersion(
+            small_config(),
+            Dispersion(),
+            500,
+            20,
+            high_fidelity=high_fidelity,
+            low_fidelity=linear_landing,
+        )
+        self.assertEqual(calls, [20])
+        self.assertEqual(list(result.statistics.index), list(LANDING_NAMES))
+        # 低精度のモデルと定数だけ異なる場合は全てのサンプルの平均に一致する
+        np.testing.assert_allclose(result.statistics["mean"], result.low.mean(axis=0) + 1)
+        np.testing.assert_allclose(result.statistics["variance_reduction"], 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,28 @@ class TestOdeSolver(unittest.TestCase):
         self.assertTrue(np.abs(result[-1][1] - 2) < error_threshold)
         self.assertTrue(np.abs(result[-1][0] - 1) < error_threshold)
 
+    def test_rk4_last(self) -> None:
+        def f(_: float, y: float) -> float:
+            return np.log(2) * y
+
+        observed = []
+        result = s.runge_kutta4(f, 1, 0, 0.01, lambda t, _: t >= 1)
+        last = s.runge_kutta4_last(f, 1, 0, 0.01, lambda t, _: t >= 1, observer=lambda t, y: observed.append((t, y)))
+        self.assertEqual(last, result[-1])
+        self.assertEqual(observed, result)
+
+    def test_rk4_last_variable(self) -> None:
+        def f(_: float, y: float) -> float:
+            return np.log(2) * y
+
+        def time_step(t: float, _: float) -> float:
+            return 0.01 if t < 0.5 else 0.02  # noqa: PLR2004
+
+        result = s.runge_kutta4_variable(f, 1, 0, time_step, lambda t, _: t >= 1)
+        last = s.runge_kutta4_last(f, 1, 0, time_step, lambda t, _: t >= 1)
+        self.assertEqual(last, result[-1])
+        self.assertAlmostEqual(last[1], 2, delta=1e-9)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,138 @@
+import dataclasses
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.parameter_fit import (
+    EvaluationCache,
+    apply_parameters,
+    fit_parameters,
+    sample_trajectory,
+    signature,
+    simulation_residual_evaluator,
+)
+from src.core import simple_simulation
+from tests.test_simple_simulation import small_config
+
+
+class CountingEvaluator:
+    """y = a * exp(b * t)をt = 0, 0.1, ..., 1の観測値に合わせる残差"""
+
+    def __init__(self, a: float = 2.0, b: float = -1.5) -> None:
+        self.t = np.linspace(0, 1, 11)
+        self.observed = a * np.exp(b * self.t)
+        self.points: list[np.ndarray] = []
+
+    def __call__(self, points: list[np.ndarray]) -> np.ndarray:
+        self.points.extend(points)
+        return np.array([a * np.exp(b * self.t) - self.observed for a, b in points])
+
+
+class TestParameterFit(unittest.TestCase):
+    def test_apply_parameters(self) -> None:
+        config = small_config()
+        changed = apply_parameters(config, ["CA", "thrust_scale"], np.array([0.6, 1.5]))
+        self.assertEqual(changed.CA, 0.6)
+        self.assertEqual(changed.CN_alpha, config.CN_alpha)
+        np.testing.assert_array_almost_equal(changed.thrust["thrust"], [60, 60, 0, 0])
+        np.testing.assert_array_almost_equal(config.thrust["thrust"], [40, 40, 0, 0])
+        with self.assertRaises(ValueError):
+            apply_parameters(config, ["mass"], np.array([1.0]))
+
+    def test_aerodynamic_table(self) -> None:
+        # 空力係数の表を用いる場合、CAとCN_alphaは軌道に影響しないため同定できない
+        config = dataclasses.replace(
+            small_config(),
+            aerodynamic_table=pd.DataFrame(
+                {"mach": [0.0, 0.0, 1.0, 1.0], "alpha": [0, 10, 0, 10], "CA": 0.5, "CN": [0.0, 1.4, 0.0, 1.4]},
+            ),
+        )
+        log = pd.DataFrame({"time": [0.5, 1.0], "altitude": [1.0, 3.0]})
+        for name in ["CA", "CN_alpha"]:
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    apply_parameters(config, [name, "thrust_scale"], np.array([0.6, 1.0]))
+                with (
+                    self.assertRaises(ValueError),
+                    simulation_residual_evaluator(config, [name], log, {"altitude": 1.0}, max_workers=1),
+                ):
+                    pass
+        changed = apply_parameters(config, ["thrust_scale"], np.array([1.5]))
+        np.testing.assert_array_almost_equal(changed.thrust["thrust"], [60, 60, 0, 0])
+
+    def test_sample_trajectory(self) -> None:
+        # 高度が時刻の3次式の場合はエルミート補間で厳密に一致する
+        time = np.array([0.0, 0.5, 1.5, 2.0])
+        result = pd.DataFrame(
+            {
+                "time": time,
+                "position_d": -(time**3),
+                "velocity_d": -3 * time**2,
+                "acceleration_body_frame_x": 2 * time,
+            },
+        )
+        times = np.array([-1.0, 0.25, 1.0, 1.7, 3.0])
+        sampled = sample_trajectory(result, times)
+        np.testing.assert_array_almost_equal(sampled["altitude"], [0, 0.25**3, 1, 1.7**3, 8])
+        np.testing.assert_array_almost_equal(sampled["acceleration"], [0, 0.5, 2, 3.4, 4])
+
+    def test_fit(self) -> None:
+        evaluate = CountingEvaluator()
+        result = fit_parameters(evaluate, np.array([1.0, -0.5]), tolerance=1e-12)
+        np.testing.assert_array_almost_equal(result.parameters, [2.0, -1.5], decimal=5)
+        self.assertLess(result.cost, 1e-10)
+        self.assertEqual(result.evaluations, len(evaluate.points))
+
+    def test_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "cache.npz"
+            evaluate = CountingEvaluator()
+            first = fit_parameters(evaluate, np.array([1.0, -0.5]), cache=EvaluationCache(path, key="a"))
+            # 同じ入力で再開した場合は全ての点を保存結果から読む
+            cache = EvaluationCache(path, key="a")
+            self.assertEqual(len(cache), len({tuple(point) for point in evaluate.points}))
+            second = fit_parameters(evaluate, np.array([1.0, -0.5]), cache=cache)
+            self.assertEqual(second.evaluations, 0)
+            np.testing.assert_array_equal(first.parameters, second.parameters)
+            # 入力が異なる場合は保存結果を用いない
+            self.assertEqual(len(EvaluationCache(path, key="b")), 0)
+
+    def test_signature(self) -> None:
+        config = small_config()
+        self.assertEqual(signature(config, ("CA",)), signature(small_config(), ("CA",)))
+        self.assertNotEqual(signature(config, ("CA",)), signature(apply_parameters(config, ["CA"], [0.6]), ("CA",)))
+
+    def test_simulation(self) -> None:
+        config = small_config()
+        names = ["CA", "thrust_scale"]
+        truth = apply_parameters(config, names, np.array([0.7, 1.1]))
+        flight = simple_simulation.simulate(truth)[1].to_df()
+        # パラシュートの展開時刻はステップ幅で離散的に変わるため、上昇中のログで比較する
+        times = np.arange(0.05, 3.0, 0.1)
+        log = sample_trajectory(flight, times)
+        log.insert(0, "time", times)
+        log.loc[3, "acceleration"] = np.nan
+        # プロセスのプールは同定の全体で1度だけ作成する
+        with (
+            mock.patch("src.analysis.parameter_fit.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool,
+            simulation_residual_evaluator(
+                config,
+                names,
+                log,
+                {"altitude": 1.0, "acceleration": 0.1},
+                max_workers=1,
+            ) as evaluate,
+        ):
+            result = fit_parameters(evaluate, np.array([0.6, 1.05]), max_iterations=10)
+        np.testing.assert_array_almost_equal(result.parameters, [0.7, 1.1], decimal=2)
+        pool.assert_called_once()
+        self.assertGreater(result.iterations, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+import quaternion
+
+from src.core import flight_event
+from src.core.phase_index import PhaseIndex
+from src.core.rocket_state import RocketState
+
+
+def event(name: str, time: float) -> flight_event.FlightEvent:
+    return flight_event.FlightEvent(
+        name,
+        time,
+        RocketState(np.zeros(3), np.zeros(3), quaternion.quaternion(1, 0, 0, 0), np.zeros(3)),
+    )
+
+
+class TestPhaseIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.time = np.arange(0, 10, 1.0)
+
+    def test_from_events(self) -> None:
+        events = [
+            event(flight_event.LAUNCH_CLEAR, 0.5),
+            event(flight_event.BURNOUT, 2.3),
+            event(flight_event.APOGEE, 4.8),
+            event(flight_event.PARACHUTE_DEPLOY, 7.0),
+            event(flight_event.LANDING, 8.9),
+        ]
+        phases = PhaseIndex.from_events(self.time, events)
+        self.assertEqual(phases.launcher, slice(0, 1))
+        self.assertEqual(phases.burn, slice(0, 3))
+        self.assertEqual(phases.coast, slice(3, 5))
+        self.assertEqual(phases.delay, slice(5, 7))
+        self.assertEqual(phases.descent, slice(7, 10))
+        self.assertEqual(phases.after_burnout, slice(3, 10))
+        np.testing.assert_array_equal(self.time[phases.coast], [3.0, 4.0])
+
+    def test_without_parachute(self) -> None:
+        events = [
+            event(flight_event.LAUNCH_CLEAR, 0.5),
+            event(flight_event.BURNOUT, 2.3),
+            event(flight_event.APOGEE, 4.8),
+            event(flight_event.LANDING, 8.9),
+        ]
+        phases = PhaseIndex.from_events(self.time, events)
+        self.assertEqual(phases.delay, slice(5, 5))
+        self.assertEqual(phases.descent, slice(5, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
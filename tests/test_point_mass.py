@@ -0,0 +1,74 @@
+import dataclasses
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core import point_mass, simple_simulation
+from tests.test_simple_simulation import small_config
+
+
+class TestPointMass(unittest.TestCase):
+    def test_landing(self) -> None:
+        config = small_config()
+        configs = [
+            dataclasses.replace(
+                config,
+                wind=dataclasses.replace(config.wind, wind_speed=speed, wind_direction=direction),
+                first_elevation=elevation,
+            )
+            for speed, direction, elevation in [(0, 0, 80), (2, 0, 85), (3, 90, 80), (4, 200, 75), (1, 300, 82)]
+        ]
+        parachute_off, parachute_on = point_mass.simulate_landing_batch(configs)
+        self.assertEqual(parachute_off.shape, (len(configs), 3))
+        np.testing.assert_allclose(parachute_on[:, 2], 0, atol=1e-9)
+        full = [simple_simulation.simulate_landing(c, outputs=()) for c in configs]
+        for i, landing in enumerate([parachute_off, parachute_on]):
+            reference = np.array([result[i].landing_position[:2] for result in full])
+            # 6自由度のモデルとの差は着地点の広がりより十分小さく、強く相関する
+            self.assertLess(np.abs(landing[:, :2] - reference).max(), 10)
+            for k in range(2):
+                self.assertGreater(np.corrcoef(landing[:, k], reference[:, k])[0, 1], 0.85)
+
+    def test_summary(self) -> None:
+        config = small_config()
+        configs = [dataclasses.replace(config, first_elevation=elevation) for elevation in [80, 85]]
+        summaries = point_mass.simulate_summary_batch(configs)
+        landings = point_mass.simulate_landing_batch(configs)
+        for i, (summary_list, landing) in enumerate(zip(summaries, landings, strict=True)):
+            for changed, summary, position in zip(configs, summary_list, landing, strict=True):
+                np.testing.assert_array_equal(summary.landing_position, position)
+                reference = simple_simulation.simulate_landing(changed)[i]
+                # 6自由度のモデルとの差は時間刻みと質点の近似による程度となる
+                self.assertAlmostEqual(summary.landing_time, reference.landing_time, delta=0.2)
+                self.assertAlmostEqual(summary.apogee, reference.apogee, delta=1.0)
+
+    def test_summary_independent_of_batch(self) -> None:
+        # 開傘時刻の異なる設定と同時に計算しても、着地時刻は設定ごとの開傘時刻から数える
+        config = small_config()
+        configs = [config, dataclasses.replace(config, parachute_delay_time=config.parachute_delay_time + 1)]
+        batched = point_mass.simulate_summary_batch(configs)
+        for k, changed in enumerate(configs):
+            alone = point_mass.simulate_summary_batch([changed])
+            for i in range(2):
+                self.assertAlmostEqual(batched[i][k].landing_time, alone[i][0].landing_time, delta=0.05)
+                np.testing.assert_allclose(batched[i][k].landing_position, alone[i][0].landing_position, atol=0.1)
+                reference = simple_simulation.simulate_landing(changed)[i]
+                self.assertAlmostEqual(batched[i][k].landing_time, reference.landing_time, delta=0.2)
+
+    def test_invalid_configs(self) -> None:
+        config = small_config()
+        profile = pd.DataFrame({"time": [0.0], "altitude": [0.0], "wind_speed": [1.0], "wind_direction": [0.0]})
+        with self.assertRaises(ValueError):
+            point_mass.PointMassBatch.from_configs([config, dataclasses.replace(config, wind_profile=profile)])
+        # 質点モデルの抗力はCAで求めるため、空力係数の表を用いる設定は計算しない
+        table = pd.DataFrame({"mach": [0.0, 0.0, 1.0, 1.0], "alpha": [0, 10, 0, 10], "CA": 0.6, "CN": 0.1})
+        with self.assertRaises(ValueError):
+            point_mass.PointMassBatch.from_configs([config, dataclasses.replace(config, aerodynamic_table=table)])
+        thrust = pd.DataFrame({"thrust": [40.0, 0.0, 0.0]}, index=[0.0, 1.0, 1000.0])
+        with self.assertRaises(ValueError):
+            point_mass.PointMassBatch.from_configs([config, dataclasses.replace(config, thrust=thrust)])
+
+
+if __name__ == "__main__":
+    unittest.main()
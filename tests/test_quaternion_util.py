@@ -44,5 +44,57 @@ class TestQuaternionUtil(unittest.TestCase):
         np.testing.assert_array_almost_equal(result, expected)
 
 
+class TestQuaternionUtilBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.q = rng.normal(size=(20, 4))  # ノルムが1である必要はない
+        self.v = rng.normal(size=(20, 3))
+        self.quaternions = quart.as_quat_array(self.q)
+
+    def test_inertial_to_body_batch(self) -> None:
+        result = qu.inertial_to_body_batch(self.q, self.v)
+        expected = [qu.inertial_to_body(q, v) for q, v in zip(self.quaternions, self.v, strict=True)]
+        np.testing.assert_array_almost_equal(result, expected)
+
+    def test_body_to_inertial_batch(self) -> None:
+        result = qu.body_to_inertial_batch(self.q, self.v)
+        expected = [qu.body_to_inertial(q, v) for q, v in zip(self.quaternions, self.v, strict=True)]
+        np.testing.assert_array_almost_equal(result, expected)
+
+    def test_quaternion_derivative_batch(self) -> None:
+        result = qu.quaternion_derivative_batch(self.q, self.v)
+        expected = [
+            quart.as_float_array(qu.quaternion_derivative(q, v)) for q, v in zip(self.quaternions, self.v, strict=True)
+        ]
+        np.testing.assert_array_almost_equal(result, expected)
+
+    def test_from_euler_angle_batch(self) -> None:
+        elevation = np.array([60, 90, 0, 45])
+        azimuth = np.array([60, 0, 360, 135])
+        roll = np.array([10, 0, 90, 270])
+        result = qu.from_euler_angle_batch(elevation, azimuth, roll)
+        expected = [
+            quart.as_float_array(qu.from_euler_angle(e, a, r)) for e, a, r in zip(elevation, azimuth, roll, strict=True)
+        ]
+        np.testing.assert_array_almost_equal(result, expected)
+        with self.assertRaises(ValueError):
+            qu.from_euler_angle_batch(np.array([91]), np.array([0]), np.array([0]))
+
+    def test_sum_vector_batch(self) -> None:
+        body_vec = [self.v, 2 * self.v]
+        inertial_vec = [-self.v]
+        result_inertial = qu.sum_vector_inertial_frame_batch(body_vec, inertial_vec, self.q)
+        result_body = qu.sum_vector_body_frame_batch(body_vec, inertial_vec, self.q)
+        for i, q in enumerate(self.quaternions):
+            np.testing.assert_array_almost_equal(
+                result_inertial[i],
+                qu.sum_vector_inertial_frame([v[i] for v in body_vec], [v[i] for v in inertial_vec], q),
+            )
+            np.testing.assert_array_almost_equal(
+                result_body[i],
+                qu.sum_vector_body_frame([v[i] for v in body_vec], [v[i] for v in inertial_vec], q),
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
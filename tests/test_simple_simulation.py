@@ -0,0 +1,265 @@
+import dataclasses
+import unittest
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from src import config_read
+from src.core import air_force, flight_event, ode_solver, simple_simulation
+from src.core.config import Config, TimeStepSchedule, WindPowerLow
+from src.core.simulation_context import SimulationContext
+
+
+def small_config() -> Config:
+    """短時間で計算できる小型ロケットの設定"""
+    return Config(
+        mass=pd.DataFrame({"mass": [1.2, 1.0, 1.0]}, index=[0.0, 1.0, 1000.0]),
+        wind=WindPowerLow(reference_height=5.0, wind_speed=3.0, exponent=4.0, wind_direction=45.0),
+        thrust=pd.DataFrame({"thrust": [40.0, 40.0, 0.0, 0.0]}, index=[0.0, 0.9, 1.0, 1000.0]),
+        CA=0.5,
+        CN_alpha=8.0,
+        body_area=0.002,
+        wind_center=np.array([0.2, 0.0, 0.0]),
+        dt=0.02,
+        launcher_length=2.0,
+        inertia_tensor_xx=0.001,
+        inertia_tensor_yy=0.05,
+        inertia_tensor_zz=0.05,
+        inertia_tensor_zy=0.0,
+        inertia_tensor_xz=0.0,
+        inertia_tensor_xy=0.0,
+        first_elevation=80.0,
+        first_azimuth=30.0,
+        first_roll=0.0,
+        parachute_terminal_velocity=6.0,
+        parachute_delay_time=1.0,
+        first_gravity_center=np.array([0.35, 0.0, 0.0]),
+        end_gravity_center=np.array([0.4, 0.0, 0.0]),
+        length=0.8,
+    )
+
+
+class TestSimpleSimulation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.config = small_config()
+        cls.results = simple_simulation.simulate(cls.config)
+
+    def test_simulate(self) -> None:
+        for result in self.results:
+            df = result.to_df()
+            self.assertTrue(df["on_launcher"].iloc[0])
+            self.assertFalse(df["on_launcher"].iloc[-1])
+            self.assertGreater(df["position_d"].iloc[-1], 0)  # 着地している
+            self.assertLess(df["position_d"].min(), -20)  # 十分な高度まで上昇している
+
+    def test_events(self) -> None:
+        names = [
+            [flight_event.LAUNCH_CLEAR, flight_event.BURNOUT, flight_event.APOGEE, flight_event.LANDING],
+            [
+                flight_event.LAUNCH_CLEAR,
+                flight_event.BURNOUT,
+                flight_event.APOGEE,
+                flight_event.PARACHUTE_DEPLOY,
+                flight_event.LANDING,
+            ],
+        ]
+        for result, expected in zip(self.results, names, strict=True):
+            df = result.to_df()
+            events = {event.name: event for event in result.events}
+            self.assertEqual([event.name for event in result.events], expected)
+            # 補間した時刻は前後のステップの間にある
+            launch_clear = events[flight_event.LAUNCH_CLEAR]
+            self.assertLessEqual(launch_clear.time, df[~df["on_launcher"]]["time"].iloc[0])
+            self.assertGreater(launch_clear.time, df[df["on_launcher"]]["time"].iloc[-2])
+            self.assertAlmostEqual(np.linalg.norm(launch_clear.state.position), self.config.launcher_length)
+            self.assertAlmostEqual(events[flight_event.BURNOUT].time, 1.0)
+            self.assertAlmostEqual(events[flight_event.APOGEE].state.velocity[2], 0)
+            self.assertAlmostEqual(events[flight_event.LANDING].state.position[2], 0)
+            self.assertLessEqual(events[flight_event.LANDING].time, df["time"].iloc[-1])
+
+    def test_phase_index(self) -> None:
+        for result in self.results:
+            df = result.to_df()
+            phases = result.phase_index()
+            self.assertTrue(df["on_launcher"].iloc[phases.launcher].all())
+            self.assertFalse(df["on_launcher"].iloc[phases.launcher.stop :].any())
+            self.assertTrue(df["burning"].iloc[phases.burn].all())
+            self.assertFalse(df["burning"].iloc[phases.after_burnout].any())
+            self.assertEqual(phases.descent.stop, len(df))
+            # 最高高度は燃焼終了後の区間の境界にある
+            apogee_row = df["position_d"].idxmin()
+            self.assertIn(apogee_row, [phases.coast.stop - 1, phases.coast.stop])
+
+    def test_metrics(self) -> None:
+        for result in self.results:
+            df = result.to_df()
+            metrics = result.metrics
+            self.assertEqual(metrics.launch_clear.time, df[~df["on_launcher"]]["time"].iloc[0])
+            burning = df[df["burning"]]
+            self.assertEqual(
+                metrics.max_dynamic_pressure_burning.time,
+                burning.loc[burning["dynamic_pressure"].idxmax(), "time"],
+            )
+            self.assertEqual(metrics.max_altitude.time, df.loc[df["position_d"].idxmin(), "time"])
+            acceleration = np.linalg.norm(
+                df[["acceleration_body_frame_x", "acceleration_body_frame_y", "acceleration_body_frame_z"]].to_numpy(),
+                axis=1,
+            )
+            self.assertEqual(metrics.max_acceleration.time, df["time"].iloc[acceleration.argmax()])
+            self.assertEqual(metrics.landing.time, df["time"].iloc[-1])
+
+    def test_simulate_landing(self) -> None:
+        summaries = simple_simulation.simulate_landing(self.config)
+        for summary, result in zip(summaries, self.results, strict=True):
+            df = result.to_df()
+            last = result.last()
+            self.assertAlmostEqual(summary.landing_time, last.time)
+            np.testing.assert_array_almost_equal(summary.landing_position, last.position)
+            self.assertAlmostEqual(summary.apogee, -df["position_d"].min())
+            self.assertAlmostEqual(summary.max_dynamic_pressure, df["dynamic_pressure"].max())
+            launch_clear = df[~df["on_launcher"]].iloc[0]
+            self.assertAlmostEqual(
+                summary.launch_clear_velocity,
+                np.linalg.norm(launch_clear[["velocity_n", "velocity_e", "velocity_d"]].to_numpy(dtype=float)),
+            )
+            self.assertAlmostEqual(
+                summary.launch_clear_angle_of_attack,
+                air_force.angle_of_attack(result.metrics.launch_clear.velocity_air_body_frame),
+            )
+            summary_df = summary.to_df()
+            self.assertAlmostEqual(summary_df["position_n"].iloc[-1], last.position[0])
+            self.assertAlmostEqual(-summary_df["position_d"].min(), summary.apogee)
+
+    def test_simulate_landing_outputs(self) -> None:
+        summaries = simple_simulation.simulate_landing(self.config, outputs=["apogee"])
+        self.assertIsNotNone(summaries[0].apogee)
+        self.assertIsNone(summaries[0].max_dynamic_pressure)
+        self.assertIsNone(summaries[0].launch_clear_velocity)
+        self.assertIsNone(summaries[0].launch_clear_angle_of_attack)
+        with self.assertRaises(ValueError):
+            simple_simulation.simulate_landing(self.config, outputs=["unknown"])
+
+    def test_rail(self) -> None:
+        # 1次元のレール上の積分は6自由度の状態をレール方向に拘束した積分と一致する
+        context = SimulationContext(self.config)
+        first_state = simple_simulation.initial_state(context)
+        expected = ode_solver.runge_kutta4(
+            simple_simulation.launcher_derivative(context),
+            first_state,
+            0,
+            context.dt,
+            simple_simulation.launcher_end_condition(context),
+        )
+        rail = simple_simulation.integrate_rail(first_state, context, 0)
+        self.assertEqual(len(rail), len(expected))
+        axis = simple_simulation.rail_axis(first_state.posture)
+        for (t, rail_state), (expected_t, expected_state) in zip(rail, expected, strict=True):
+            state = simple_simulation.rail_to_rocket_state(rail_state, axis, first_state.posture)
+            self.assertEqual(t, expected_t)
+            np.testing.assert_allclose(state.position, expected_state.position, atol=1e-12)
+            np.testing.assert_allclose(state.velocity, expected_state.velocity, atol=1e-12)
+        [(last_t, last_state)] = simple_simulation.integrate_rail(first_state, context, 0, record=False)
+        self.assertEqual(last_t, rail[-1][0])
+        np.testing.assert_array_equal(last_state, rail[-1][1])
+
+    def test_point_mass_descent(self) -> None:
+        config = dataclasses.replace(self.config, parachute_descent_dt=1.0)
+        summary = simple_simulation.simulate_landing(config)
+        expected = simple_simulation.simulate_landing(self.config)
+        # パラシュートが開かなかった場合は影響しない
+        np.testing.assert_array_equal(summary[0].landing_position, expected[0].landing_position)
+        # 6自由度のモデルとの着地点の差は水平方向に0.5m以内
+        self.assertLess(np.linalg.norm(summary[1].landing_position[:2] - expected[1].landing_position[:2]), 0.5)
+        self.assertAlmostEqual(summary[1].landing_time, expected[1].landing_time, delta=0.1)
+        self.assertAlmostEqual(summary[1].landing_position[2], 0.0)
+
+        result = simple_simulation.simulate(config)[1]
+        landing = result.events[-1]
+        self.assertEqual(landing.name, flight_event.LANDING)
+        self.assertAlmostEqual(landing.time, summary[1].landing_time)
+        np.testing.assert_array_almost_equal(landing.state.position, summary[1].landing_position)
+        # 下降中のステップ数は時間刻みdtの場合より十分少ない
+        self.assertLess(len(result.result), len(self.results[1].result) / 2)
+
+    def test_time_step_schedule(self) -> None:
+        schedule = TimeStepSchedule(launcher=0.01, burn=0.01, coast=0.05, parachute_delay=0.02, descent=0.05)
+        config = dataclasses.replace(self.config, dt_schedule=schedule)
+        results = simple_simulation.simulate(config)
+        summaries = simple_simulation.simulate_landing(config)
+        for result, summary, reference in zip(results, summaries, self.results, strict=True):
+            df = result.to_df()
+            steps = np.diff(df["time"].to_numpy())
+            # 区間をつなぐ行は重複せず、時刻は単調に増える
+            self.assertTrue(np.all(steps > 0))
+            burnout = df["time"] <= 1.0
+            np.testing.assert_allclose(steps[burnout.to_numpy()[1:]], 0.01)
+            np.testing.assert_allclose(steps[-5:], 0.05)
+            self.assertLess(len(df), len(reference.to_df()))
+            # 記録しない場合も同じ刻みで解く
+            self.assertAlmostEqual(df["time"].iloc[-1], summary.landing_time)
+            landing = result.events[-1].state.position[:2]
+            self.assertLess(np.linalg.norm(landing - reference.events[-1].state.position[:2]), 1.0)
+
+    def test_predict_landing(self) -> None:
+        context = SimulationContext(self.config)
+        summaries = simple_simulation.simulate_landing(self.config)
+        rows = self.results[1].result
+        # 上昇を終えた最初のステップの時刻から開傘までの時間を数える
+        apogee_time = next(row.time for row in rows if row.velocity[2] > 0)
+        deploy_time = apogee_time + self.config.parachute_delay_time
+        # ランチャー上、燃焼中、慣性飛行、開傘待ち、パラシュート下降中
+        for time in [0.1, 0.5, 2.0, apogee_time + 0.5, deploy_time + 1.0]:
+            row = min(rows, key=lambda row, time=time: abs(row.time - time))
+            predicted = simple_simulation.predict_landing(
+                context,
+                row.time,
+                row.to_rocket_state(),
+                apogee_time=apogee_time,
+                fast=False,
+            )
+            branches = [1] if row.time > deploy_time else [0, 1]
+            for i in branches:
+                self.assertAlmostEqual(predicted[i].landing_time, summaries[i].landing_time)
+                np.testing.assert_array_almost_equal(predicted[i].landing_position, summaries[i].landing_position)
+            if row.on_launcher:
+                self.assertAlmostEqual(predicted[0].launch_clear_velocity, summaries[0].launch_clear_velocity)
+            else:
+                self.assertIsNone(predicted[0].launch_clear_velocity)
+            if row.time > apogee_time:
+                self.assertIsNone(predicted[0].apogee)
+
+    def test_predict_landing_fast(self) -> None:
+        # サンプルの設定で燃焼終了後の時刻から予測し直す時間と着地点の差を確かめる
+        config = config_read.read(Path("config_sample"))
+        context = SimulationContext(config)
+        row = next(row for row in simple_simulation.simulate(config)[1].result if row.time >= 7.0)  # noqa: PLR2004
+        elapsed = {}
+        predicted = {}
+        for fast in [False, True]:
+            start = perf_counter()
+            predicted[fast] = simple_simulation.predict_landing(context, row.time, row.to_rocket_state(), fast=fast)
+            elapsed[fast] = perf_counter() - start
+        self.assertLess(elapsed[True], elapsed[False] / 4)
+        for exact, fast in zip(predicted[False], predicted[True], strict=True):
+            self.assertLess(np.linalg.norm(fast.landing_position[:2] - exact.landing_position[:2]), 3.0)
+            self.assertAlmostEqual(fast.landing_time, exact.landing_time, delta=0.2)
+        # 元のコンテキストの時間刻みは変えない
+        self.assertIsNone(context.parachute_descent_dt)
+        self.assertEqual(context.descent_dt, config.dt)
+
+    def test_estimate_apogee_time(self) -> None:
+        rows = self.results[1].result
+        apogee_time = self.results[1].metrics.max_altitude.time
+        row = next(row for row in rows if row.time > apogee_time + 0.5)
+        self.assertAlmostEqual(
+            simple_simulation.estimate_apogee_time(row.time, row.to_rocket_state()),
+            apogee_time,
+            delta=0.1,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 
 import src.core.simulation_context as sc
-from src.core.config import Config, WindPowerLow
+from src.core.config import Config, TimeStepSchedule, WindPowerLow
 
 
 class TestSimulationContext(unittest.TestCase):
@@ -106,6 +106,41 @@ class TestSimulationContext(unittest.TestCase):
             expected_tensor,
         )
 
+    def test_time_step_schedule(self) -> None:
+        """省略した区間の時間刻みはdt、燃焼終了後はdtに倍率を掛けたものとなる"""
+        sim_context = sc.SimulationContext(self.config)
+        self.assertEqual(sim_context.burnout_time, 2.0)
+        for dt in [
+            sim_context.launcher_dt,
+            sim_context.burn_dt,
+            sim_context.coast_dt,
+            sim_context.parachute_delay_dt,
+            sim_context.descent_dt,
+        ]:
+            self.assertEqual(dt, 0.01)
+        self.config.dt_schedule = TimeStepSchedule(burn=0.005, descent=0.2, after_burnout_scale=4)
+        sim_context = sc.SimulationContext(self.config)
+        self.assertEqual(sim_context.launcher_dt, 0.01)
+        self.assertEqual(sim_context.burn_dt, 0.005)
+        self.assertEqual(sim_context.coast_dt, 0.04)
+        self.assertEqual(sim_context.parachute_delay_dt, 0.04)
+        self.assertEqual(sim_context.descent_dt, 0.2)
+
+    def test_wind_profile(self) -> None:
+        """風の分布が与えられた場合はべき法則の代わりに用いる"""
+        self.config.wind_profile = pd.DataFrame(
+            {
+                "time": [0.0, 0.0, 1.0, 1.0],
+                "altitude": [0.0, 100.0, 0.0, 100.0],
+                "wind_speed": [2.0, 4.0, 6.0, 8.0],
+                "wind_direction": [180.0, 180.0, 180.0, 180.0],
+            },
+        )
+        self.config.wind_profile_time = 0.5
+        sim_context = sc.SimulationContext(self.config)
+        np.testing.assert_array_almost_equal(sim_context.wind(50.0), [5.0, 0.0, 0.0])
+        np.testing.assert_array_almost_equal(sim_context.wind_batch(np.array([0.0, 100.0])), [[4.0, 0, 0], [6.0, 0, 0]])
+
 
 if __name__ == "__main__":
     unittest.main()
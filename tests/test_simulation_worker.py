@@ -0,0 +1,132 @@
+import dataclasses
+import multiprocessing
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.core.simulation_context import SimulationContext
+from src.make_report import simulation_worker
+from src.make_report.simulation_worker import (
+    BACKENDS,
+    BLAS_THREAD_VARIABLES,
+    Setting,
+    run,
+    run_concurrent_timed,
+    simulate_many,
+)
+from tests.test_simple_simulation import small_config
+
+
+def landings(results: list) -> np.ndarray:
+    return np.array(
+        [[*result.result_parachute_off.iloc[-1, 1:3], *result.result_parachute_on.iloc[-1, 1:3]] for result in results],
+    )
+
+
+class TestSimulationWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = small_config()
+        self.settings = [
+            Setting(85.0, speed, direction, landing_only=True) for speed, direction in [(0, 0), (2, 90), (4, 200)]
+        ]
+
+    def test_run_concurrent_timed(self) -> None:
+        results, timing = run_concurrent_timed(self.config, self.settings, max_workers=2)
+        # 結果は設定の順に並ぶ
+        for setting, result in zip(self.settings, results, strict=True):
+            expected = run(self.config, setting)
+            self.assertEqual(
+                result.result_parachute_on.iloc[-1].tolist(), expected.result_parachute_on.iloc[-1].tolist()
+            )
+        self.assertEqual(timing.tasks, len(self.settings))
+        self.assertGreaterEqual(timing.workers, 1)
+        self.assertLessEqual(timing.workers, 2)
+        self.assertGreaterEqual(timing.startup, 0.0)
+        self.assertGreaterEqual(timing.total, timing.startup)
+
+    def test_backends(self) -> None:
+        expected = landings([run(self.config, setting) for setting in self.settings])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                calls = []
+                results = simulate_many(
+                    self.settings,
+                    config=self.config,
+                    backend=backend,
+                    max_workers=2,
+                    progress=lambda done, total, calls=calls: calls.append((done, total)),
+                )
+                if backend == "batched":
+                    # 質点モデルの着地点は6自由度のモデルに近い
+                    np.testing.assert_allclose(landings(results), expected, atol=10)
+                    self.assertEqual(calls, [(3, 3)])
+                else:
+                    np.testing.assert_array_equal(landings(results), expected)
+                    self.assertEqual(calls, [(1, 3), (2, 3), (3, 3)])
+
+    def test_configs(self) -> None:
+        # Configはそのまま計算する
+        configs = [dataclasses.replace(self.config, first_elevation=elevation) for elevation in [80, 85]]
+        results = simulate_many(configs, backend="serial")
+        self.assertIsNotNone(results[0].metrics_parachute_off)
+        self.assertNotEqual(results[0].result_parachute_off.iloc[-1, 1], results[1].result_parachute_off.iloc[-1, 1])
+
+    def test_errors(self) -> None:
+        # マッハ数と迎角の組み合わせが欠けた表は計算時にValueErrorとなる
+        broken = dataclasses.replace(
+            self.config,
+            aerodynamic_table=pd.DataFrame({"mach": [0.1, 0.1, 0.2], "alpha": [0, 5, 0], "CA": 0.5, "CN": 0.1}),
+        )
+        for backend in ["serial", "thread", "process"]:
+            with self.subTest(backend=backend), self.assertRaises(ValueError):
+                simulate_many([self.config, broken, self.config], backend=backend, max_workers=2, landing_only=True)
+        with self.assertRaises(ValueError):
+            simulate_many([self.config], backend="batched")
+        with self.assertRaises(ValueError):
+            simulate_many([broken], backend="batched", landing_only=True)
+        with self.assertRaises(ValueError):
+            simulate_many(self.settings, backend="serial")
+        with self.assertRaises(ValueError):
+            simulate_many(self.settings, config=self.config, backend="gpu")
+
+    def test_worker_without_pandas(self) -> None:
+        # 新しいインタプリタで起動したワーカーは、実際に計算した後もpandasを読み込んでいない
+        with ProcessPoolExecutor(
+            1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=simulation_worker._initialize,  # noqa: SLF001
+            initargs=(SimulationContext(self.config),),
+        ) as executor:
+            for setting in [self.settings[1], dataclasses.replace(self.settings[1], landing_only=False)]:
+                output, _ = executor.submit(
+                    simulation_worker._evaluate_in_worker,  # noqa: SLF001
+                    setting,
+                    landing_only=False,
+                ).result()
+                # 結果は親のプロセスでDataFrameに変換する
+                result = simulation_worker._to_run_result(output)  # noqa: SLF001
+                expected = run(self.config, setting)
+                pd.testing.assert_frame_equal(result.result_parachute_on, expected.result_parachute_on)
+            # テストのモジュールはpandasを読み込むため、ワーカーのsys.modulesは組み込み関数で調べる
+            loaded = executor.submit(eval, "sorted(__import__('sys').modules)").result()
+        self.assertIn("src.core.simple_simulation", loaded)
+        self.assertNotIn("pandas", loaded)
+        self.assertNotIn("matplotlib", loaded)
+
+    def test_blas_threads(self) -> None:
+        before = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+        results = simulate_many(self.settings[:1], config=self.config, max_workers=1, blas_threads=1)
+        np.testing.assert_array_equal(landings(results), landings([run(self.config, self.settings[0])]))
+        # 親のプロセスの環境変数は元に戻す
+        self.assertEqual({name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}, before)
+        # このプロセスで読み込み済みのBLASのスレッド数は変えられないため、process以外では指定できない
+        for backend in ["serial", "thread", "batched"]:
+            with self.subTest(backend=backend), self.assertRaises(ValueError):
+                simulate_many(self.settings[:1], config=self.config, backend=backend, blas_threads=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
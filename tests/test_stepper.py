@@ -0,0 +1,89 @@
+import dataclasses
+import unittest
+
+import numpy as np
+
+from src.core import simple_simulation
+from src.core.config import TimeStepSchedule
+from src.core.simulation_context import SimulationContext
+from src.core.stepper import FALLING, LANDED, LAUNCHER, PARACHUTE_DELAY, RISING, Stepper
+from tests.test_simple_simulation import small_config
+
+
+class TestStepper(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.config = small_config()
+        cls.context = SimulationContext(cls.config)
+        cls.summaries = simple_simulation.simulate_landing(cls.config, outputs=())
+
+    def test_step_to_landing(self) -> None:
+        for parachute_on, summary in zip([False, True], self.summaries, strict=True):
+            stepper = Stepper(self.context, parachute_on=parachute_on)
+            phases = [stepper.phase]
+            while stepper.step():
+                if stepper.phase != phases[-1]:
+                    phases.append(stepper.phase)
+            self.assertEqual(phases, [LAUNCHER, RISING, PARACHUTE_DELAY, FALLING, LANDED])
+            self.assertAlmostEqual(stepper.time, summary.landing_time)
+            np.testing.assert_array_almost_equal(stepper.state.position, summary.landing_position)
+            self.assertFalse(stepper.step())
+
+    def test_time_step_schedule(self) -> None:
+        schedule = TimeStepSchedule(burn=0.01, after_burnout_scale=3)
+        config = dataclasses.replace(self.config, dt_schedule=schedule)
+        context = SimulationContext(config)
+        summaries = simple_simulation.simulate_landing(config, outputs=())
+        for parachute_on, summary in zip([False, True], summaries, strict=True):
+            stepper = Stepper(context, parachute_on=parachute_on)
+            steps = {}
+            while stepper.phase != LANDED:
+                steps.setdefault(stepper.phase, set()).add(round(stepper.time_step(), 9))
+                stepper.step()
+            self.assertEqual(steps, {LAUNCHER: {0.02}, RISING: {0.01, 0.06}, PARACHUTE_DELAY: {0.06}, FALLING: {0.06}})
+            self.assertAlmostEqual(stepper.time, summary.landing_time)
+            np.testing.assert_array_almost_equal(stepper.state.position, summary.landing_position)
+
+    def test_snapshot(self) -> None:
+        stepper = Stepper(self.context)
+        self.assertEqual(stepper.advance_to(2.0), 100)
+        self.assertAlmostEqual(stepper.time, 2.0)
+        snapshot = stepper.snapshot()
+        stepper.step()
+        self.assertAlmostEqual(snapshot.time, 2.0)
+        self.assertEqual(snapshot.phase, RISING)
+        self.assertFalse(np.array_equal(snapshot.state.position, stepper.state.position))
+        # 途中の状態から着地点を予測し直せる
+        predicted = simple_simulation.predict_landing(self.context, snapshot.time, snapshot.state, fast=False)
+        np.testing.assert_array_almost_equal(predicted[1].landing_position, self.summaries[1].landing_position)
+
+    def test_inject_wind(self) -> None:
+        stepper = Stepper(self.context)
+        stepper.inject_wind(self.context.wind)
+        stepper.advance_to(100.0)
+        np.testing.assert_array_almost_equal(stepper.state.position, self.summaries[1].landing_position)
+
+        stepper = Stepper(self.context)
+        stepper.advance_to(1.0)
+        stepper.inject_wind(np.array([0.0, 5.0, 0.0]))
+        stepper.advance_to(100.0)
+        self.assertEqual(stepper.phase, LANDED)
+        # 東向きの風で東に流される
+        self.assertGreater(stepper.state.position[1], self.summaries[1].landing_position[1] + 10)
+        # 元のコンテキストは書き換えない
+        np.testing.assert_array_almost_equal(self.context.wind(100.0), SimulationContext(self.config).wind(100.0))
+
+    def test_latency(self) -> None:
+        stepper = Stepper(self.context, latency_history=10)
+        self.assertEqual(stepper.last_latency, 0.0)
+        self.assertEqual(len(stepper.latencies), 0)
+        for _ in range(25):
+            stepper.step()
+        self.assertEqual(len(stepper.latencies), 10)
+        self.assertEqual(stepper.latencies[-1], stepper.last_latency)
+        self.assertGreaterEqual(stepper.max_latency, stepper.latencies.max())
+        self.assertGreater(stepper.last_latency, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import config_read
+from src.core import thrust_curve
+
+
+def noisy_thrust(n: int) -> pd.DataFrame:
+    """立ち上がりと振動と燃焼終了の段差を持つ推力"""
+    time = np.linspace(0, 3, n)
+    rng = np.random.default_rng(0)
+    burning = time < 2.5  # noqa: PLR2004
+    thrust = np.where(burning, 100 * (1 - np.exp(-time / 0.05)) + 5 * np.sin(40 * time), 0.0)
+    thrust += np.where(burning, rng.normal(0, 0.5, n), 0.0)
+    return pd.DataFrame({"thrust": thrust, "nozzle_exhaust_pressure": 101300.0}, index=pd.Index(time, name="time"))
+
+
+class TestThrustCurve(unittest.TestCase):
+    def test_piecewise_linear(self) -> None:
+        # 折れ線の角だけが残る
+        time = np.linspace(0, 4, 401)
+        thrust = np.interp(time, [0, 0.5, 3, 4], [0, 80, 60, 0])
+        keep, max_error = thrust_curve.simplify(time, thrust, 1e-9)
+        np.testing.assert_allclose(time[keep], [0, 0.5, 3, 4])
+        self.assertLess(max_error, 1e-9)
+
+    def test_error_bound(self) -> None:
+        df = noisy_thrust(20000)
+        compressed, compression = thrust_curve.compress_thrust(df, 2.0)
+        time = df.index.to_numpy()
+        error = np.abs(np.interp(time, compressed.index, compressed["thrust"]) - df["thrust"].to_numpy())
+        self.assertLessEqual(error.max(), 2.0)
+        self.assertAlmostEqual(compression.max_error, error.max())
+        self.assertLess(compression.compressed_rows, compression.original_rows / 10)
+        self.assertEqual(list(compressed.columns), list(df.columns))
+        impulse = np.trapezoid(df["thrust"], time)
+        self.assertAlmostEqual(compression.total_impulse, impulse)
+        self.assertAlmostEqual(
+            compression.impulse_error, np.trapezoid(compressed["thrust"], compressed.index) - impulse
+        )
+
+    def test_read_chunks(self) -> None:
+        df = noisy_thrust(20000)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "thrust.csv"
+            df.to_csv(path)
+            whole, whole_compression = thrust_curve.read_thrust_csv(path, 0.01, chunksize=len(df))
+            chunked, compression = thrust_curve.read_thrust_csv(path, 0.01, chunksize=777)
+        self.assertEqual(compression.original_rows, len(df))
+        self.assertAlmostEqual(compression.tolerance, whole_compression.tolerance)
+        self.assertAlmostEqual(compression.total_impulse, whole_compression.total_impulse)
+        # 区間の両端を残すため点は僅かに増えるが、誤差の上限は変わらない
+        self.assertGreaterEqual(len(chunked), len(whole))
+        self.assertLess(len(chunked), len(whole) + 2 * (len(df) // 777 + 1))
+        time = df.index.to_numpy()
+        error = np.abs(np.interp(time, chunked.index, chunked["thrust"]) - df["thrust"].to_numpy())
+        self.assertLessEqual(error.max(), compression.tolerance)
+        self.assertAlmostEqual(
+            compression.impulse_error,
+            np.trapezoid(chunked["thrust"], chunked.index) - compression.total_impulse,
+        )
+
+    def test_config_read(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            folder = Path(directory) / "config"
+            shutil.copytree("config_sample", folder)
+            self.assertIsNone(config_read.read(folder).thrust_compression)
+            js = json.loads((folder / "config.json").read_text())
+            js["thrust_tolerance"] = 0.01
+            (folder / "config.json").write_text(json.dumps(js))
+            config = config_read.read(folder)
+        compression = config.thrust_compression
+        self.assertIsNotNone(compression)
+        self.assertEqual(len(config.thrust), compression.compressed_rows)
+        self.assertLess(compression.compressed_rows, compression.original_rows / 4)
+        self.assertLess(abs(compression.relative_impulse_error), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
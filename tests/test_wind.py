@@ -12,6 +12,13 @@ class TestWind(unittest.TestCase):
         expected = 4.139188984383644 * np.array([-((3) ** 0.5) / 2, -0.5, 0])
         np.testing.assert_array_almost_equal(wind_10, expected)
 
+    def test_batch(self) -> None:
+        wind = w.wind_velocity_power(2, 3, 5, 30)
+        wind_batch = w.wind_velocity_power_batch(2, 3, 5, 30)
+        heights = np.array([-1, 0, 2, 10, 100.5])
+        expected = np.array([wind(h) for h in heights])
+        np.testing.assert_array_almost_equal(wind_batch(heights), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+from src.analysis.wind_limit import (
+    ANGLE_OF_ATTACK,
+    LANDING,
+    WindLimitCriteria,
+    search_wind_limit,
+    simulation_evaluator,
+)
+from tests.test_launch_window import square_site
+from tests.test_simple_simulation import small_config
+
+
+class CountingEvaluator:
+    """迎角が風速に比例し、着地点が風下に風速の10倍だけ流される出力"""
+
+    def __init__(self) -> None:
+        self.winds: list[tuple[float, float]] = []
+
+    def __call__(self, winds: list[tuple[float, float]]) -> np.ndarray:
+        self.winds.extend(winds)
+        rows = []
+        for speed, direction in winds:
+            theta = np.deg2rad(direction)
+            alpha = np.deg2rad(speed * (1 + 0.5 * np.cos(theta)))
+            north = -10 * speed * np.cos(theta)
+            east = -10 * speed * np.sin(theta)
+            rows.append([alpha, 100 * speed, north, east, north, east])
+        return np.array(rows)
+
+
+class TestWindLimit(unittest.TestCase):
+    def test_angle_of_attack(self) -> None:
+        evaluate = CountingEvaluator()
+        table = search_wind_limit(evaluate, WindLimitCriteria(max_angle_of_attack=20), [0, 90, 180], tolerance=0.01)
+        np.testing.assert_array_almost_equal(table["wind_speed_limit"], [20 / 1.5, 20, 20], decimal=2)
+        self.assertEqual(list(table["limited_by"]), [ANGLE_OF_ATTACK, "", ""])
+        self.assertTrue(np.isnan(table.loc[90.0, "wind_speed_violation"]))
+        self.assertLessEqual(table.loc[0.0, "wind_speed_violation"] - table.loc[0.0, "wind_speed_limit"], 0.01)
+
+    def test_constraints(self) -> None:
+        criteria = WindLimitCriteria(max_angle_of_attack=20, max_dynamic_pressure=1500, site=square_site())
+        table = search_wind_limit(CountingEvaluator(), criteria, [0, 90], tolerance=0.01)
+        np.testing.assert_array_almost_equal(table["wind_speed_limit"], [10, 10], decimal=2)
+        self.assertEqual(list(table["limited_by"]), [LANDING, LANDING])
+        criteria.landing_margin = -100
+        table = search_wind_limit(CountingEvaluator(), criteria, [90], tolerance=0.01)
+        np.testing.assert_array_almost_equal(table["wind_speed_limit"], [15], decimal=2)
+
+    def test_cache(self) -> None:
+        evaluate = CountingEvaluator()
+        cache = {}
+        criteria = WindLimitCriteria(max_angle_of_attack=20)
+        first = search_wind_limit(evaluate, criteria, [0, 360], cache=cache)
+        # 同じ風向(0degと360deg)と無風は一度だけ計算する
+        self.assertEqual(len(evaluate.winds), len(set(evaluate.winds)))
+        self.assertEqual(len(first), 1)
+        count = len(evaluate.winds)
+        second = search_wind_limit(evaluate, criteria, [0], cache=cache)
+        self.assertEqual(len(evaluate.winds), count)
+        np.testing.assert_array_almost_equal(first["wind_speed_limit"], second["wind_speed_limit"])
+        # 許容誤差を小さくした場合は計算済みの区間から探索を続ける
+        search_wind_limit(evaluate, criteria, [0], cache=cache, tolerance=0.01)
+        self.assertLess(len(evaluate.winds) - count, 5)
+
+    def test_calm_violation(self) -> None:
+        table = search_wind_limit(CountingEvaluator(), WindLimitCriteria(max_angle_of_attack=-1), [0, 90])
+        np.testing.assert_array_equal(table["wind_speed_limit"], [0, 0])
+        self.assertEqual(list(table["limited_by"]), [ANGLE_OF_ATTACK, ANGLE_OF_ATTACK])
+
+    def test_simulation(self) -> None:
+        config = small_config()
+        criteria = WindLimitCriteria(max_angle_of_attack=10)
+        with (
+            mock.patch("src.analysis.wind_limit.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool,
+            simulation_evaluator(config, config.first_elevation, max_workers=1) as evaluate,
+        ):
+            table = search_wind_limit(evaluate, criteria, [180], max_speed=10, tolerance=0.5)
+            limit = table.loc[180.0]
+            outputs = evaluate([(limit["wind_speed_limit"], 180.0), (limit["wind_speed_violation"], 180.0)])
+        # 倍々と二分法の全ての段階で同じプールを用いる
+        pool.assert_called_once()
+        self.assertEqual(limit["limited_by"], ANGLE_OF_ATTACK)
+        self.assertEqual(criteria.violations(outputs[0]), [])
+        self.assertEqual(criteria.violations(outputs[1]), [ANGLE_OF_ATTACK])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.wind import wind_velocity_power
+from src.core.wind_profile import WindProfile
+
+
+class TestWindProfile(unittest.TestCase):
+    def setUp(self) -> None:
+        # 高度によって風向が北から東へ回る分布を順不同で与える
+        self.df = pd.DataFrame(
+            {
+                "altitude": [1000.0, 0.0, 500.0],
+                "wind_speed": [10.0, 2.0, 4.0],
+                "wind_direction": [90.0, 0.0, 0.0],
+            },
+        )
+        self.profile = WindProfile.from_df(self.df)
+
+    def test_levels(self) -> None:
+        np.testing.assert_array_almost_equal(self.profile(0.0), [-2.0, 0.0, 0.0])
+        np.testing.assert_array_almost_equal(self.profile(500.0), [-4.0, 0.0, 0.0])
+        np.testing.assert_array_almost_equal(self.profile(1000.0), [0.0, -10.0, 0.0])
+
+    def test_interpolation(self) -> None:
+        # 成分ごとに補間する
+        np.testing.assert_array_almost_equal(self.profile(750.0), [-2.0, -5.0, 0.0])
+        np.testing.assert_array_almost_equal(self.profile(-10.0), [-2.0, 0.0, 0.0])
+        np.testing.assert_array_almost_equal(self.profile(2000.0), [0.0, -10.0, 0.0])
+
+    def test_batch(self) -> None:
+        # 前回の位置から離れた高度や逆向きに動く高度でも正しく求まる
+        rng = np.random.default_rng(0)
+        altitude = rng.uniform(-100, 1200, size=200)
+        batch = self.profile.batch(altitude)
+        for i, h in enumerate(altitude):
+            np.testing.assert_array_almost_equal(self.profile(h), batch[i])
+
+    def test_power_law_profile(self) -> None:
+        power_law = wind_velocity_power(10, 4, 6, 225)
+        altitude = np.arange(0.0, 1001.0, 5.0)
+        velocity = np.array([power_law(h) for h in altitude])
+        speed = np.linalg.norm(velocity, axis=1)
+        profile = WindProfile.from_df(
+            pd.DataFrame({"altitude": altitude, "wind_speed": speed, "wind_direction": 225.0}),
+        )
+        np.testing.assert_array_almost_equal(profile.batch(altitude), velocity)
+
+    def test_time(self) -> None:
+        # 時刻ごとに高度の格子が異なる予報値
+        df = pd.DataFrame(
+            {
+                "time": [0.0, 0.0, 6.0, 6.0, 6.0],
+                "altitude": [0.0, 1000.0, 0.0, 400.0, 1000.0],
+                "wind_speed": [2.0, 6.0, 4.0, 4.0, 8.0],
+                "wind_direction": [0.0, 0.0, 180.0, 180.0, 180.0],
+            },
+        )
+        profile = WindProfile.from_df(df)
+        self.assertTrue(profile.time_dependent)
+        np.testing.assert_array_almost_equal(profile.altitude, [0.0, 400.0, 1000.0])
+        with self.assertRaises(ValueError):
+            profile(0.0)
+        np.testing.assert_array_almost_equal(profile.at_time(0.0)(400.0), [-3.6, 0.0, 0.0])
+        np.testing.assert_array_almost_equal(profile.at_time(3.0)(0.0), [1.0, 0.0, 0.0])
+        np.testing.assert_array_almost_equal(profile.at_time(10.0).batch(np.array([1000.0])), [[8.0, 0.0, 0.0]])
+
+    def test_to_df(self) -> None:
+        restored = WindProfile.from_df(self.profile.to_df())
+        np.testing.assert_array_almost_equal(restored.wind_north, self.profile.wind_north)
+        np.testing.assert_array_almost_equal(restored.wind_east, self.profile.wind_east)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            WindProfile(np.array([0.0]), np.zeros(1), np.zeros(1))
+        with self.assertRaises(ValueError):
+            WindProfile(np.array([0.0, 1.0]), np.zeros(3), np.zeros(3))
+
+
+if __name__ == "__main__":
+    unittest.main()